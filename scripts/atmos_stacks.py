@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Atmos Stack Loader
+Resolves stack manifests offline (imports, deep merge, component inheritance)
+so Python tooling can inspect component vars without running atmos
+"""
+
+import fnmatch
+import os
+import sys
+from pathlib import Path
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ATMOS_DIR = REPO_ROOT / "atmos"
+
+
+class TerraformOutput:
+    """Value of a `!terraform.output <component> [stack] <expression>` tag"""
+
+    def __init__(self, component, expression, stack=None):
+        self.component = component
+        self.expression = expression
+        self.stack = stack
+
+    def __repr__(self):
+        parts = [self.component] + ([self.stack] if self.stack else []) + [self.expression]
+        return f"!terraform.output {' '.join(parts)}"
+
+    def __eq__(self, other):
+        return (isinstance(other, TerraformOutput) and
+                (self.component, self.expression, self.stack) == (other.component, other.expression, other.stack))
+
+    def __hash__(self):
+        return hash((self.component, self.expression, self.stack))
+
+
+class TaggedValue:
+    """Any other Atmos YAML function (e.g. !env, !exec), kept unevaluated"""
+
+    def __init__(self, tag, value):
+        self.tag = tag
+        self.value = value
+
+    def __repr__(self):
+        return f"{self.tag} {self.value}"
+
+
+class StackLoader(yaml.SafeLoader):
+    """SafeLoader that understands Atmos YAML functions"""
+
+
+def _construct_terraform_output(loader, node):
+    parts = loader.construct_scalar(node).split()
+    if len(parts) >= 3:
+        return TerraformOutput(parts[0], " ".join(parts[2:]), stack=parts[1])
+    if len(parts) == 2:
+        return TerraformOutput(parts[0], parts[1].strip("\"'"))
+    return TaggedValue(node.tag, loader.construct_scalar(node))
+
+
+def _construct_tagged(loader, tag_suffix, node):
+    if isinstance(node, yaml.ScalarNode):
+        value = loader.construct_scalar(node)
+    elif isinstance(node, yaml.SequenceNode):
+        value = loader.construct_sequence(node, deep=True)
+    else:
+        value = loader.construct_mapping(node, deep=True)
+    return TaggedValue("!" + tag_suffix, value)
+
+
+StackLoader.add_constructor("!terraform.output", _construct_terraform_output)
+StackLoader.add_multi_constructor("!", _construct_tagged)
+
+
+def deep_merge(base, override):
+    """Atmos-style deep merge: maps merge recursively, everything else is replaced"""
+    if not isinstance(base, dict) or not isinstance(override, dict):
+        return override
+    merged = dict(base)
+    for key, value in override.items():
+        merged[key] = deep_merge(merged[key], value) if key in merged else value
+    return merged
+
+
+class Stack:
+    """A resolved top-level stack manifest"""
+
+    def __init__(self, name, path, config):
+        self.name = name
+        self.path = path
+        self.config = config
+
+    @property
+    def vars(self):
+        return self.config.get("vars") or {}
+
+    def components(self, kind="terraform"):
+        """Yield (component_name, base_component, resolved_section) for each component"""
+        sections = (self.config.get("components") or {}).get(kind) or {}
+        for name, section in sections.items():
+            resolved = resolve_component(sections, name, self.vars)
+            metadata = resolved.get("metadata") or {}
+            if metadata.get("type") == "abstract":
+                continue
+            yield name, metadata.get("component", name), resolved
+
+
+def resolve_component(sections, name, stack_vars, _seen=None):
+    """
+    Resolve a component section: stack vars, then inherited components
+    (metadata.inherits, or the component it points at), then its own settings.
+    """
+    _seen = set() if _seen is None else _seen
+    _seen.add(name)
+    section = sections.get(name) or {}
+    metadata = section.get("metadata") or {}
+
+    parents = list(metadata.get("inherits") or [])
+    base = metadata.get("component")
+    if base and base != name and base in sections and base not in parents:
+        parents.insert(0, base)
+
+    resolved = {"vars": dict(stack_vars)}
+    for parent in parents:
+        if parent in sections and parent not in _seen:
+            parent_section = resolve_component(sections, parent, stack_vars, _seen)
+            parent_section.pop("metadata", None)
+            resolved = deep_merge(resolved, parent_section)
+    return deep_merge(resolved, section)
+
+
+class StackRepository:
+    """Loads and caches stack manifests under an Atmos stacks directory"""
+
+    def __init__(self, atmos_dir=ATMOS_DIR):
+        self.atmos_dir = Path(atmos_dir)
+        with open(self.atmos_dir / "atmos.yaml", "r") as f:
+            self.atmos_config = yaml.safe_load(f) or {}
+        stacks = self.atmos_config.get("stacks") or {}
+        self.stacks_dir = self.atmos_dir / stacks.get("base_path", "stacks")
+        self.included_paths = stacks.get("included_paths") or ["**/*"]
+        self.excluded_paths = stacks.get("excluded_paths") or []
+        self.name_pattern = stacks.get("name_pattern")
+        self._files = {}
+
+    def _read(self, relative):
+        """Raw YAML document for a stack path relative to the stacks directory"""
+        if relative not in self._files:
+            path = self.stacks_dir / relative
+            if path.suffix not in (".yaml", ".yml"):
+                path = path.with_name(path.name + ".yaml")
+            with open(path, "r") as f:
+                self._files[relative] = yaml.load(f, Loader=StackLoader) or {}
+        return self._files[relative]
+
+    def resolve(self, relative, _stack=None):
+        """Manifest with all imports merged in, imports first"""
+        _stack = [] if _stack is None else _stack
+        if relative in _stack:
+            raise ValueError(f"Import cycle: {' -> '.join(_stack + [relative])}")
+        document = self._read(relative)
+        merged = {}
+        for imported in document.get("import") or []:
+            if isinstance(imported, dict):
+                imported = imported.get("path")
+            if not imported:
+                continue
+            merged = deep_merge(merged, self.resolve(imported, _stack + [relative]))
+        own = {key: value for key, value in document.items() if key != "import"}
+        return deep_merge(merged, own)
+
+    def stack_files(self):
+        """Top-level stack manifests selected by atmos.yaml"""
+        files = []
+        for path in sorted(self.stacks_dir.rglob("*")):
+            if path.suffix not in (".yaml", ".yml") or not path.is_file():
+                continue
+            relative = path.relative_to(self.stacks_dir).as_posix()
+            if not any(fnmatch.fnmatch(relative, pattern) for pattern in self.included_paths):
+                continue
+            if any(fnmatch.fnmatch(relative, pattern) for pattern in self.excluded_paths):
+                continue
+            files.append(relative)
+        return files
+
+    def stack_name(self, relative, stack_vars):
+        """Stack name from name_pattern, skipping tokens the stack does not define"""
+        if self.name_pattern:
+            parts = []
+            for token in self.name_pattern.split("-"):
+                key = token.strip("{}")
+                if stack_vars.get(key):
+                    parts.append(str(stack_vars[key]))
+            if parts:
+                return "-".join(parts)
+        return os.path.splitext(relative)[0]
+
+    def load(self, relative):
+        config = self.resolve(relative)
+        return Stack(self.stack_name(relative, config.get("vars") or {}), relative, config)
+
+    def load_all(self):
+        return [self.load(relative) for relative in self.stack_files()]
+
+
+def main():
+    """Print the components of every stack (quick sanity check of the loader)"""
+    repository = StackRepository()
+    for stack in repository.load_all():
+        print(f"{stack.name} ({stack.path})")
+        for name, base, _ in stack.components():
+            print(f"  {name} -> {base}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark and fixture suite for the custom Checkov checks
+Builds Checkov-shaped confs for every resource type the CKV_OP_* checks
+support, at three sizes:
+
+- small: an empty conf (every attribute missing)
+- typical: the resource as declared in the repo's Terraform module
+- adversarial: the typical conf with huge tag maps and long names, plus
+  thousands of NSG rules, network rule entries, prefixes and policies
+
+Each check's scan_resource_conf is timed the way Checkov calls it (all checks
+of a resource back to back on the same conf, so the first check of a policy
+module pays for the shared evaluation pass), and the verdicts and latencies
+are compared with a stored baseline. The run fails when a verdict changes or
+when the per-resource latency of a fixture regresses beyond the tolerance.
+Latencies are normalised by a fixed CPU calibration loop so baselines taken
+on another machine stay comparable.
+
+With --reference, the checks of another policy tree (e.g. a git worktree of
+an older revision) are timed on the same fixtures in the same run, and the
+run also fails when a fixture is slower than there beyond the tolerance.
+
+    python3 scripts/benchmark-custom-checks.py                    # compare
+    python3 scripts/benchmark-custom-checks.py --update-baseline  # record
+    git worktree add /tmp/policies-before <rev>
+    python3 scripts/benchmark-custom-checks.py \
+        --reference /tmp/policies-before/security/checkov-policies
+"""
+
+import argparse
+import gc
+import importlib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = REPO_ROOT / "security" / "policy-benchmark-baseline.json"
+
+# Adversarial sizes at --scale 1
+ADVERSARIAL = {
+    "tags": 10000,
+    "name_length": 4096,
+    "security_rules": 5000,
+    "ip_rules": 5000,
+    "address_prefixes": 1000,
+    "access_policies": 1000,
+    "ip_configurations": 500,
+}
+
+
+def module_confs(runner):
+    """{resource_type: conf} of the first resource of each type declared by the repo modules"""
+    import hcl2
+    confs = {}
+    for path in sorted(runner.DEFAULT_MODULES_DIR.glob("*/main.tf")):
+        document = hcl2.loads(path.read_text())
+        defaults = runner.variable_defaults(path.parent)
+        for block in document.get("resource", []):
+            for resource_type, resources in block.items():
+                if resource_type in confs:
+                    continue
+                raw_conf = next(iter(resources.values()))
+                conf = runner.to_conf(raw_conf, defaults)
+                conf.pop("__start_line__", None)
+                conf.pop("__end_line__", None)
+                confs[resource_type] = conf
+    return confs
+
+
+def security_rules(rng, count):
+    """Overlapping rules in both directions so the NSG analysis has real work to do"""
+    sources = ["*", "Internet", "VirtualNetwork", "10.0.0.0/8", "10.1.0.0/16", "192.168.0.0/16"]
+    return [{
+        "name": [f"rule-{i}"],
+        "priority": [100 + i],
+        "direction": [rng.choice(["Inbound", "Outbound"])],
+        "access": [rng.choice(["Allow", "Deny"])],
+        "protocol": [rng.choice(["Tcp", "Udp", "*"])],
+        "source_port_range": ["*"],
+        "destination_port_range": [rng.choice(["*", "22", "443", "8000-8100", str(rng.randint(1, 2000))])],
+        "source_address_prefix": [rng.choice(sources)],
+        "destination_address_prefix": ["*"],
+    } for i in range(count)]
+
+
+def prefixes(count):
+    return [f"10.{i // 256 % 256}.{i % 256}.0/24" for i in range(count)]
+
+
+def adversarial_conf(resource_type, typical, scale, seed=0):
+    """The typical conf blown up along every dimension a check may iterate over"""
+    rng = random.Random(seed)
+    size = {key: max(1, int(value * scale)) for key, value in ADVERSARIAL.items()}
+    conf = dict(typical)
+    conf["tags"] = [{f"tag-{i}": "v" * 64 for i in range(size["tags"])}]
+    conf["name"] = ["n" * size["name_length"]]
+    if resource_type == "azurerm_network_security_group":
+        conf["security_rule"] = security_rules(rng, size["security_rules"])
+    elif resource_type == "azurerm_storage_account":
+        conf["network_rules"] = [{"default_action": ["Deny"], "ip_rules": [prefixes(size["ip_rules"])],
+                                  "virtual_network_subnet_ids": [[f"subnet-{i}" for i in range(size["ip_rules"])]]}]
+    elif resource_type == "azurerm_key_vault":
+        conf["access_policy"] = [{"tenant_id": ["var.tenant_id"], "object_id": [f"object-{i}"],
+                                  "secret_permissions": [["Get", "List"]]} for i in range(size["access_policies"])]
+        conf["network_acls"] = [{"default_action": ["Deny"], "bypass": ["AzureServices"],
+                                 "ip_rules": [prefixes(size["ip_rules"])]}]
+    elif resource_type == "azurerm_subnet":
+        conf["address_prefixes"] = [prefixes(size["address_prefixes"])]
+    elif resource_type == "azurerm_virtual_network":
+        conf["address_space"] = [prefixes(size["address_prefixes"])]
+    elif resource_type == "azurerm_private_endpoint":
+        conf["ip_configuration"] = [{"name": [f"ip-{i}"], "private_ip_address": [f"10.0.{i // 256}.{i % 256}"],
+                                     "subresource_name": ["blob"]} for i in range(size["ip_configurations"])]
+    elif resource_type in ("azurerm_linux_function_app", "azurerm_windows_function_app"):
+        conf["app_settings"] = [{f"SETTING_{i}": "x" * 64 for i in range(size["tags"])}]
+    return conf
+
+
+def build_fixtures(runner, resource_types, scale):
+    """{fixture name: (resource_type, conf)}"""
+    typical = module_confs(runner)
+    fixtures = {}
+    for resource_type in sorted(resource_types):
+        base = typical.get(resource_type, {})
+        fixtures[f"{resource_type}/small"] = (resource_type, {})
+        fixtures[f"{resource_type}/typical"] = (resource_type, base)
+        fixtures[f"{resource_type}/adversarial"] = (resource_type, adversarial_conf(resource_type, base, scale))
+    return fixtures
+
+
+def load_reference(policies_dir):
+    """
+    {resource_type: [check, ...]} of the policy modules in another directory
+
+    The modules are imported with the helper modules next to them (rule
+    engine, accessor, ...) under their usual names, then the current ones
+    are put back. Checks are collected from Checkov's registry, where both
+    hand-written and generated checks register themselves.
+    """
+    from checkov.terraform.checks.resource.registry import resource_registry
+
+    policies_dir = Path(policies_dir).resolve()
+    names = {path.stem for path in policies_dir.glob("*.py")}
+    saved = {name: sys.modules.pop(name) for name in names if name in sys.modules}
+    known = {id(check) for checks in resource_registry.checks.values() for check in checks}
+    sys.path.insert(0, str(policies_dir))
+    try:
+        for path in sorted(policies_dir.glob("azure_*_checks.py")):
+            try:
+                importlib.import_module(path.stem)
+            except Exception as error:
+                print(f"Reference {path.name} not loaded: {error}", file=sys.stderr)
+    finally:
+        sys.path.remove(str(policies_dir))
+        for name in names:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
+    return {resource_type: [check for check in checks if id(check) not in known]
+            for resource_type, checks in resource_registry.checks.items()
+            if any(id(check) not in known for check in checks)}
+
+
+def calibrate(repeat):
+    """Best seconds of a fixed pure-Python workload, to normalise latencies across machines"""
+    rng = random.Random(42)
+    data = [rng.random() for _ in range(20000)]
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        index = {}
+        for value in sorted(data):
+            index[str(value)[:6]] = value
+        runs.append(time.perf_counter() - start)
+    return min(runs)
+
+
+def measure(checks, conf, repeat):
+    """
+    (verdicts, per-resource us, {check_id: us}) for one fixture.
+
+    Every repetition scans a fresh shallow copy, so per-conf caches (keyed on
+    object identity) do not turn later repetitions into lookups.
+    """
+    totals = []
+    per_check = {check.id: [] for check in checks}
+    verdicts = {}
+    for _ in range(repeat):
+        fresh = dict(conf)
+        total = 0.0
+        for check in checks:
+            check.details = []
+            start = time.perf_counter()
+            result = check.scan_resource_conf(fresh)
+            elapsed = time.perf_counter() - start
+            total += elapsed
+            per_check[check.id].append(elapsed)
+            verdicts[check.id] = result.name
+        totals.append(total)
+    # Best of the repetitions, as timeit recommends: slower runs measure other load on the machine
+    return (verdicts, min(totals) * 1e6,
+            {check_id: round(min(samples) * 1e6, 2) for check_id, samples in per_check.items()})
+
+
+def run_suite(checks_by_type, fixtures, repeat):
+    results = {}
+    # As timeit does: collector pauses would land on whichever fixture triggers them
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for fixture, (resource_type, conf) in fixtures.items():
+            verdicts, resource_us, checks_us = measure(checks_by_type[resource_type], conf, repeat)
+            results[fixture] = {"verdicts": verdicts, "resource_us": round(resource_us, 2),
+                                "checks_us": checks_us}
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return results
+
+
+def compare(results, baseline, calibration, tolerance, noise_us):
+    """Problems found against the baseline: changed verdicts and latency regressions"""
+    problems = []
+    ratio = calibration / baseline["calibration_s"] if baseline.get("calibration_s") else 1.0
+    for fixture, result in results.items():
+        expected = baseline["fixtures"].get(fixture)
+        if expected is None:
+            problems.append(f"{fixture}: not in the baseline (run with --update-baseline)")
+            continue
+        for check_id, verdict in sorted(result["verdicts"].items()):
+            previous = expected["verdicts"].get(check_id)
+            if previous != verdict:
+                problems.append(f"{fixture}: {check_id} verdict {previous} -> {verdict}")
+        allowed = expected["resource_us"] * ratio * tolerance
+        if result["resource_us"] > allowed and result["resource_us"] - expected["resource_us"] * ratio > noise_us:
+            problems.append(f"{fixture}: {result['resource_us']:.1f}us per resource, baseline "
+                            f"{expected['resource_us'] * ratio:.1f}us (normalised), limit {allowed:.1f}us")
+    return problems
+
+
+def compare_reference(results, reference, tolerance, noise_us):
+    """Fixtures slower than with the reference tree's checks, measured in the same run"""
+    problems = []
+    for fixture, result in results.items():
+        other = reference.get(fixture)
+        if other is None:
+            continue
+        allowed = other["resource_us"] * tolerance
+        if result["resource_us"] > allowed and result["resource_us"] - other["resource_us"] > noise_us:
+            problems.append(f"{fixture}: {result['resource_us']:.1f}us per resource, reference "
+                            f"{other['resource_us']:.1f}us, limit {allowed:.1f}us")
+    return problems
+
+
+def render_text(results, baseline, calibration, reference=None):
+    ratio = calibration / baseline["calibration_s"] if baseline and baseline.get("calibration_s") else None
+    header = f"{'fixture':<46}{'checks':>7}{'per resource':>15}{'baseline':>12}"
+    if reference is not None:
+        header += f"{'reference':>12}"
+    lines = [header + "  slowest check"]
+    for fixture, result in results.items():
+        expected = (baseline or {}).get("fixtures", {}).get(fixture)
+        line = f"{fixture:<46}{len(result['checks_us']):>7}{result['resource_us']:13.1f}us"
+        line += f"{expected['resource_us'] * ratio:10.1f}us" if expected and ratio else f"{'-':>12}"
+        if reference is not None:
+            other = reference.get(fixture)
+            line += f"{other['resource_us']:10.1f}us" if other else f"{'-':>12}"
+        slowest = max(result["checks_us"].items(), key=lambda item: item[1])
+        lines.append(f"{line}  {slowest[0]} ({slowest[1]:.1f}us)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every custom check against small, typical and "
+                                                 "adversarial fixtures and compare with a stored baseline")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE),
+                        help="Baseline JSON file (default: security/policy-benchmark-baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Record the results as the new baseline")
+    parser.add_argument("--repeat", type=int, default=7, help="Repetitions per fixture, best kept (default: 7)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale of the adversarial fixtures (default: 1)")
+    parser.add_argument("--tolerance", type=float, default=2.0,
+                        help="Allowed slowdown factor against the baseline (default: 2)")
+    parser.add_argument("--noise-us", type=float, default=25.0,
+                        help="Ignore slowdowns smaller than this many microseconds (default: 25)")
+    parser.add_argument("--type", action="append", dest="resource_types",
+                        help="Only benchmark this resource type (repeatable)")
+    parser.add_argument("--reference", metavar="POLICIES_DIR",
+                        help="Also time the checks of another checkov-policies directory on the same fixtures "
+                             "and fail when slower than them")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    runner = importlib.import_module("run-custom-checks")
+    runner.prepare_policies()
+    checks_by_type = runner.load_policies()
+    resource_types = args.resource_types or sorted(checks_by_type)
+    unknown = sorted(set(resource_types) - set(checks_by_type))
+    if unknown:
+        print(f"No custom checks for: {', '.join(unknown)}", file=sys.stderr)
+        return 1
+
+    fixtures = build_fixtures(runner, resource_types, args.scale)
+    # Warm-up pass: module-level caches (e.g. parsed NSG ports) reach their steady state
+    run_suite(checks_by_type, fixtures, 1)
+    calibration = calibrate(args.repeat)
+    results = run_suite(checks_by_type, fixtures, args.repeat)
+    calibration = min(calibration, calibrate(args.repeat))
+
+    reference = None
+    if args.reference:
+        reference_checks = load_reference(args.reference)
+        reference_fixtures = {fixture: spec for fixture, spec in fixtures.items() if spec[0] in reference_checks}
+        run_suite(reference_checks, reference_fixtures, 1)
+        reference = run_suite(reference_checks, reference_fixtures, args.repeat)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        if args.scale != 1.0 or args.resource_types:
+            print("The baseline must cover every resource type at --scale 1", file=sys.stderr)
+            return 1
+        baseline = {"calibration_s": calibration, "repeat": args.repeat, "fixtures": results}
+        with open(baseline_path, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(render_text(results, None, calibration))
+        print(f"\nBaseline written to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(render_text(results, None, calibration, reference))
+        print(f"\nNo baseline at {baseline_path}; run with --update-baseline", file=sys.stderr)
+        return 1
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    if args.scale != 1.0:
+        # Latencies of rescaled fixtures are not comparable; verdicts still are
+        for fixture in results:
+            if fixture.endswith("/adversarial"):
+                results[fixture]["resource_us"] = 0.0
+    problems = compare(results, baseline, calibration, args.tolerance, args.noise_us)
+    if reference is not None:
+        problems += compare_reference(results, reference, args.tolerance, args.noise_us)
+
+    if args.format == "json":
+        output = {"calibration_s": calibration, "fixtures": results, "problems": problems}
+        if reference is not None:
+            output["reference"] = reference
+        print(json.dumps(output, indent=2))
+    else:
+        print(render_text(results, baseline, calibration, reference))
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not problems:
+            print(f"\n✅ {len(results)} fixtures match the baseline verdicts and latency "
+                  f"(tolerance {args.tolerance}x)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark for html_report.py
+Writes a synthetic Checkov JSON report of the requested size (findings with
+Checkov-sized code blocks), renders it to HTML in a fresh interpreter and
+reports the throughput and peak memory, next to the peak memory of merely
+json.load-ing the same report.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Run in a child interpreter: prints {"seconds": ..., "max_rss_kb": ...}
+RENDER = """
+import json, resource, sys, time
+sys.path.insert(0, {scripts_dir!r})
+from html_report import write_report
+start = time.perf_counter()
+write_report({report!r}, {output!r})
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                  "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+LOAD = """
+import json, resource, time
+start = time.perf_counter()
+with open({report!r}) as f:
+    json.load(f)
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                  "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+RESOURCE_TYPES = ("azurerm_storage_account", "azurerm_key_vault", "azurerm_subnet", "azurerm_linux_function_app")
+
+
+def finding(index, result):
+    resource_type = RESOURCE_TYPES[index % len(RESOURCE_TYPES)]
+    module = f"azure-module-{index % 40}"
+    return {
+        "check_id": f"CKV_AZURE_{index % 250}",
+        "bc_check_id": None,
+        "check_name": f"Ensure {resource_type} <setting> & \"option\" {index % 250} is enabled",
+        "check_result": {"result": result, "evaluated_keys": ["enabled", "settings/[0]/value"]},
+        "code_block": [[line, f"  attribute_{line} = var.value_{line} # <{index}>\n"] for line in range(1, 13)],
+        "file_path": f"/{module}/main.tf",
+        "file_abs_path": f"/home/runner/work/one-platform/atmos/components/terraform/modules/{module}/main.tf",
+        "repo_file_path": f"/atmos/components/terraform/modules/{module}/main.tf",
+        "file_line_range": [1, 12],
+        "resource": f"{resource_type}.this[{index}]",
+        "evaluations": None,
+        "check_class": "checkov.terraform.checks.resource.azure.Example",
+        "fixed_definition": None,
+        "entity_tags": {"Environment": "dev", "Owner": "platform"},
+        "caller_file_path": None,
+        "caller_file_line_range": None,
+        "resource_address": f"{resource_type}.this[{index}]",
+        "severity": ("CRITICAL", "HIGH", "MEDIUM", "LOW", None)[index % 5],
+        "bc_category": None,
+        "benchmarks": None,
+        "description": None,
+        "short_description": None,
+        "vulnerability_details": None,
+        "connected_node": None,
+        "guideline": "https://docs.prismacloud.io/en/enterprise-edition/policy-reference/",
+        "details": [],
+        "check_len": None,
+        "definition_context_file_path": f"/{module}/main.tf",
+        "breadcrumbs": {},
+    }
+
+
+def write_synthetic_report(path, findings):
+    """A Checkov-shaped report, written one finding at a time; returns its size in bytes"""
+    failed = findings // 4
+    with open(path, "w") as f:
+        f.write('{\n    "check_type": "terraform",\n    "results": {\n')
+        for key, result, count, offset in (("passed_checks", "PASSED", findings - failed, failed),
+                                           ("failed_checks", "FAILED", failed, 0)):
+            f.write(f'        "{key}": [\n')
+            for index in range(count):
+                if index:
+                    f.write(",\n")
+                f.write(json.dumps(finding(offset + index, result), indent=4))
+            f.write("\n        ],\n")
+        f.write('        "skipped_checks": [],\n        "parsing_errors": []\n    },\n')
+        f.write(f'    "summary": {{"passed": {findings - failed}, "failed": {failed}, "skipped": 0, '
+                f'"parsing_errors": 0, "resource_count": {findings}, "checkov_version": "3.3.29"}}\n}}\n')
+    return os.path.getsize(path)
+
+
+def run_child(code):
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML rendering of large Checkov JSON reports")
+    parser.add_argument("--findings", type=int, default=60000,
+                        help="Checks in the synthetic report (default: 60000, about 140MB)")
+    parser.add_argument("--report", help="Benchmark this Checkov JSON report instead of a synthetic one")
+    parser.add_argument("--repeat", type=int, default=3, help="Renders to time (default: 3, best is reported)")
+    parser.add_argument("--skip-load", action="store_true", help="Do not measure json.load of the report")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        report = args.report
+        if report is None:
+            report = os.path.join(work_dir, "report.json")
+            start = time.perf_counter()
+            write_synthetic_report(report, args.findings)
+            print(f"Synthetic report: {args.findings} checks, written in {time.perf_counter() - start:.1f}s")
+        size_mb = os.path.getsize(report) / 1024 / 1024
+        output = os.path.join(work_dir, "report.html")
+
+        runs = [run_child(RENDER.format(scripts_dir=str(SCRIPTS_DIR), report=report, output=output))
+                for _ in range(args.repeat)]
+        best = min(run["seconds"] for run in runs)
+        html_mb = os.path.getsize(output) / 1024 / 1024
+        print(f"Report: {size_mb:.1f} MB JSON -> {html_mb:.1f} MB HTML")
+        print(f"{'':<12}{'seconds':>10}{'MB/s':>10}{'peak RSS':>12}")
+        print(f"{'html_report':<12}{best:10.2f}{size_mb / best:10.1f}"
+              f"{max(run['max_rss_kb'] for run in runs) / 1024:10.1f}MB")
+        if not args.skip_load:
+            load = run_child(LOAD.format(report=report))
+            print(f"{'json.load':<12}{load['seconds']:10.2f}{size_mb / load['seconds']:10.1f}"
+                  f"{load['max_rss_kb'] / 1024:10.1f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the NSG custom Checkov checks
+Times every CKV_OP_AZURE_NSG_* check against NSGs with many security rules
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+POLICIES_DIR = Path(__file__).resolve().parent.parent / "security" / "checkov-policies"
+
+
+def build_nsg(rule_count, internet_rule_at=None, wildcard_ports=False):
+    """
+    Build a Checkov-style NSG conf with rule_count security rules
+
+    With wildcard_ports every rule allows '*' destination ports from its own
+    /24, so no rule covers another and none can be told apart by port.
+    """
+    rules = []
+    for i in range(rule_count):
+        if i == internet_rule_at:
+            source = "*"
+        elif wildcard_ports:
+            source = f"10.{i // 256 % 256}.{i % 256}.0/24"
+        else:
+            source = "10.0.0.0/8"
+        rules.append({
+            "name": [f"rule-{i}"],
+            "priority": [100 + i],
+            "direction": ["Inbound" if i % 2 else "Outbound"],
+            "access": ["Allow"],
+            "protocol": ["Tcp"],
+            "source_port_range": ["*"],
+            "destination_port_range": ["*" if wildcard_ports else str(1000 + i)],
+            "source_address_prefix": [source],
+            "destination_address_prefix": ["*"],
+        })
+    return {
+        "name": ["module.label.id"],
+        "tags": ["module.label.tags"],
+        "count": ["var.enabled ? 1 : 0"],
+        "resource_group_name": ["var.resource_group_name"],
+        "security_rule": rules,
+    }
+
+
+def run_checks(checks, confs):
+    """Run every check over every conf the way Checkov does, returning the verdicts"""
+    verdicts = []
+    for conf in confs:
+        for check in checks:
+            check.details = []
+            verdicts.append((check.id, check.scan_resource_conf(conf), check.details))
+    return verdicts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the NSG custom Checkov checks")
+    parser.add_argument("--rules", type=int, default=1000, help="Security rules per NSG (default: 1000)")
+    parser.add_argument("--nsgs", type=int, default=200, help="NSGs per run (default: 200)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs to take the best of (default: 5)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(POLICIES_DIR))
+    import azure_nsg_checks
+
+    checks = azure_nsg_checks.checks
+    internet_rule_last = args.rules - 1 if args.rules % 2 == 0 else args.rules - 2
+    scenarios = {
+        "no internet rule (full scan)": {},
+        "internet rule last": {"internet_rule_at": internet_rule_last},
+        "'*' destination ports": {"wildcard_ports": True},
+    }
+
+    print(f"NSG checks: {', '.join(check.id for check in checks)}")
+    for label, options in scenarios.items():
+        confs = [build_nsg(args.rules, **options) for _ in range(args.nsgs)]
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            verdicts = run_checks(checks, confs)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        failed = sorted({check_id for check_id, result, _ in verdicts if result.name == "FAILED"})
+        print(f"{label}: {best / args.nsgs * 1e6:.0f} us per {args.rules}-rule NSG"
+              f" (failed: {', '.join(failed) or 'none'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark for loading the custom Checkov policy modules
+Compares importing every policy module (what Checkov does with the whole
+external checks directory) against index-based loading of only the modules
+for the resource types a scan touches. Each measurement runs in a fresh
+interpreter so import caches do not leak between runs.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+POLICIES_DIR = REPO_ROOT / "security" / "checkov-policies"
+DEFAULT_MODULES_DIR = REPO_ROOT / "atmos" / "components" / "terraform" / "modules"
+
+# Run in a child interpreter: prints {"seconds": ..., "modules": ..., "checks": ...}
+LOADER = """
+import json, sys, time
+sys.path.insert(0, {policies_dir!r})
+if {checkov}:
+    # Checkov has imported its check machinery before it loads external checks
+    from checkov.terraform.checks.resource.base_resource_check import BaseResourceCheck
+start = time.perf_counter()
+import rule_engine
+if not {checkov}:
+    rule_engine.use_standalone_checks()
+from parallel_evaluator import load_checks
+checks = load_checks({policies_dir!r}, {resource_types!r})
+elapsed = time.perf_counter() - start
+loaded = [name for name in sys.modules if name.startswith("azure_") and name.endswith("_checks")]
+print(json.dumps({{"seconds": elapsed, "modules": len(loaded),
+                  "checks": len({{check.id for group in checks.values() for check in group}})}}))
+"""
+
+
+def measure(resource_types, checkov, repeat):
+    """
+    Median policy load time and median wall time of the whole interpreter
+    over fresh interpreters, with the loaded module and check counts
+    """
+    code = LOADER.format(policies_dir=str(POLICIES_DIR), checkov=checkov,
+                         resource_types=sorted(resource_types) if resource_types is not None else None)
+    runs, walls = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        walls.append(time.perf_counter() - start)
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return (statistics.median(run["seconds"] for run in runs), statistics.median(walls),
+            runs[-1]["modules"], runs[-1]["checks"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full vs index-based loading of the policy modules")
+    parser.add_argument("paths", nargs="*", default=[str(DEFAULT_MODULES_DIR / "azure-storage-account")],
+                        help="Terraform paths whose resource types select the modules "
+                             "(default: the azure-storage-account component)")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement (default: 5)")
+    parser.add_argument("--skip-checkov", action="store_true",
+                        help="Only measure standalone loading (without Checkov's BaseResourceCheck)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(POLICIES_DIR))
+    from policy_index import load_index, modules_for, resource_types_in
+    resource_types = resource_types_in(args.paths)
+    selected = modules_for(load_index(str(POLICIES_DIR)), resource_types)
+    print(f"Resource types: {', '.join(sorted(resource_types)) or '-'}")
+    print(f"Indexed modules: {', '.join(selected) or '-'}\n")
+
+    modes = [("standalone", False)] + ([] if args.skip_checkov else [("checkov", True)])
+    print(f"{'':<22}{'load':>10}{'process':>10}  modules  checks")
+    for label, checkov in modes:
+        for variant, types in (("all modules", None), ("indexed", resource_types)):
+            load, wall, modules, checks = measure(types, checkov, args.repeat)
+            print(f"{label + ' ' + variant:<22}{load * 1000:8.1f}ms{wall * 1000:8.0f}ms  {modules:>7}  {checks:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Change-scoped policy scanning helpers
+Takes the resources a Terraform plan creates, updates or replaces (from
+parse_terraform_plan.py) and narrows a policy scan down to them: the module
+directories that declare those resources, and the report entries about them.
+
+Resources are matched by "type.name" as declared in the .tf files, so
+instance keys (this[0], rules["ssh"]) and module prefixes are ignored. A
+resource name declared by several modules selects all of them.
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from parse_terraform_plan import changed_resources
+
+RESOURCE_DECLARATION = re.compile(r'^\s*resource\s+"([^"]+)"\s+"([^"]+)"', re.MULTILINE)
+INSTANCE_KEY = re.compile(r'\[[^\]]*\]')
+
+REPORT_RESULT_KEYS = ("passed_checks", "failed_checks", "skipped_checks")
+SUMMARY_KEYS = {"passed_checks": "passed", "failed_checks": "failed", "skipped_checks": "skipped"}
+
+
+def load_changed_resources(plan_path):
+    """Changed "type.name" set of a `terraform plan` text output file ('-' for stdin)"""
+    if plan_path == "-":
+        return changed_resources(sys.stdin.read())
+    with open(plan_path, "r") as f:
+        return changed_resources(f.read())
+
+
+def resource_key(address):
+    """'module.app.azurerm_key_vault.this[0]' -> 'azurerm_key_vault.this'"""
+    parts = INSTANCE_KEY.sub("", address).split(".")
+    return ".".join(parts[-2:])
+
+
+def declared_resources(path):
+    """"type.name" of every resource block in a .tf file"""
+    with open(path, "r", errors="replace") as f:
+        return {f"{resource_type}.{name}" for resource_type, name in RESOURCE_DECLARATION.findall(f.read())}
+
+
+def files_declaring(changed, paths):
+    """{.tf file: changed resources it declares}, for the files that declare any"""
+    files = {}
+    for path in paths:
+        path = Path(path)
+        candidates = [path] if path.is_file() else sorted(path.rglob("*.tf"))
+        for candidate in candidates:
+            if ".terraform" in candidate.parts:
+                continue
+            declared = declared_resources(candidate) & changed
+            if declared:
+                files[candidate] = declared
+    return files
+
+
+def changed_module_dirs(changed, modules_dir):
+    """Module directories (direct children of modules_dir) that declare a changed resource"""
+    modules_dir = Path(modules_dir)
+    dirs = set()
+    for path in files_declaring(changed, [modules_dir]):
+        dirs.add(modules_dir / path.relative_to(modules_dir).parts[0])
+    return sorted(dirs)
+
+
+def filter_report(report, changed):
+    """Keep only the results about changed resources in a Checkov JSON report (in place)"""
+    for entry in report if isinstance(report, list) else [report]:
+        results = entry.get("results") or {}
+        summary = entry.get("summary") or {}
+        for key in REPORT_RESULT_KEYS:
+            if key not in results:
+                continue
+            results[key] = [result for result in results[key]
+                            if resource_key(result.get("resource", "")) in changed]
+            if SUMMARY_KEYS[key] in summary:
+                summary[SUMMARY_KEYS[key]] = len(results[key])
+        if "resource_count" in summary:
+            summary["resource_count"] = len({result.get("resource") for key in REPORT_RESULT_KEYS
+                                             for result in results.get(key, ())})
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scope policy scans to the resources changed by a plan")
+    parser.add_argument("plan", help="`terraform plan` text output ('-' for stdin)")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("resources", help="Print the changed resources")
+    dirs = subcommands.add_parser("dirs", help="Print the module directories that declare changed resources")
+    dirs.add_argument("modules_dir")
+    report = subcommands.add_parser("filter-report", help="Drop results about unchanged resources from a "
+                                                          "Checkov JSON report, in place; exits 1 if "
+                                                          "checks on changed resources fail Checkov's "
+                                                          "soft-fail/hard-fail-on rules",
+                                    epilog="Arguments after -- are the Checkov arguments of the scan, whose "
+                                           "config file and fail options decide the exit code.")
+    report.add_argument("report")
+    argv = sys.argv[1:]
+    split = argv.index("--") if "--" in argv else len(argv)
+    args = parser.parse_args(argv[:split])
+    checkov_args = argv[split + 1:]
+
+    changed = load_changed_resources(args.plan)
+    if args.command == "resources":
+        for address in sorted(changed):
+            print(address)
+    elif args.command == "dirs":
+        for path in changed_module_dirs(changed, args.modules_dir):
+            print(path)
+    else:
+        with open(args.report, "r") as f:
+            document = json.load(f)
+        filter_report(document, changed)
+        with open(args.report, "w") as f:
+            json.dump(document, f, indent=4)
+        # A scoped scan fails exactly when a full scan with the same findings would
+        from module_scan import checkov_fail_thresholds, exit_code
+        return exit_code(document, checkov_fail_thresholds(checkov_args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,8 @@ SECURITY_DIR="${PROJECT_ROOT}/security"
 CHECKOV_REPORT_DIR="${SECURITY_DIR}/reports"
 CHECKOV_CONFIG_FILE="${SECURITY_DIR}/checkov.yaml"
 CHECKOV_BASELINE_FILE="${SECURITY_DIR}/checkov.baseline"
+CHECKOV_POLICIES_DIR="${SECURITY_DIR}/checkov-policies"
+CHECKOV_SCAN_CACHE_DIR="${CHECKOV_SCAN_CACHE_DIR:-${SECURITY_DIR}/.scan-cache}"
 
 # Colors
 RED='\033[0;31m'
@@ -37,6 +39,14 @@ usage() {
     echo "  --no-fail           Don't fail on security issues (warning only)"
     echo "  --soft-fail         Exit with code 0 even if issues found"
     echo "  --html              Generate HTML report (default for non-CLI formats)"
+    echo "  --timing            Record per-check timing of the custom CKV_OP_* checks"
+    echo "  --all-policies      Load every custom policy module, not only those for the scanned resource types"
+    echo "  --result-cache FILE Reuse custom CKV_OP_* verdicts of identical resources, persisted in FILE across runs"
+    echo "  --incremental       With --all (JSON/HTML), scan each module separately and reuse the reports of unchanged ones"
+    echo "  --jobs N            With --all (JSON/HTML), scan modules separately, N Checkov processes at a time;"
+    echo "                      each pays Checkov's startup, so this is only faster than the default single"
+    echo "                      scan with several CPUs and large modules"
+    echo "  --changed-from FILE Only scan resources that this 'terraform plan' output creates, updates or replaces"
     echo "  --create-baseline   Create baseline file for existing issues"
     echo ""
     echo "EXAMPLES:"
@@ -45,6 +55,11 @@ usage() {
     echo "  $0 --plan azure-storage-account core-eus-dev"
     echo "  $0 --format json azure-keyvault core-eus-dev"
     echo "  $0 --html --all"
+    echo "  $0 --timing --format json --all"
+    echo "  $0 --changed-from plan.txt --format json --all"
+    echo "  $0 --result-cache .checkov-policy-cache.json --all"
+    echo "  $0 --incremental --html --all"
+    echo "  $0 --jobs 4 --format json --all"
     echo "  $0 --create-baseline"
     echo ""
 }
@@ -92,449 +107,103 @@ generate_html_report() {
     
     log "INFO" "Generating HTML report: $html_file"
     
-    cat > "$html_file" << EOF
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Checkov Security Report - $component</title>
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }
-        .header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-            text-align: center;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }
-        .header h1 {
-            margin: 0;
-            font-size: 2.5em;
-            font-weight: 300;
-        }
-        .header p {
-            margin: 10px 0 0 0;
-            font-size: 1.1em;
-            opacity: 0.9;
-        }
-        .summary {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }
-        .summary-card {
-            background: white;
-            padding: 25px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            text-align: center;
-            transition: transform 0.3s ease;
-        }
-        .summary-card:hover {
-            transform: translateY(-5px);
-        }
-        .summary-card h3 {
-            margin: 0 0 10px 0;
-            font-size: 1.2em;
-            color: #555;
-        }
-        .summary-card .number {
-            font-size: 2.5em;
-            font-weight: bold;
-            margin: 10px 0;
-        }
-        .critical { color: #e74c3c; }
-        .high { color: #e67e22; }
-        .medium { color: #f39c12; }
-        .low { color: #27ae60; }
-        .info { color: #3498db; }
-        .passed { color: #27ae60; }
-        
-        .content {
-            background: white;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }
-        .section {
-            margin-bottom: 30px;
-        }
-        .section h2 {
-            color: #2c3e50;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 10px;
-            margin-bottom: 20px;
-        }
-        .finding {
-            background: #f8f9fa;
-            border: 1px solid #dee2e6;
-            border-radius: 5px;
-            padding: 20px;
-            margin-bottom: 15px;
-            border-left: 4px solid #3498db;
-        }
-        .finding.critical { border-left-color: #e74c3c; }
-        .finding.high { border-left-color: #e67e22; }
-        .finding.medium { border-left-color: #f39c12; }
-        .finding.low { border-left-color: #27ae60; }
-        .finding.info { border-left-color: #3498db; }
-        
-        .finding-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 15px;
-        }
-        .finding-title {
-            font-size: 1.2em;
-            font-weight: 600;
-            color: #2c3e50;
-        }
-        .severity-badge {
-            padding: 5px 15px;
-            border-radius: 20px;
-            color: white;
-            font-size: 0.9em;
-            font-weight: 500;
-            text-transform: uppercase;
-        }
-        .severity-badge.critical { background-color: #e74c3c; }
-        .severity-badge.high { background-color: #e67e22; }
-        .severity-badge.medium { background-color: #f39c12; }
-        .severity-badge.low { background-color: #27ae60; }
-        .severity-badge.info { background-color: #3498db; }
-        
-        .finding-details {
-            margin-top: 15px;
-        }
-        .finding-details p {
-            margin: 5px 0;
-            color: #666;
-        }
-        .finding-details code {
-            background: #f1f2f6;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-family: 'Courier New', monospace;
-            font-size: 0.9em;
-        }
-        .no-issues {
-            text-align: center;
-            padding: 40px;
-            color: #27ae60;
-            font-size: 1.3em;
-        }
-        .no-issues i {
-            font-size: 3em;
-            margin-bottom: 15px;
-            display: block;
-        }
-        .footer {
-            text-align: center;
-            margin-top: 30px;
-            padding: 20px;
-            color: #666;
-            font-size: 0.9em;
-        }
-        .tabs {
-            display: flex;
-            background: #f8f9fa;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            overflow: hidden;
-        }
-        .tab {
-            flex: 1;
-            padding: 15px;
-            text-align: center;
-            cursor: pointer;
-            background: #f8f9fa;
-            border: none;
-            font-size: 1em;
-            transition: background-color 0.3s ease;
-        }
-        .tab.active {
-            background: #3498db;
-            color: white;
-        }
-        .tab:hover {
-            background: #3498db;
-            color: white;
-        }
-        .tab-content {
-            display: none;
-        }
-        .tab-content.active {
-            display: block;
-        }
-        @media (max-width: 768px) {
-            .summary {
-                grid-template-columns: 1fr;
-            }
-            .finding-header {
-                flex-direction: column;
-                align-items: flex-start;
-            }
-            .severity-badge {
-                margin-top: 10px;
-            }
-        }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🔒 Security Report</h1>
-        <p>Checkov Security Scan Results</p>
-        <p><strong>Component:</strong> $component | <strong>Stack:</strong> $stack | <strong>Generated:</strong> $(date)</p>
-    </div>
-EOF
+    # Streams the JSON report and escapes every value (see html_report.py)
+    if python3 "$SCRIPT_DIR/html_report.py" "$json_file" "$html_file" --component "$component" --stack "$stack"; then
+        log "SUCCESS" "HTML report generated: $html_file"
+    else
+        log "ERROR" "Could not render $json_file, see $html_file"
+    fi
+}
 
-    # Parse JSON and generate summary
-    if [[ -f "$json_file" ]]; then
-        python3 << EOF >> "$html_file"
+# Function to turn the directory Checkov 3 writes for --output-file (holding
+# a single results_* file) into the requested file
+collect_checkov_output() {
+    local output_path="$1"
+    if [[ -z "$output_path" || ! -d "$output_path" ]]; then
+        return 0
+    fi
+    local entries=("$output_path"/*)
+    if [[ ${#entries[@]} -ne 1 || ! -f "${entries[0]}" || "$(basename "${entries[0]}")" != results_* ]]; then
+        return 0
+    fi
+    local collected
+    collected="$(mktemp "${output_path}.XXXXXX")"
+    mv "${entries[0]}" "$collected"
+    rmdir "$output_path"
+    mv "$collected" "$output_path"
+}
+
+# Function to add the custom check timing to a Checkov JSON report, next to "results"
+merge_policy_timing() {
+    local json_file="$1"
+    local timing_file="$2"
+
+    if [[ ! -f "$timing_file" ]]; then
+        log "WARN" "No custom check timing was recorded"
+        return 0
+    fi
+
+    if [[ ! -f "$json_file" ]]; then
+        log "INFO" "Custom check timing saved to: $timing_file"
+        return 0
+    fi
+
+    python3 - "$json_file" "$timing_file" << 'EOF'
 import json
 import sys
 
-try:
-    with open('$json_file', 'r') as f:
-        data = json.load(f)
-    
-    # Extract summary data
-    summary = data.get('summary', {})
-    passed = summary.get('passed', 0)
-    failed = summary.get('failed', 0)
-    skipped = summary.get('skipped', 0)
-    
-    # Count by severity
-    results = data.get('results', {})
-    failed_checks = results.get('failed_checks', [])
-    
-    severity_counts = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0, 'INFO': 0}
-    for check in failed_checks:
-        severity = check.get('severity', 'INFO').upper()
-        if severity in severity_counts:
-            severity_counts[severity] += 1
-    
-    print(f'''
-    <div class="summary">
-        <div class="summary-card">
-            <h3>Total Checks</h3>
-            <div class="number">{passed + failed + skipped}</div>
-            <p>Infrastructure checks performed</p>
-        </div>
-        <div class="summary-card">
-            <h3>Passed</h3>
-            <div class="number passed">{passed}</div>
-            <p>Security checks passed</p>
-        </div>
-        <div class="summary-card">
-            <h3>Failed</h3>
-            <div class="number critical">{failed}</div>
-            <p>Security issues found</p>
-        </div>
-        <div class="summary-card">
-            <h3>Skipped</h3>
-            <div class="number">{skipped}</div>
-            <p>Checks skipped</p>
-        </div>
-    </div>
-    
-    <div class="summary">
-        <div class="summary-card">
-            <h3>Critical</h3>
-            <div class="number critical">{severity_counts['CRITICAL']}</div>
-            <p>Must fix immediately</p>
-        </div>
-        <div class="summary-card">
-            <h3>High</h3>
-            <div class="number high">{severity_counts['HIGH']}</div>
-            <p>Fix soon</p>
-        </div>
-        <div class="summary-card">
-            <h3>Medium</h3>
-            <div class="number medium">{severity_counts['MEDIUM']}</div>
-            <p>Fix when possible</p>
-        </div>
-        <div class="summary-card">
-            <h3>Low</h3>
-            <div class="number low">{severity_counts['LOW']}</div>
-            <p>Consider fixing</p>
-        </div>
-    </div>
-    
-    <div class="content">
-        <div class="tabs">
-            <button class="tab active" onclick="showTab('failed')">Failed Checks ({failed})</button>
-            <button class="tab" onclick="showTab('passed')">Passed Checks ({passed})</button>
-            <button class="tab" onclick="showTab('skipped')">Skipped Checks ({skipped})</button>
-        </div>
-        
-        <div id="failed" class="tab-content active">
-            <div class="section">
-                <h2>🚨 Failed Security Checks</h2>
-    ''')
-    
-    if failed_checks:
-        for i, check in enumerate(failed_checks):
-            severity = check.get('severity', 'INFO').lower()
-            check_id = check.get('check_id', 'Unknown')
-            check_name = check.get('check_name', 'Unknown Check')
-            resource = check.get('resource', 'Unknown Resource')
-            file_path = check.get('file_path', 'Unknown File')
-            description = check.get('description', 'No description available')
-            
-            print(f'''
-                <div class="finding {severity}">
-                    <div class="finding-header">
-                        <div class="finding-title">{check_name}</div>
-                        <div class="severity-badge {severity}">{severity.upper()}</div>
-                    </div>
-                    <div class="finding-details">
-                        <p><strong>Check ID:</strong> <code>{check_id}</code></p>
-                        <p><strong>Resource:</strong> <code>{resource}</code></p>
-                        <p><strong>File:</strong> <code>{file_path}</code></p>
-                        <p><strong>Description:</strong> {description}</p>
-                    </div>
-                </div>
-            ''')
-    else:
-        print('''
-            <div class="no-issues">
-                <i>✅</i>
-                <p>No security issues found! All checks passed.</p>
-            </div>
-        ''')
-    
-    print('''
-            </div>
-        </div>
-        
-        <div id="passed" class="tab-content">
-            <div class="section">
-                <h2>✅ Passed Security Checks</h2>
-    ''')
-    
-    passed_checks = results.get('passed_checks', [])
-    if passed_checks:
-        for check in passed_checks[:20]:  # Show first 20 passed checks
-            check_id = check.get('check_id', 'Unknown')
-            check_name = check.get('check_name', 'Unknown Check')
-            resource = check.get('resource', 'Unknown Resource')
-            
-            print(f'''
-                <div class="finding">
-                    <div class="finding-header">
-                        <div class="finding-title">{check_name}</div>
-                        <div class="severity-badge passed">PASSED</div>
-                    </div>
-                    <div class="finding-details">
-                        <p><strong>Check ID:</strong> <code>{check_id}</code></p>
-                        <p><strong>Resource:</strong> <code>{resource}</code></p>
-                    </div>
-                </div>
-            ''')
-        
-        if len(passed_checks) > 20:
-            print(f'<p><em>... and {len(passed_checks) - 20} more passed checks</em></p>')
-    else:
-        print('<p>No passed checks to display.</p>')
-    
-    print('''
-            </div>
-        </div>
-        
-        <div id="skipped" class="tab-content">
-            <div class="section">
-                <h2>⏭️ Skipped Security Checks</h2>
-    ''')
-    
-    skipped_checks = results.get('skipped_checks', [])
-    if skipped_checks:
-        for check in skipped_checks:
-            check_id = check.get('check_id', 'Unknown')
-            check_name = check.get('check_name', 'Unknown Check')
-            suppress_comment = check.get('suppress_comment', 'No reason provided')
-            
-            print(f'''
-                <div class="finding">
-                    <div class="finding-header">
-                        <div class="finding-title">{check_name}</div>
-                        <div class="severity-badge info">SKIPPED</div>
-                    </div>
-                    <div class="finding-details">
-                        <p><strong>Check ID:</strong> <code>{check_id}</code></p>
-                        <p><strong>Reason:</strong> {suppress_comment}</p>
-                    </div>
-                </div>
-            ''')
-    else:
-        print('<p>No skipped checks to display.</p>')
-    
-    print('''
-            </div>
-        </div>
-    </div>
-    ''')
-
-except Exception as e:
-    print(f'<div class="content"><p>Error parsing JSON report: {e}</p></div>')
+json_file, timing_file = sys.argv[1], sys.argv[2]
+with open(json_file, 'r') as f:
+    report = json.load(f)
+with open(timing_file, 'r') as f:
+    timing = json.load(f)
+
+# Checkov writes a list of reports when several frameworks ran
+for entry in report if isinstance(report, list) else [report]:
+    if entry.get('check_type', 'terraform') == 'terraform':
+        entry['policy_timing'] = timing
+
+with open(json_file, 'w') as f:
+    json.dump(report, f, indent=4)
 EOF
+    rm -f "$timing_file"
+}
+
+# Function to stage the custom policy modules relevant to a scan path; prints the staged directory
+stage_policies() {
+    local scan_path="$1"
+    
+    # Only when the configuration loads the repository policies
+    if [[ "${ALL_POLICIES:-false}" == "true" ]] || \
+       ! grep -qE '^external-checks-dir:[[:space:]]*checkov-policies[[:space:]]*$' "$CHECKOV_CONFIG_FILE" 2>/dev/null; then
+        return 0
+    fi
+    
+    local staged_dir
+    staged_dir="$(mktemp -d "${TMPDIR:-/tmp}/checkov-policies.XXXXXX")"
+    local selected
+    if selected=$(python3 "$CHECKOV_POLICIES_DIR/policy_index.py" stage "$scan_path" "$staged_dir"); then
+        log "INFO" "Custom policies: $selected" >&2
+        echo "$staged_dir"
     else
-        cat >> "$html_file" << EOF
-    <div class="content">
-        <div class="no-issues">
-            <i>❌</i>
-            <p>Could not generate report. JSON file not found.</p>
-        </div>
-    </div>
-EOF
+        log "WARN" "Could not stage custom policies, loading all of them" >&2
+        rm -rf "$staged_dir"
     fi
+}
 
-    cat >> "$html_file" << EOF
-    
-    <div class="footer">
-        <p>Generated by Checkov Security Scanner | One Platform Infrastructure</p>
-        <p>Report generated on $(date)</p>
-    </div>
-    
-    <script>
-        function showTab(tabName) {
-            // Hide all tab contents
-            var tabContents = document.querySelectorAll('.tab-content');
-            tabContents.forEach(function(content) {
-                content.classList.remove('active');
-            });
-            
-            // Remove active class from all tabs
-            var tabs = document.querySelectorAll('.tab');
-            tabs.forEach(function(tab) {
-                tab.classList.remove('active');
-            });
-            
-            // Show selected tab content
-            document.getElementById(tabName).classList.add('active');
-            
-            // Add active class to clicked tab
-            event.target.classList.add('active');
-        }
-    </script>
-</body>
-</html>
-EOF
+# Function to list the module directories that declare resources changed by the plan
+changed_module_dirs() {
+    local modules_dir="$1"
+    python3 "$SCRIPT_DIR/changed_scope.py" "$CHANGED_FROM" dirs "$modules_dir"
+}
 
-    log "SUCCESS" "HTML report generated: $html_file"
+# Function to drop results about unchanged resources from a Checkov JSON report;
+# fails when checks on changed resources still fail the hard-fail-on/soft-fail
+# rules of the Checkov arguments (and config file) passed after the report
+scope_report_to_changes() {
+    local json_file="$1"
+    shift
+    python3 "$SCRIPT_DIR/changed_scope.py" "$CHANGED_FROM" filter-report "$json_file" -- "$@"
 }
 
 # Function to generate report filename
@@ -571,6 +240,13 @@ scan_component() {
         return 1
     fi
     
+    # Skip components the plan does not touch
+    if [[ -n "${CHANGED_FROM:-}" ]] && \
+       ! changed_module_dirs "$(dirname "$component_dir")" | grep -xF "$component_dir" > /dev/null; then
+        log "SUCCESS" "No resources of $component are changed by $CHANGED_FROM, skipping scan"
+        return 0
+    fi
+    
     # Generate output filename if not specified
     local output_file="${OUTPUT_FILE:-}"
     if [[ -z "$output_file" ]]; then
@@ -622,12 +298,26 @@ scan_component() {
     fi
     
     # Scan based on type
+    local staged_policies=""
     if [[ "$scan_type" == "plan" ]] && [[ -f "$plan_file" ]]; then
         log "INFO" "Scanning Terraform plan file: $plan_file"
         checkov_args+=("--file" "$plan_file")
     else
         log "INFO" "Scanning Terraform code in: $component_dir"
         checkov_args+=("--directory" "$component_dir")
+        # Load only the custom policy modules for the component's resource types
+        staged_policies="$(stage_policies "$component_dir")"
+        if [[ -n "$staged_policies" ]]; then
+            checkov_args+=("--external-checks-dir" "$staged_policies")
+        fi
+    fi
+    
+    # Record custom check timing if requested
+    local timing_file=""
+    if [[ "${TIMING:-false}" == "true" ]]; then
+        timing_file="${json_file:-${output_file}}.timing.json"
+        rm -f "$timing_file"
+        export CHECKOV_POLICY_TIMING="$timing_file"
     fi
     
     # Run Checkov
@@ -648,6 +338,26 @@ scan_component() {
         fi
     fi
     
+    if [[ -n "$staged_policies" ]]; then
+        rm -rf "$staged_policies"
+    fi
+    
+    collect_checkov_output "${json_file:-$output_file}"
+    
+    # With a JSON report, pass/fail is decided on the changed resources only
+    if [[ -n "${CHANGED_FROM:-}" && -f "${json_file:-$output_file}" ]]; then
+        if scope_report_to_changes "${json_file:-$output_file}" "${checkov_args[@]}"; then
+            exit_code=0
+        elif [[ "${SOFT_FAIL:-false}" != "true" ]]; then
+            exit_code=1
+        fi
+    fi
+    
+    if [[ -n "$timing_file" ]]; then
+        unset CHECKOV_POLICY_TIMING
+        merge_policy_timing "${json_file:-$output_file}" "$timing_file"
+    fi
+    
     # Generate HTML report if requested
     if [[ "${OUTPUT_FORMAT:-html}" == "html" && -f "$json_file" ]]; then
         generate_html_report "$json_file" "$output_file" "$component" "$stack"
@@ -691,9 +401,41 @@ scan_all_components() {
     local checkov_args=(
         "--framework" "terraform"
         "--quiet"
-        "--directory" "$components_dir"
     )
     
+    # Per-module scans are stitched from JSON, and each Checkov run would
+    # overwrite the timing file
+    local incremental="${INCREMENTAL:-false}"
+    local per_module=false
+    if [[ "$incremental" == "true" || -n "${JOBS:-}" ]]; then
+        per_module=true
+        if [[ "${OUTPUT_FORMAT:-html}" != "html" && "${OUTPUT_FORMAT:-html}" != "json" ]]; then
+            log "WARN" "--incremental and --jobs need JSON or HTML output, scanning all modules at once"
+            per_module=false
+        elif [[ "${TIMING:-false}" == "true" ]]; then
+            log "WARN" "--incremental and --jobs are not combined with --timing, scanning all modules at once"
+            per_module=false
+        fi
+    fi
+    
+    # Only the modules that declare changed resources, when scoped to a plan
+    local scan_dirs=()
+    if [[ -n "${CHANGED_FROM:-}" ]]; then
+        local changed_dirs
+        changed_dirs="$(changed_module_dirs "$components_dir")"
+        if [[ -z "$changed_dirs" ]]; then
+            log "SUCCESS" "No component resources are changed by $CHANGED_FROM, skipping scan"
+            return 0
+        fi
+        local changed_dir
+        while IFS= read -r changed_dir; do
+            log "INFO" "Changed component: $(basename "$changed_dir")"
+            scan_dirs+=("$changed_dir")
+        done <<< "$changed_dirs"
+    elif [[ "$per_module" != "true" ]]; then
+        scan_dirs+=("$components_dir")
+    fi
+    
     # Add config file if exists
     if [[ -f "$CHECKOV_CONFIG_FILE" ]]; then
         checkov_args+=("--config-file" "$CHECKOV_CONFIG_FILE")
@@ -715,28 +457,65 @@ scan_all_components() {
         checkov_args+=("--soft-fail")
     fi
     
-    # Set output format and file
-    if [[ "${OUTPUT_FORMAT:-html}" == "html" ]]; then
-        # Generate JSON first for HTML conversion
-        checkov_args+=("--output" "json" "--output-file" "$json_file")
+    # Per-module scans: module_scan.py runs Checkov per module (with the
+    # arguments so far) in a bounded pool, reuses cached reports when
+    # incremental, writes the merged JSON and applies hard-fail-on to it
+    local scan_command=(checkov)
+    if [[ "$per_module" == "true" ]]; then
+        scan_command=(python3 "$SCRIPT_DIR/module_scan.py" ${scan_dirs[@]+"${scan_dirs[@]}"}
+                      --modules-dir "$components_dir" --config-file "$CHECKOV_CONFIG_FILE"
+                      --policies-dir "$CHECKOV_POLICIES_DIR" --output "${json_file:-$output_file}")
+        if [[ "$incremental" == "true" ]]; then
+            log "INFO" "Incremental scan, per-module reports cached in $CHECKOV_SCAN_CACHE_DIR"
+            scan_command+=(--cache-dir "$CHECKOV_SCAN_CACHE_DIR")
+        fi
+        if [[ -n "${JOBS:-}" ]]; then
+            log "INFO" "Scanning modules with $JOBS parallel Checkov processes"
+            local cpus
+            cpus="$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 1)"
+            if [[ "$cpus" -le 1 ]]; then
+                log "WARN" "Only $cpus CPU: per-module scans run one after another and are slower than a single scan"
+            fi
+            scan_command+=(--workers "$JOBS")
+        fi
+        scan_command+=(--)
     else
-        checkov_args+=("--output" "${OUTPUT_FORMAT:-cli}")
-        if [[ -n "$output_file" ]]; then
-            checkov_args+=("--output-file" "$output_file")
+        local scan_dir
+        for scan_dir in ${scan_dirs[@]+"${scan_dirs[@]}"}; do
+            checkov_args+=("--directory" "$scan_dir")
+        done
+    
+        # Set output format and file
+        if [[ "${OUTPUT_FORMAT:-html}" == "html" ]]; then
+            # Generate JSON first for HTML conversion
+            checkov_args+=("--output" "json" "--output-file" "$json_file")
+        else
+            checkov_args+=("--output" "${OUTPUT_FORMAT:-cli}")
+            if [[ -n "$output_file" ]]; then
+                checkov_args+=("--output-file" "$output_file")
+            fi
         fi
     fi
     
+    # Record custom check timing if requested
+    local timing_file=""
+    if [[ "${TIMING:-false}" == "true" ]]; then
+        timing_file="${json_file:-${output_file}}.timing.json"
+        rm -f "$timing_file"
+        export CHECKOV_POLICY_TIMING="$timing_file"
+    fi
+    
     # Run Checkov
     local exit_code=0
     if [[ "${NO_FAIL:-false}" == "true" ]]; then
-        checkov "${checkov_args[@]}" || exit_code=$?
+        "${scan_command[@]}" "${checkov_args[@]}" || exit_code=$?
         if [[ $exit_code -ne 0 ]]; then
             log "WARN" "Security issues found in components (exit code: $exit_code)"
         else
             log "SUCCESS" "No security issues found in components"
         fi
     else
-        if checkov "${checkov_args[@]}"; then
+        if "${scan_command[@]}" "${checkov_args[@]}"; then
             log "SUCCESS" "No security issues found in components"
         else
             log "ERROR" "Security issues found in components"
@@ -744,6 +523,22 @@ scan_all_components() {
         fi
     fi
     
+    collect_checkov_output "${json_file:-$output_file}"
+    
+    # With a JSON report, pass/fail is decided on the changed resources only
+    if [[ -n "${CHANGED_FROM:-}" && -f "${json_file:-$output_file}" ]]; then
+        if scope_report_to_changes "${json_file:-$output_file}" "${checkov_args[@]}"; then
+            exit_code=0
+        elif [[ "${SOFT_FAIL:-false}" != "true" ]]; then
+            exit_code=1
+        fi
+    fi
+    
+    if [[ -n "$timing_file" ]]; then
+        unset CHECKOV_POLICY_TIMING
+        merge_policy_timing "${json_file:-$output_file}" "$timing_file"
+    fi
+    
     # Generate HTML report if requested
     if [[ "${OUTPUT_FORMAT:-html}" == "html" && -f "$json_file" ]]; then
         generate_html_report "$json_file" "$output_file" "all" "all"
@@ -922,6 +717,31 @@ main() {
                 create_baseline_flag=true
                 shift
                 ;;
+            --timing)
+                TIMING=true
+                shift
+                ;;
+            --all-policies)
+                ALL_POLICIES=true
+                shift
+                ;;
+            --changed-from)
+                CHANGED_FROM="$2"
+                shift 2
+                ;;
+            --incremental)
+                INCREMENTAL=true
+                shift
+                ;;
+            --jobs)
+                JOBS="$2"
+                shift 2
+                ;;
+            --result-cache)
+                # Absolute, as Checkov may run from another directory
+                export CHECKOV_POLICY_CACHE="$(cd "$(dirname "$2")" && pwd)/$(basename "$2")"
+                shift 2
+                ;;
             -*)
                 log "ERROR" "Unknown option: $1"
                 usage
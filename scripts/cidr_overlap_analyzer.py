@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+CIDR Overlap Analyzer
+Indexes every VNet address space and subnet prefix across all Atmos stacks as
+integer intervals and reports overlapping VNets, subnets outside their VNet
+and overlapping sibling subnets
+"""
+
+import argparse
+import bisect
+import heapq
+import ipaddress
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from atmos_stacks import ATMOS_DIR, StackRepository, TerraformOutput
+
+VNET_COMPONENT = "azure-vnet"
+SUBNET_COMPONENT = "azure-subnet"
+
+
+class Network:
+    """One CIDR of a component, stored as the closed integer interval [start, end]"""
+
+    __slots__ = ("version", "start", "end", "cidr", "stack", "component", "vnet")
+
+    def __init__(self, network, cidr, stack, component, vnet=None):
+        self.version = network.version
+        self.start = int(network.network_address)
+        self.end = int(network.broadcast_address)
+        self.cidr = cidr
+        self.stack = stack
+        self.component = component
+        self.vnet = vnet
+
+    @property
+    def key(self):
+        return (self.version, self.start, -self.end)
+
+    def describe(self):
+        return {"stack": self.stack, "component": self.component, "cidr": self.cidr}
+
+
+def relation(a, b):
+    """Relation between two overlapping intervals, seen from a"""
+    if a.start == b.start and a.end == b.end:
+        return "identical"
+    if a.start <= b.start and b.end <= a.end:
+        return "contains"
+    if b.start <= a.start and a.end <= b.end:
+        return "contained_by"
+    return "overlaps"
+
+
+def find_overlaps(networks):
+    """
+    Yield every overlapping pair with a sort + sweep over interval starts.
+    A min-heap of active interval ends drops intervals that closed before the
+    current start, so the cost is O(n log n + k) for k reported pairs.
+    """
+    active = []  # (version, end, index)
+    ordered = sorted(networks, key=lambda n: n.key)
+    for index, network in enumerate(ordered):
+        while active and (active[0][0], active[0][1]) < (network.version, network.start):
+            heapq.heappop(active)
+        for _, _, other in active:
+            yield ordered[other], network
+        heapq.heappush(active, (network.version, network.end, index))
+
+
+def merge_ranges(networks):
+    """Sorted, merged (version, start, end) ranges for a set of networks"""
+    merged = []
+    for network in sorted(networks, key=lambda n: n.key):
+        if merged and merged[-1][0] == network.version and network.start <= merged[-1][2] + 1:
+            if network.end > merged[-1][2]:
+                merged[-1] = (network.version, merged[-1][1], network.end)
+        else:
+            merged.append((network.version, network.start, network.end))
+    return merged
+
+
+def contained(ranges, network):
+    """Whether the network fits in one of the merged ranges (binary search)"""
+    index = bisect.bisect_right(ranges, (network.version, network.start, float("inf"))) - 1
+    if index < 0:
+        return False
+    version, _, end = ranges[index]
+    return version == network.version and network.end <= end
+
+
+def parse_cidrs(value):
+    """Split a component var into parsed networks and values that are not literal CIDRs"""
+    values = value if isinstance(value, list) else [value]
+    parsed, unresolved = [], []
+    for item in values:
+        if isinstance(item, str):
+            try:
+                parsed.append((ipaddress.ip_network(item.strip(), strict=False), item.strip()))
+                continue
+            except ValueError:
+                pass
+        unresolved.append(repr(item) if isinstance(item, TerraformOutput) else str(item))
+    return parsed, unresolved
+
+
+def enabled(section):
+    return (section.get("vars") or {}).get("enabled", True) is not False
+
+
+def subnet_vnet(stack, section):
+    """(stack, component) of the VNet a subnet belongs to, or None"""
+    vnet = (section.get("vars") or {}).get("virtual_network_name")
+    if isinstance(vnet, TerraformOutput):
+        return (vnet.stack or stack, vnet.component)
+    return None
+
+
+class CidrIndex:
+    """VNet and subnet networks collected from all stacks"""
+
+    def __init__(self):
+        self.vnets = []
+        self.subnets = []
+        self.skipped = []
+
+    def add_vnet(self, stack, component, address_space):
+        parsed, unresolved = parse_cidrs(address_space or [])
+        for network, cidr in parsed:
+            self.vnets.append(Network(network, cidr, stack, component))
+        self._skip(stack, component, unresolved)
+
+    def add_subnet(self, stack, component, address_prefixes, vnet):
+        parsed, unresolved = parse_cidrs(address_prefixes or [])
+        for network, cidr in parsed:
+            self.subnets.append(Network(network, cidr, stack, component, vnet))
+        self._skip(stack, component, unresolved)
+
+    def _skip(self, stack, component, values):
+        for value in values:
+            self.skipped.append({"stack": stack, "component": component, "value": value,
+                                 "reason": "not a literal CIDR"})
+
+    @classmethod
+    def from_stacks(cls, stacks):
+        index = cls()
+        for stack in stacks:
+            for name, base, section in stack.components():
+                if not enabled(section):
+                    continue
+                variables = section.get("vars") or {}
+                if base == VNET_COMPONENT:
+                    index.add_vnet(stack.name, name, variables.get("address_space"))
+                elif base == SUBNET_COMPONENT:
+                    index.add_subnet(stack.name, name, variables.get("address_prefixes"),
+                                     subnet_vnet(stack.name, section))
+        return index
+
+    def analyze(self):
+        findings = []
+
+        for a, b in find_overlaps(self.vnets):
+            if a.stack == b.stack and a.component == b.component:
+                kind = "vnet_address_space_overlap"
+            else:
+                kind = "vnet_overlap"
+            findings.append({"type": kind, "relation": relation(a, b),
+                             "network": a.describe(), "other": b.describe()})
+
+        vnet_ranges = defaultdict(list)
+        for network in self.vnets:
+            vnet_ranges[(network.stack, network.component)].append(network)
+        vnet_ranges = {key: merge_ranges(networks) for key, networks in vnet_ranges.items()}
+
+        by_vnet = defaultdict(list)
+        for subnet in self.subnets:
+            if subnet.vnet is None or subnet.vnet not in vnet_ranges:
+                findings.append({"type": "subnet_vnet_unresolved", "network": subnet.describe(),
+                                 "vnet": "/".join(subnet.vnet) if subnet.vnet else None})
+                continue
+            by_vnet[subnet.vnet].append(subnet)
+            if not contained(vnet_ranges[subnet.vnet], subnet):
+                findings.append({"type": "subnet_outside_vnet", "network": subnet.describe(),
+                                 "vnet": "/".join(subnet.vnet)})
+
+        for vnet, subnets in by_vnet.items():
+            for a, b in find_overlaps(subnets):
+                findings.append({"type": "subnet_overlap", "relation": relation(a, b),
+                                 "network": a.describe(), "other": b.describe(),
+                                 "vnet": "/".join(vnet)})
+        return findings
+
+
+def format_network(network):
+    return f"{network['stack']}/{network['component']} {network['cidr']}"
+
+
+def render_text(index, findings):
+    lines = [f"Indexed {len(index.vnets)} VNet and {len(index.subnets)} subnet CIDRs"]
+    for finding in findings:
+        kind = finding["type"]
+        if "other" in finding:
+            lines.append(f"❌ {kind}: {format_network(finding['network'])} "
+                         f"{finding['relation']} {format_network(finding['other'])}")
+        else:
+            lines.append(f"❌ {kind}: {format_network(finding['network'])} (vnet: {finding['vnet']})")
+    for skipped in index.skipped:
+        lines.append(f"⚠️  skipped {skipped['stack']}/{skipped['component']}: "
+                     f"{skipped['value']} ({skipped['reason']})")
+    if not findings:
+        lines.append("✅ No overlapping or misplaced CIDRs")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report overlapping VNet/subnet CIDRs across Atmos stacks")
+    parser.add_argument("--atmos-dir", default=str(ATMOS_DIR), help="Directory containing atmos.yaml")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args()
+
+    stacks = StackRepository(Path(args.atmos_dir)).load_all()
+    index = CidrIndex.from_stacks(stacks)
+    findings = index.analyze()
+
+    if args.format == "json":
+        print(json.dumps({"vnets": len(index.vnets), "subnets": len(index.subnets),
+                          "findings": findings, "skipped": index.skipped}, indent=2))
+    else:
+        print(render_text(index, findings))
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
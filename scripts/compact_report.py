@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Compact Checkov Reports
+Converts Checkov JSON reports to a compact, compressed format and reads them
+back. Checkov repeats the same long values in every check (absolute paths of
+the machine that ran the scan, breadcrumbs, code blocks, guidelines) and
+writes every unset field as null; the compact format stores:
+
+- paths under the report's root (the checkout that was scanned) relative to it
+- every string and nested value once, in a string table the checks refer to
+  by index
+- each check as its values only, against a shape listing its keys in order,
+  with null fields dropped (the shape records where they were)
+- gzip or lzma compression on top
+
+Conversion is lossless: decoding gives back the Checkov JSON document, with
+the same keys in the same order (byte for byte for Checkov's own single-line
+output).
+
+File layout, one JSON value per line inside the compression:
+
+    {"format": "checkov-compact", "version": 1, "root": "/path/or/null"}
+    ["s", string, ...]            strings appended to the string table
+    ["k", [key, kind], ...]       a check shape; kind is s (string table
+                                  index), j (string table index of a JSON
+                                  value), v (plain value) or n (null)
+    ["{", key] ["[", key]         an object or array opens (key when it is
+    ["}"] ["]"]                   an object member) or closes
+    ["=", key, value]             any other object member
+    ["-", value]                  an array item that is not a check
+    [shape, value, ...]           a check, in the array open before it
+
+Both directions stream: open_report() gives a reader with the
+plan_json_stream.iter_values interface for Checkov JSON and compact reports
+alike, which html_report.py and report_index.py use, so tooling never holds
+a whole report in memory. The reader keeps only the string table, which
+grows with the distinct values of the report, not with its checks.
+"""
+
+import argparse
+import gzip
+import json
+import lzma
+import os
+import sys
+import tempfile
+import time
+from itertools import zip_longest
+
+from plan_json_stream import CHUNK_SIZE, CONTAINER_EVENTS, ContainerEvent, iter_values
+
+FORMAT = "checkov-compact"
+VERSION = 1
+
+COMPRESSIONS = {
+    "gzip": (b"\x1f\x8b", ".ckv.gz"),
+    "lzma": (b"\xfd7zXZ\x00", ".ckv.xz"),
+}
+COMPACT_SUFFIXES = tuple(suffix for _, suffix in COMPRESSIONS.values())
+
+RESULT_KEYS = ("passed_checks", "failed_checks", "skipped_checks")
+# Checkov 3 writes --output-file as a directory holding this file
+CHECKOV_JSON_NAME = "results_json.json"
+# Checks looked at to find the root of a report's absolute paths
+ROOT_SAMPLE = 100
+
+# Root-relative strings start with ROOT_MARK and a "/"; strings that start
+# with ROOT_MARK themselves get it doubled, so both map back unambiguously
+ROOT_MARK = "@"
+
+SEPARATORS = (",", ":")
+
+
+def is_check_list(path):
+    return len(path) == 2 and path[0] == "results" and path[1] in RESULT_KEYS
+
+
+def is_document_member(path):
+    """Members kept whole: top-level ones other than results, and results' other lists (parsing_errors)"""
+    if len(path) == 1:
+        return path != ("results",)
+    return len(path) == 2 and path[0] == "results" and path[1] not in RESULT_KEYS
+
+
+def is_document_container(path):
+    """The document (or list of documents, one per framework), results, and the check lists"""
+    return path in ((), ("results",)) or is_check_list(path)
+
+
+def compact_path(root, value):
+    """A string with a leading root replaced by ROOT_MARK"""
+    if root is None:
+        return value
+    if value.startswith(root) and value[len(root):len(root) + 1] == "/":
+        return ROOT_MARK + value[len(root):]
+    if value.startswith(ROOT_MARK):
+        return ROOT_MARK + value
+    return value
+
+
+def expand_path(root, value):
+    if root is None or not value.startswith(ROOT_MARK):
+        return value
+    if value[1:2] == "/":
+        return root + value[1:]
+    return value[1:]
+
+
+def map_strings(value, convert):
+    """value with convert applied to every string in it (object keys excluded)"""
+    if isinstance(value, str):
+        return convert(value)
+    if isinstance(value, list):
+        return [map_strings(item, convert) for item in value]
+    if isinstance(value, dict):
+        return {key: map_strings(item, convert) for key, item in value.items()}
+    return value
+
+
+class CompactWriter:
+    """Writes compact report lines to a text stream, interning strings and check shapes as they appear"""
+
+    def __init__(self, out, root=None):
+        self.out = out
+        self.root = root
+        self.strings = {}
+        self.shapes = {}
+        self.new_strings = []
+        # The root as it appears inside JSON text
+        self.json_root = None if root is None else json.dumps(root, ensure_ascii=False)[1:-1]
+        self.out.write(json.dumps({"format": FORMAT, "version": VERSION, "root": root}) + "\n")
+
+    def line(self, value):
+        self.out.write(json.dumps(value, separators=SEPARATORS, ensure_ascii=False) + "\n")
+
+    def intern(self, value):
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+            self.new_strings.append(value)
+        return index
+
+    def relative(self, value):
+        return map_strings(value, lambda string: compact_path(self.root, string))
+
+    def container(self, event, key=None):
+        self.line([str(event)] if key is None else [str(event), key])
+
+    def member(self, key, value):
+        self.line(["=", key, self.relative(value)])
+
+    def item(self, value):
+        if not isinstance(value, dict):
+            self.line(["-", self.relative(value)])
+            return
+        shape, values = [], []
+        for key, field in value.items():
+            if field is None:
+                shape.append((key, "n"))
+            elif isinstance(field, str):
+                shape.append((key, "s"))
+                values.append(self.intern(compact_path(self.root, field)))
+            elif isinstance(field, (dict, list)):
+                shape.append((key, "j"))
+                text = json.dumps(field, separators=SEPARATORS, ensure_ascii=False)
+                if self.root is not None and (self.json_root in text or ROOT_MARK in text):
+                    text = json.dumps(self.relative(field), separators=SEPARATORS, ensure_ascii=False)
+                values.append(self.intern(text))
+            else:
+                shape.append((key, "v"))
+                values.append(field)
+        shape = tuple(shape)
+        shape_id = self.shapes.get(shape)
+        if self.new_strings:
+            self.line(["s", *self.new_strings])
+            self.new_strings = []
+        if shape_id is None:
+            shape_id = self.shapes[shape] = len(self.shapes)
+            self.line(["k", *shape])
+        self.line([shape_id, *values])
+
+
+class JsonReport:
+    """A Checkov JSON report, read with plan_json_stream"""
+
+    compact = False
+
+    def __init__(self, path):
+        self.stream = open(path, "r", encoding="utf-8")
+
+    def iter_values(self, is_item, is_member=None, chunk_size=CHUNK_SIZE, is_container=None):
+        return iter_values(self.stream, is_item, is_member, chunk_size, is_container)
+
+    def close(self):
+        self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CompactReport(JsonReport):
+    """A compact report, read with the same interface (and the same results) as its Checkov JSON"""
+
+    compact = True
+
+    def __init__(self, path, compression):
+        opener = gzip.open if compression == "gzip" else lzma.open
+        self.stream = opener(path, "rt", encoding="utf-8")
+        self.root = None
+
+    def lines(self):
+        try:
+            header = json.loads(self.stream.readline() or "null")
+            if not isinstance(header, dict) or header.get("format") != FORMAT:
+                raise ValueError("Not a compact Checkov report")
+            if header.get("version") != VERSION:
+                raise ValueError(f"Unsupported compact report version {header.get('version')}")
+            self.root = header.get("root")
+            for line in self.stream:
+                yield json.loads(line)
+        except (OSError, EOFError, lzma.LZMAError) as error:
+            raise ValueError(f"Corrupt compact report: {error}") from error
+
+    def expand(self, value):
+        return expand_path(self.root, value)
+
+    def tokens(self):
+        """(tag, key, value) in document order: tag is a container event, "=" for a value"""
+        strings, shapes = [], []
+        for line in self.lines():
+            tag = line[0]
+            if isinstance(tag, int):
+                values = iter(line[1:])
+                check = {}
+                for key, kind in shapes[tag]:
+                    if kind == "n":
+                        check[key] = None
+                    elif kind == "s":
+                        check[key] = expand_path(self.root, strings[next(values)])
+                    elif kind == "j":
+                        text = strings[next(values)]
+                        check[key] = json.loads(text)
+                        if self.root is not None and ROOT_MARK in text:
+                            check[key] = map_strings(check[key], self.expand)
+                    else:
+                        check[key] = next(values)
+                yield "=", None, check
+            elif tag == "s":
+                strings.extend(line[1:])
+            elif tag == "k":
+                shapes.append(line[1:])
+            elif tag == "=":
+                yield "=", line[1], map_strings(line[2], self.expand)
+            elif tag == "-":
+                yield "=", None, map_strings(line[1], self.expand)
+            elif tag in CONTAINER_EVENTS:
+                yield CONTAINER_EVENTS[tag], line[1] if len(line) > 1 else None, None
+            else:
+                raise ValueError(f"Unknown compact report line: {tag!r}")
+
+    def build(self, tokens, event):
+        """The value of a container whose opening token was just read"""
+        value = {} if event == "{" else []
+        for tag, key, item in tokens:
+            if tag in ("}", "]"):
+                return value
+            if tag in ("{", "["):
+                item = self.build(tokens, tag)
+            if key is None:
+                value.append(item)
+            else:
+                value[key] = item
+        raise ValueError("Unterminated container in compact report")
+
+    def iter_values(self, is_item, is_member=None, chunk_size=CHUNK_SIZE, is_container=None):
+        tokens = self.tokens()
+        # Frames: (key path, is_target, yields events)
+        stack = []
+        # The document is reported like the values of a container that yields events
+        root_events = is_container is not None and bool(is_container(()))
+        for tag, key, value in tokens:
+            if tag in ("}", "]"):
+                path, _, events = stack.pop()
+                if events:
+                    yield path, CONTAINER_EVENTS[tag]
+                continue
+            parent_path, parent_target, parent_events = stack[-1] if stack else ((), False, root_events)
+            if key is None:
+                path, selected = parent_path, parent_target
+            else:
+                path = parent_path + (key,)
+                selected = is_member is not None and bool(is_member(path))
+            if tag == "=":
+                if selected:
+                    yield path, value
+                else:
+                    yield from walk(path, value, is_item, is_member, is_container, parent_events)
+            elif selected or (parent_events and not is_container(path)):
+                yield path, self.build(tokens, tag)
+            else:
+                events = is_container is not None and bool(is_container(path))
+                if events:
+                    yield path, CONTAINER_EVENTS[tag]
+                stack.append((path, tag == "[" and bool(is_item(path)), events))
+
+    def write_json(self, out):
+        """Write the Checkov JSON document, formatted as json.dumps does"""
+        first = []
+        for tag, key, value in self.tokens():
+            if tag in ("}", "]"):
+                first.pop()
+                out.write(tag)
+                continue
+            if first:
+                if not first[-1]:
+                    out.write(", ")
+                first[-1] = False
+            if key is not None:
+                out.write(json.dumps(key) + ": ")
+            if tag == "=":
+                out.write(json.dumps(value))
+            else:
+                out.write(tag)
+                first.append(True)
+
+
+def walk(path, value, is_item, is_member, is_container, reported=False):
+    """
+    What iter_values yields inside a value that is not decoded whole;
+    ``reported`` when its container yields events, so the value is never skipped
+    """
+    events = isinstance(value, (dict, list)) and is_container is not None and is_container(path)
+    if reported and not events:
+        yield path, value
+    elif isinstance(value, dict):
+        if events:
+            yield path, CONTAINER_EVENTS["{"]
+        for key, member in value.items():
+            member_path = path + (key,)
+            if is_member is not None and is_member(member_path):
+                yield member_path, member
+            else:
+                yield from walk(member_path, member, is_item, is_member, is_container, events)
+        if events:
+            yield path, CONTAINER_EVENTS["}"]
+    elif isinstance(value, list):
+        if events:
+            yield path, CONTAINER_EVENTS["["]
+        target = is_item(path)
+        for item in value:
+            if target:
+                yield path, item
+            else:
+                yield from walk(path, item, is_item, is_member, is_container, events)
+        if events:
+            yield path, CONTAINER_EVENTS["]"]
+
+
+def resolve_report(path):
+    """The file of a report path, which may be Checkov's output directory"""
+    if os.path.isdir(path):
+        return os.path.join(path, CHECKOV_JSON_NAME)
+    return path
+
+
+def compression_of(path):
+    """gzip or lzma for a compact report (by its magic bytes), None otherwise"""
+    with open(path, "rb") as f:
+        head = f.read(8)
+    for compression, (magic, _) in COMPRESSIONS.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_report(path):
+    """A reader for a Checkov JSON or compact report (or Checkov's output directory)"""
+    path = resolve_report(path)
+    compression = compression_of(path)
+    if compression is None:
+        return JsonReport(path)
+    return CompactReport(path, compression)
+
+
+def detect_root(report):
+    """
+    The checkout a Checkov JSON report's absolute paths are under: a check's
+    file_abs_path minus its repo_file_path
+    """
+    for number, (_, check) in enumerate(report.iter_values(is_check_list)):
+        if number >= ROOT_SAMPLE:
+            break
+        if not isinstance(check, dict):
+            continue
+        absolute, relative = check.get("file_abs_path"), check.get("repo_file_path")
+        if (isinstance(absolute, str) and isinstance(relative, str) and relative.startswith("/")
+                and len(absolute) > len(relative) and absolute.endswith(relative)):
+            return absolute[:-len(relative)]
+    return None
+
+
+def encode(report_path, output_path, compression="gzip", root=None):
+    """Convert a Checkov JSON report to a compact report; returns the root used"""
+    report_path = resolve_report(report_path)
+    if root is None:
+        with JsonReport(report_path) as report:
+            root = detect_root(report)
+    if root is not None:
+        root = root.rstrip("/") or None
+    opener = gzip.open if compression == "gzip" else lzma.open
+    # lzma's default preset 6 is many times slower on these repetitive lines, for no gain in size
+    options = {"compresslevel": 6} if compression == "gzip" else {"preset": 3}
+    with JsonReport(report_path) as report, opener(output_path, "wt", encoding="utf-8", **options) as out:
+        writer = CompactWriter(out, root)
+        # Kinds of the open containers: a value is an array item or an object member by its parent,
+        # whatever shape the document has ("results" may be a list or null in a broken report)
+        open_kinds = []
+        for path, value in report.iter_values(is_check_list, is_document_member, CHUNK_SIZE, is_document_container):
+            in_object = bool(open_kinds) and open_kinds[-1] == "{"
+            if isinstance(value, ContainerEvent):
+                if value in ("{", "["):
+                    # The container's own key; the document and array items have none
+                    writer.container(value, path[-1] if in_object else None)
+                    open_kinds.append(value)
+                else:
+                    writer.container(value)
+                    open_kinds.pop()
+            elif in_object:
+                writer.member(path[-1], value)
+            else:
+                writer.item(value)
+    return root
+
+
+def decode(compact_path, out):
+    with open_report(compact_path) as report:
+        if not report.compact:
+            raise ValueError(f"{compact_path} is not a compact Checkov report")
+        report.write_json(out)
+
+
+def iter_document(stream):
+    """
+    Every value of a Checkov JSON document in order: the document containers
+    as events, checks and everything else whole (iter_values skips nothing
+    inside a container that yields events)
+    """
+    return iter_values(stream, is_check_list, is_document_member, CHUNK_SIZE, is_document_container)
+
+
+def same_report(report_path, compact_path):
+    """
+    Whether a compact report decodes to the Checkov JSON document of report_path
+
+    The compact report is decoded to a temporary file, and both documents are
+    compared whole, one value at a time, so a member the encoder lost or
+    altered fails the comparison whatever the report's shape.
+    """
+    with open(resolve_report(report_path), "r", encoding="utf-8") as source, \
+            tempfile.TemporaryFile("w+", encoding="utf-8") as decoded:
+        decode(compact_path, decoded)
+        decoded.seek(0)
+        for one, other in zip_longest(iter_document(source), iter_document(decoded)):
+            if one is None or other is None or one[0] != other[0] or \
+                    isinstance(one[1], ContainerEvent) != isinstance(other[1], ContainerEvent) or \
+                    json.dumps(one[1]) != json.dumps(other[1]):
+                return False
+    return True
+
+
+def compact_name(report_path, compression):
+    """checkov-x-y-DDMMYYYY-HHMM.ckv.gz next to the report (or Checkov's output directory)"""
+    named = os.path.dirname(report_path) if os.path.basename(report_path) == CHECKOV_JSON_NAME else report_path
+    named = named.rstrip("/")
+    base = named[:-len(".json")] if named.endswith(".json") else named
+    return base + COMPRESSIONS[compression][1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert Checkov JSON reports to and from the compact format")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    encode_parser = subcommands.add_parser("encode", help="Write the compact form of a Checkov JSON report")
+    encode_parser.add_argument("report", help="Checkov JSON report, or the directory Checkov wrote with --output-file")
+    encode_parser.add_argument("output", nargs="?",
+                               help="Compact report to write (default: next to the report, .ckv.gz or .ckv.xz)")
+    encode_parser.add_argument("--compression", choices=sorted(COMPRESSIONS), default="gzip",
+                               help="gzip (faster) or lzma (smaller) (default: gzip)")
+    encode_parser.add_argument("--root", help="Directory the report's paths are stored relative to "
+                                              "(default: detected from file_abs_path and repo_file_path)")
+    encode_parser.add_argument("--verify", action="store_true",
+                               help="Read the compact report back and compare it with the original")
+    decode_parser = subcommands.add_parser("decode", help="Write the Checkov JSON of a compact report")
+    decode_parser.add_argument("report", help="Compact report")
+    decode_parser.add_argument("output", nargs="?", default="-", help="JSON file to write (default: stdout)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "decode":
+            if args.output == "-":
+                decode(args.report, sys.stdout)
+            else:
+                with open(args.output, "w", encoding="utf-8") as out:
+                    decode(args.report, out)
+            return 0
+
+        report_path = resolve_report(args.report)
+        output = args.output or compact_name(report_path, args.compression)
+        start = time.perf_counter()
+        root = encode(report_path, output, args.compression, args.root)
+        seconds = time.perf_counter() - start
+        before, after = os.path.getsize(report_path), os.path.getsize(output)
+        print(f"✅ {output}: {before / 1024:.1f} KB -> {after / 1024:.1f} KB "
+              f"({before / max(after, 1):.1f}x) in {seconds:.2f}s, root {root or '(none)'}")
+        if args.verify:
+            if not same_report(report_path, output):
+                print("❌ The compact report does not match the original", file=sys.stderr)
+                return 1
+            print("✅ Verified: the compact report reads back as the original")
+        return 0
+    except (OSError, ValueError) as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,968 @@
+#!/usr/bin/env python3
+"""
+Checkov HTML Report Generator
+Renders a Checkov JSON report as the One Platform HTML security report.
+The report (Checkov JSON, or a compact report from compact_report.py) is read
+one check at a time with compact_report.open_report. Checks are
+written as compact JSON shards (rows of string-table indexes, SHARD_SIZE
+rows each) into a temporary file per section as they arrive, then copied into
+the page in chunks, so 100MB+ reports are converted in bounded memory.
+
+In the browser, the shards stay unparsed script data until a row in them is
+shown: each section is a virtualized list that only builds the rows in view,
+with filtering and sorting by check ID, resource and file. Pages with 100k+
+checks open as fast as small ones and list every check. Every value is
+HTML-escaped or set as DOM text.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from html import escape
+
+from compact_report import open_report
+from plan_json_stream import CHUNK_SIZE
+
+RESULT_KEYS = ("failed_checks", "passed_checks", "skipped_checks")
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO")
+
+# Rows per embedded JSON shard, the unit the page parses on demand
+SHARD_SIZE = 2000
+# Row layout: string-table indexes except resource and details (mostly unique)
+ROW_FIELDS = ("check_id", "check_name", "resource", "file_path", "line_start", "line_end",
+              "severity", "description", "details", "guideline")
+
+SECTIONS = (("failed_checks", "failed", "🚨 Failed Security Checks"),
+            ("passed_checks", "passed", "✅ Passed Security Checks"),
+            ("skipped_checks", "skipped", "⏭️ Skipped Security Checks"))
+
+# Checkov 3 writes --output-file as a directory holding this file
+CHECKOV_JSON_NAME = "results_json.json"
+
+STYLE = """\
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            border-radius: 10px;
+            margin-bottom: 30px;
+            text-align: center;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        }
+        .header h1 {
+            margin: 0;
+            font-size: 2.5em;
+            font-weight: 300;
+        }
+        .header p {
+            margin: 10px 0 0 0;
+            font-size: 1.1em;
+            opacity: 0.9;
+        }
+        .summary {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 20px;
+            margin-bottom: 30px;
+        }
+        .summary-card {
+            background: white;
+            padding: 25px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            text-align: center;
+            transition: transform 0.3s ease;
+        }
+        .summary-card:hover {
+            transform: translateY(-5px);
+        }
+        .summary-card h3 {
+            margin: 0 0 10px 0;
+            font-size: 1.2em;
+            color: #555;
+        }
+        .summary-card .number {
+            font-size: 2.5em;
+            font-weight: bold;
+            margin: 10px 0;
+        }
+        .critical { color: #e74c3c; }
+        .high { color: #e67e22; }
+        .medium { color: #f39c12; }
+        .low { color: #27ae60; }
+        .info { color: #3498db; }
+        .passed { color: #27ae60; }
+        
+        .content {
+            background: white;
+            padding: 30px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        .section {
+            margin-bottom: 30px;
+        }
+        .section h2 {
+            color: #2c3e50;
+            border-bottom: 2px solid #3498db;
+            padding-bottom: 10px;
+            margin-bottom: 20px;
+        }
+        .finding {
+            background: #f8f9fa;
+            border: 1px solid #dee2e6;
+            border-radius: 5px;
+            padding: 20px;
+            margin-bottom: 15px;
+            border-left: 4px solid #3498db;
+        }
+        .finding.critical { border-left-color: #e74c3c; }
+        .finding.high { border-left-color: #e67e22; }
+        .finding.medium { border-left-color: #f39c12; }
+        .finding.low { border-left-color: #27ae60; }
+        .finding.info { border-left-color: #3498db; }
+        
+        .finding-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 15px;
+        }
+        .finding-title {
+            font-size: 1.2em;
+            font-weight: 600;
+            color: #2c3e50;
+        }
+        .severity-badge {
+            padding: 5px 15px;
+            border-radius: 20px;
+            color: white;
+            font-size: 0.9em;
+            font-weight: 500;
+            text-transform: uppercase;
+        }
+        .severity-badge.critical { background-color: #e74c3c; }
+        .severity-badge.high { background-color: #e67e22; }
+        .severity-badge.medium { background-color: #f39c12; }
+        .severity-badge.low { background-color: #27ae60; }
+        .severity-badge.info { background-color: #3498db; }
+        
+        .finding-details {
+            margin-top: 15px;
+        }
+        .finding-details p {
+            margin: 5px 0;
+            color: #666;
+        }
+        .finding-details code {
+            background: #f1f2f6;
+            padding: 2px 6px;
+            border-radius: 3px;
+            font-family: 'Courier New', monospace;
+            font-size: 0.9em;
+        }
+        .no-issues {
+            text-align: center;
+            padding: 40px;
+            color: #27ae60;
+            font-size: 1.3em;
+        }
+        .no-issues i {
+            font-size: 3em;
+            margin-bottom: 15px;
+            display: block;
+        }
+        .footer {
+            text-align: center;
+            margin-top: 30px;
+            padding: 20px;
+            color: #666;
+            font-size: 0.9em;
+        }
+        .tabs {
+            display: flex;
+            background: #f8f9fa;
+            border-radius: 10px;
+            margin-bottom: 20px;
+            overflow: hidden;
+        }
+        .tab {
+            flex: 1;
+            padding: 15px;
+            text-align: center;
+            cursor: pointer;
+            background: #f8f9fa;
+            border: none;
+            font-size: 1em;
+            transition: background-color 0.3s ease;
+        }
+        .tab.active {
+            background: #3498db;
+            color: white;
+        }
+        .tab:hover {
+            background: #3498db;
+            color: white;
+        }
+        .tab-content {
+            display: none;
+        }
+        .timing-table {
+            width: 100%;
+            border-collapse: collapse;
+            font-size: 0.9em;
+        }
+        .timing-table th,
+        .timing-table td {
+            padding: 8px 10px;
+            border-bottom: 1px solid #eee;
+            text-align: left;
+        }
+        .timing-table th {
+            background: #f8f9fa;
+        }
+        .timing-table td.number {
+            text-align: right;
+            font-family: 'Courier New', monospace;
+        }
+        .tab-content.active {
+            display: block;
+        }
+        .finding-toolbar {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 10px;
+            align-items: center;
+            margin-bottom: 10px;
+        }
+        .finding-toolbar input {
+            flex: 1;
+            min-width: 200px;
+            padding: 8px 10px;
+            border: 1px solid #dee2e6;
+            border-radius: 5px;
+            font-size: 0.95em;
+        }
+        .finding-toolbar select {
+            padding: 8px 10px;
+            border: 1px solid #dee2e6;
+            border-radius: 5px;
+        }
+        .finding-count {
+            color: #666;
+            font-size: 0.9em;
+        }
+        .finding-list {
+            position: relative;
+            height: 540px;
+            overflow-y: auto;
+            border: 1px solid #dee2e6;
+            border-radius: 5px;
+            background: #f8f9fa;
+        }
+        .finding-row {
+            position: absolute;
+            left: 0;
+            right: 0;
+            height: 36px;
+            display: flex;
+            align-items: center;
+            gap: 12px;
+            padding: 0 12px;
+            box-sizing: border-box;
+            border-bottom: 1px solid #eee;
+            background: white;
+            cursor: pointer;
+            font-size: 0.9em;
+        }
+        .finding-row:hover,
+        .finding-row.selected {
+            background: #eef4fb;
+        }
+        .finding-row .cell {
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+        }
+        .finding-row .check-id {
+            flex: 0 0 170px;
+            font-family: 'Courier New', monospace;
+        }
+        .finding-row .resource {
+            flex: 2 1 0;
+        }
+        .finding-row .file {
+            flex: 1 1 0;
+            color: #666;
+        }
+        .finding-row .severity-badge {
+            flex: 0 0 90px;
+            padding: 2px 0;
+            text-align: center;
+            font-size: 0.75em;
+        }
+        .severity-badge.passed { background-color: #27ae60; }
+        .finding-detail {
+            margin-top: 15px;
+        }
+        .finding-detail:empty {
+            display: none;
+        }
+        .finding-detail pre {
+            white-space: pre-wrap;
+            margin: 5px 0;
+            color: #666;
+        }
+        @media (max-width: 768px) {
+            .summary {
+                grid-template-columns: 1fr;
+            }
+            .finding-header {
+                flex-direction: column;
+                align-items: flex-start;
+            }
+            .severity-badge {
+                margin-top: 10px;
+            }
+        }
+    </style>
+"""
+
+SCRIPT = """\
+    <script>
+        // Rows are lists of ROW_FIELDS (see html_report.py): string-table
+        // indexes, except the resource and details strings
+        var CHECK_ID = 0, CHECK_NAME = 1, RESOURCE = 2, FILE = 3, LINE_START = 4, LINE_END = 5,
+            SEVERITY = 6, DESCRIPTION = 7, DETAILS = 8, GUIDELINE = 9;
+        var ROW_HEIGHT = 36;
+        var OVERSCAN = 10;
+        var SEVERITY_RANK = {CRITICAL: 0, HIGH: 1, MEDIUM: 2, LOW: 3, INFO: 4};
+        var BADGES = {passed: 'PASSED', skipped: 'SKIPPED'};
+
+        var reportStrings = null;
+        function stringAt(index) {
+            if (reportStrings === null) {
+                reportStrings = JSON.parse(document.getElementById('report-strings').textContent);
+            }
+            return reportStrings[index];
+        }
+
+        // One tab's checks: shards are parsed the first time one of their rows is needed
+        function FindingList(section) {
+            var self = this;
+            this.section = section;
+            this.list = document.getElementById(section + '-list');
+            this.spacer = this.list.querySelector('.finding-spacer');
+            this.counter = document.getElementById(section + '-count');
+            this.detail = document.getElementById(section + '-detail');
+            this.filter = document.getElementById(section + '-filter');
+            this.sort = document.getElementById(section + '-sort');
+            this.shards = document.querySelectorAll('script.report-shard[data-section="' + section + '"]');
+            this.shardSize = parseInt(this.list.getAttribute('data-shard-size'), 10);
+            this.total = parseInt(this.list.getAttribute('data-total'), 10);
+            this.loaded = [];
+            this.view = null;  // row numbers after filtering and sorting; null is report order
+            this.selected = -1;
+            this.pending = false;
+            this.list.addEventListener('scroll', function() { self.schedule(); });
+            var timer = null;
+            this.filter.addEventListener('input', function() {
+                clearTimeout(timer);
+                timer = setTimeout(function() { self.update(); }, 150);
+            });
+            this.sort.addEventListener('change', function() { self.update(); });
+        }
+
+        FindingList.prototype.row = function(number) {
+            var shard = Math.floor(number / this.shardSize);
+            if (!this.loaded[shard]) {
+                this.loaded[shard] = JSON.parse(this.shards[shard].textContent);
+            }
+            return this.loaded[shard][number % this.shardSize];
+        };
+
+        FindingList.prototype.size = function() {
+            return this.view === null ? this.total : this.view.length;
+        };
+
+        FindingList.prototype.sortKey = function(row, field) {
+            if (field === 'check') {
+                return stringAt(row[CHECK_ID]);
+            } else if (field === 'resource') {
+                return row[RESOURCE];
+            } else if (field === 'file') {
+                return stringAt(row[FILE]) + ':' + ('000000' + row[LINE_START]).slice(-7);
+            }
+            var rank = SEVERITY_RANK[stringAt(row[SEVERITY])];
+            return rank === undefined ? 9 : rank;
+        };
+
+        // Filtering and sorting look at every row, so they load every shard of the tab
+        FindingList.prototype.update = function() {
+            var query = this.filter.value.trim().toLowerCase();
+            var field = this.sort.value;
+            if (!query && !field) {
+                this.view = null;
+            } else {
+                var view = [];
+                var keys = {};
+                for (var number = 0; number < this.total; number++) {
+                    var row = this.row(number);
+                    if (query && stringAt(row[CHECK_ID]).toLowerCase().indexOf(query) < 0 &&
+                            row[RESOURCE].toLowerCase().indexOf(query) < 0 &&
+                            stringAt(row[FILE]).toLowerCase().indexOf(query) < 0) {
+                        continue;
+                    }
+                    view.push(number);
+                    if (field) {
+                        keys[number] = this.sortKey(row, field);
+                    }
+                }
+                if (field) {
+                    view.sort(function(a, b) {
+                        if (keys[a] < keys[b]) return -1;
+                        if (keys[a] > keys[b]) return 1;
+                        return a - b;
+                    });
+                }
+                this.view = view;
+            }
+            this.list.scrollTop = 0;
+            this.render();
+        };
+
+        FindingList.prototype.schedule = function() {
+            var self = this;
+            if (this.pending) {
+                return;
+            }
+            this.pending = true;
+            window.requestAnimationFrame(function() {
+                self.pending = false;
+                self.render();
+            });
+        };
+
+        function cell(className, text) {
+            var element = document.createElement('div');
+            element.className = className;
+            element.textContent = text;
+            element.title = text;
+            return element;
+        }
+
+        // Only the rows in view (and OVERSCAN around them) exist in the DOM
+        FindingList.prototype.render = function() {
+            var size = this.size();
+            this.spacer.style.height = (size * ROW_HEIGHT) + 'px';
+            var first = Math.max(0, Math.floor(this.list.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            var last = Math.min(size, Math.ceil((this.list.scrollTop + this.list.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+            var old = this.list.querySelectorAll('.finding-row');
+            for (var i = 0; i < old.length; i++) {
+                this.list.removeChild(old[i]);
+            }
+            var fragment = document.createDocumentFragment();
+            for (var position = first; position < last; position++) {
+                fragment.appendChild(this.renderRow(this.view === null ? position : this.view[position], position));
+            }
+            this.list.appendChild(fragment);
+            this.counter.textContent = this.view === null ? this.total + ' checks'
+                : this.view.length + ' of ' + this.total + ' checks';
+        };
+
+        FindingList.prototype.renderRow = function(number, position) {
+            var self = this;
+            var row = this.row(number);
+            var element = document.createElement('div');
+            element.className = 'finding-row' + (number === this.selected ? ' selected' : '');
+            element.style.top = (position * ROW_HEIGHT) + 'px';
+            var severity = stringAt(row[SEVERITY]);
+            var badge = BADGES[this.section] || severity;
+            var badgeClass = this.section === 'passed' ? 'passed' : this.section === 'skipped' ? 'info' : severity.toLowerCase();
+            element.appendChild(cell('cell severity-badge ' + badgeClass, badge));
+            element.appendChild(cell('cell check-id', stringAt(row[CHECK_ID])));
+            element.appendChild(cell('cell resource', row[RESOURCE]));
+            element.appendChild(cell('cell file', stringAt(row[FILE]) + ':' + row[LINE_START]));
+            element.addEventListener('click', function() {
+                self.selected = number;
+                self.showDetail(row);
+                self.render();
+            });
+            return element;
+        };
+
+        function detailLine(label, text, code) {
+            var line = document.createElement('p');
+            var strong = document.createElement('strong');
+            strong.textContent = label + ': ';
+            line.appendChild(strong);
+            var value = document.createElement(code ? 'code' : 'span');
+            value.textContent = text;
+            line.appendChild(value);
+            return line;
+        }
+
+        FindingList.prototype.showDetail = function(row) {
+            var detail = this.detail;
+            while (detail.firstChild) {
+                detail.removeChild(detail.firstChild);
+            }
+            var title = document.createElement('div');
+            title.className = 'finding-title';
+            title.textContent = stringAt(row[CHECK_NAME]);
+            detail.appendChild(title);
+            var details = document.createElement('div');
+            details.className = 'finding-details';
+            details.appendChild(detailLine('Check ID', stringAt(row[CHECK_ID]), true));
+            if (this.section === 'failed') {
+                details.appendChild(detailLine('Severity', stringAt(row[SEVERITY]), false));
+            }
+            details.appendChild(detailLine('Resource', row[RESOURCE], true));
+            details.appendChild(detailLine('File', stringAt(row[FILE]) + ':' + row[LINE_START] + '-' + row[LINE_END], true));
+            var description = stringAt(row[DESCRIPTION]);
+            if (this.section === 'skipped') {
+                details.appendChild(detailLine('Reason', description || 'No reason provided', false));
+            } else if (description) {
+                details.appendChild(detailLine('Description', description, false));
+            }
+            if (row[DETAILS]) {
+                var pre = document.createElement('pre');
+                pre.textContent = row[DETAILS];
+                details.appendChild(pre);
+            }
+            var guideline = stringAt(row[GUIDELINE]);
+            if (/^https?:/.test(guideline)) {
+                var line = detailLine('Guideline', '', false);
+                var link = document.createElement('a');
+                link.href = guideline;
+                link.textContent = guideline;
+                link.rel = 'noopener noreferrer';
+                line.appendChild(link);
+                details.appendChild(line);
+            }
+            detail.appendChild(details);
+        };
+
+        var findingLists = {};
+        function showFindings(tabName) {
+            if (!findingLists[tabName] && document.getElementById(tabName + '-list')) {
+                findingLists[tabName] = new FindingList(tabName);
+            }
+            if (findingLists[tabName]) {
+                findingLists[tabName].render();
+            }
+        }
+
+        function showTab(tabName) {
+            // Hide all tab contents
+            var tabContents = document.querySelectorAll('.tab-content');
+            tabContents.forEach(function(content) {
+                content.classList.remove('active');
+            });
+
+            // Remove active class from all tabs
+            var tabs = document.querySelectorAll('.tab');
+            tabs.forEach(function(tab) {
+                tab.classList.remove('active');
+            });
+
+            // Show selected tab content
+            document.getElementById(tabName).classList.add('active');
+
+            // Add active class to clicked tab
+            event.target.classList.add('active');
+
+            // Lists are laid out once their tab is visible
+            showFindings(tabName);
+        }
+
+        showFindings('failed');
+    </script>
+"""
+
+
+def resolve_report(path):
+    """The JSON file of a report path, which may be Checkov's output directory"""
+    if os.path.isdir(path):
+        return os.path.join(path, CHECKOV_JSON_NAME)
+    return path
+
+
+def is_result_list(path):
+    return len(path) == 2 and path[0] == "results" and path[1] in RESULT_KEYS
+
+
+def is_report_member(path):
+    return path in (("summary",), ("policy_timing",))
+
+
+def severity_of(check):
+    """Upper-case severity of a failed check; checks without one count as INFO"""
+    severity = str(check.get("severity") or "INFO").upper()
+    return severity if severity in SEVERITIES else "INFO"
+
+
+class StringTable:
+    """Strings shared by the embedded rows, which refer to them by index"""
+
+    def __init__(self):
+        self.strings = [""]
+        self.indexes = {"": 0}
+
+    def __call__(self, value):
+        value = "" if value is None else str(value)
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def script_json(value):
+    """Compact JSON that cannot close the <script> element holding it"""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).replace("<", "\\u003c")
+
+
+def compact_row(check, key, strings):
+    """One check as a ROW_FIELDS list"""
+    line_range = check.get("file_line_range") or [0, 0]
+    if key == "skipped_checks":
+        # Checkov records the suppression reason in check_result
+        description = (check.get("check_result") or {}).get("suppress_comment") or check.get("suppress_comment")
+    else:
+        description = check.get("description")
+    details = check.get("details") or []
+    return [
+        strings(check.get("check_id") or "Unknown"),
+        strings(check.get("check_name") or "Unknown Check"),
+        str(check.get("resource") or "Unknown Resource"),
+        strings(check.get("file_path") or "Unknown File"),
+        line_range[0] if line_range else 0,
+        line_range[-1] if line_range else 0,
+        strings(severity_of(check)),
+        strings(description),
+        "\n".join(str(detail) for detail in details) if isinstance(details, list) else str(details),
+        strings(check.get("guideline")),
+    ]
+
+
+class ShardWriter:
+    """Writes one section's rows to a spool file as <script> JSON shards of SHARD_SIZE rows"""
+
+    def __init__(self, section, spool, shard_size=SHARD_SIZE):
+        self.section = section
+        self.spool = spool
+        self.shard_size = shard_size
+        self.rows = []
+        self.count = 0
+
+    def add(self, row):
+        self.rows.append(row)
+        self.count += 1
+        if len(self.rows) >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self.spool.write(f'<script type="application/json" class="report-shard" data-section="{self.section}">'
+                             f'{script_json(self.rows)}</script>\n')
+            self.rows = []
+
+
+def render_sections(report, writers, strings, chunk_size=CHUNK_SIZE):
+    """
+    Add every check to the shard writer of its section and return
+    (severity counts, summary, policy timing)
+    """
+    severities = dict.fromkeys(SEVERITIES, 0)
+    summary, timing = {}, {}
+    for path, value in report.iter_values(is_result_list, is_report_member, chunk_size):
+        if path == ("summary",):
+            # Several documents (one per framework) add up
+            for key, count in (value or {}).items() if isinstance(value, dict) else ():
+                if isinstance(count, int) and not isinstance(count, bool):
+                    summary[key] = summary.get(key, 0) + count
+        elif path == ("policy_timing",):
+            timing.update(value or {})
+        elif isinstance(value, dict):
+            key = path[1]
+            if key == "failed_checks":
+                severities[severity_of(value)] += 1
+            writers[key].add(compact_row(value, key, strings))
+    for writer in writers.values():
+        writer.flush()
+    return severities, summary, timing
+
+
+def page_header(component, stack, generated):
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Checkov Security Report - {escape(component)}</title>
+{STYLE}</head>
+<body>
+    <div class="header">
+        <h1>🔒 Security Report</h1>
+        <p>Checkov Security Scan Results</p>
+        <p><strong>Component:</strong> {escape(component)} | <strong>Stack:</strong> {escape(stack)} | <strong>Generated:</strong> {escape(generated)}</p>
+    </div>
+'''
+
+
+def page_footer(generated):
+    return f'''
+    <div class="footer">
+        <p>Generated by Checkov Security Scanner | One Platform Infrastructure</p>
+        <p>Report generated on {escape(generated)}</p>
+    </div>
+'''
+
+
+PAGE_END = f'''
+{SCRIPT}</body>
+</html>
+'''
+
+
+def summary_cards(counts, severities):
+    passed, failed, skipped = counts["passed_checks"], counts["failed_checks"], counts["skipped_checks"]
+    return f'''
+    <div class="summary">
+        <div class="summary-card">
+            <h3>Total Checks</h3>
+            <div class="number">{passed + failed + skipped}</div>
+            <p>Infrastructure checks performed</p>
+        </div>
+        <div class="summary-card">
+            <h3>Passed</h3>
+            <div class="number passed">{passed}</div>
+            <p>Security checks passed</p>
+        </div>
+        <div class="summary-card">
+            <h3>Failed</h3>
+            <div class="number critical">{failed}</div>
+            <p>Security issues found</p>
+        </div>
+        <div class="summary-card">
+            <h3>Skipped</h3>
+            <div class="number">{skipped}</div>
+            <p>Checks skipped</p>
+        </div>
+    </div>
+
+    <div class="summary">
+        <div class="summary-card">
+            <h3>Critical</h3>
+            <div class="number critical">{severities['CRITICAL']}</div>
+            <p>Must fix immediately</p>
+        </div>
+        <div class="summary-card">
+            <h3>High</h3>
+            <div class="number high">{severities['HIGH']}</div>
+            <p>Fix soon</p>
+        </div>
+        <div class="summary-card">
+            <h3>Medium</h3>
+            <div class="number medium">{severities['MEDIUM']}</div>
+            <p>Fix when possible</p>
+        </div>
+        <div class="summary-card">
+            <h3>Low</h3>
+            <div class="number low">{severities['LOW']}</div>
+            <p>Consider fixing</p>
+        </div>
+    </div>
+'''
+
+
+def tabs(counts, timing):
+    timing_tab = ''
+    if timing:
+        timing_tab = f'''<button class="tab" onclick="showTab('timing')">Check Timing ({len(timing)})</button>'''
+    return f'''
+    <div class="content">
+        <div class="tabs">
+            <button class="tab active" onclick="showTab('failed')">Failed Checks ({counts['failed_checks']})</button>
+            <button class="tab" onclick="showTab('passed')">Passed Checks ({counts['passed_checks']})</button>
+            <button class="tab" onclick="showTab('skipped')">Skipped Checks ({counts['skipped_checks']})</button>
+            {timing_tab}
+        </div>
+'''
+
+
+def section_start(tab_id, title, active=False):
+    return f'''
+        <div id="{tab_id}" class="tab-content{' active' if active else ''}">
+            <div class="section">
+                <h2>{title}</h2>
+'''
+
+
+def finding_list(tab_id, listed):
+    """Toolbar and virtualized list container; the page script fills them from the shards"""
+    return f'''
+                <div class="finding-toolbar">
+                    <input type="search" id="{tab_id}-filter" placeholder="Filter by check ID, resource or file">
+                    <select id="{tab_id}-sort">
+                        <option value="">Report order</option>
+                        <option value="check">Check ID</option>
+                        <option value="resource">Resource</option>
+                        <option value="file">File</option>
+                        <option value="severity">Severity</option>
+                    </select>
+                    <span class="finding-count" id="{tab_id}-count">{listed} checks</span>
+                </div>
+                <div class="finding-list" id="{tab_id}-list" data-total="{listed}" data-shard-size="{SHARD_SIZE}">
+                    <div class="finding-spacer"></div>
+                </div>
+                <div class="finding finding-detail" id="{tab_id}-detail"></div>
+'''
+
+
+SECTION_END = '''
+            </div>
+        </div>
+'''
+
+EMPTY_SECTIONS = {
+    "failed_checks": '''
+            <div class="no-issues">
+                <i>✅</i>
+                <p>No security issues found! All checks passed.</p>
+            </div>
+''',
+    "passed_checks": '<p>No passed checks to display.</p>\n',
+    "skipped_checks": '<p>No skipped checks to display.</p>\n',
+}
+
+
+def timing_section(timing):
+    invocations = sum(stats['invocations'] for stats in timing.values())
+    total_ms = sum(stats['total_ms'] for stats in timing.values())
+    rows = []
+    # Most expensive checks first
+    for check_id, stats in sorted(timing.items(), key=lambda item: -item[1]['total_ms']):
+        rows.append(f'''
+                    <tr>
+                        <td><code>{escape(check_id)}</code></td>
+                        <td class="number">{stats['invocations']}</td>
+                        <td class="number">{stats['total_ms']:.3f}</td>
+                        <td class="number">{stats['mean_ms']:.4f}</td>
+                        <td class="number">{stats['p95_ms']:.4f}</td>
+                        <td>{escape(', '.join(stats['resource_types']))}</td>
+                    </tr>
+''')
+    return (section_start("timing", "⏱️ Custom Check Timing")
+            + f'''                <p>{invocations} invocations, {total_ms:.1f} ms spent in custom checks</p>
+                <table class="timing-table">
+                    <tr><th>Check ID</th><th>Invocations</th><th>Total (ms)</th><th>Mean (ms)</th><th>p95 (ms)</th><th>Resource Types</th></tr>
+''' + "".join(rows) + '''
+                </table>
+''' + SECTION_END)
+
+
+def message_block(icon, message):
+    return f'''
+    <div class="content">
+        <div class="no-issues">
+            <i>{icon}</i>
+            <p>{escape(message)}</p>
+        </div>
+    </div>
+'''
+
+
+def write_report(report_path, html_path, component="all", stack="all", chunk_size=CHUNK_SIZE):
+    """
+    Render report_path (a Checkov JSON file or output directory, or a compact
+    report) to html_path.
+
+    Returns False, after writing a page that says why, when the report is
+    missing or cannot be parsed.
+    """
+    generated = time.strftime("%a %b %d %H:%M:%S %Z %Y")
+    report_path = resolve_report(report_path)
+    with open(html_path, "w", encoding="utf-8", buffering=chunk_size) as out:
+        out.write(page_header(component, stack, generated))
+        try:
+            report = open_report(report_path)
+        except OSError:
+            out.write(message_block("❌", "Could not generate report. JSON file not found."))
+            out.write(page_footer(generated) + PAGE_END)
+            return False
+
+        strings = StringTable()
+        writers = {key: ShardWriter(tab_id, tempfile.TemporaryFile("w+", encoding="utf-8"))
+                   for key, tab_id, _ in SECTIONS}
+        try:
+            with report:
+                try:
+                    severities, summary, timing = render_sections(report, writers, strings, chunk_size)
+                except ValueError as error:
+                    out.write(message_block("❌", f"Error parsing JSON report: {error}"))
+                    out.write(page_footer(generated) + PAGE_END)
+                    return False
+
+            listed = {key: writer.count for key, writer in writers.items()}
+            # Checkov's summary counts checks even when --quiet leaves passed ones out
+            counts = {key: max(summary.get(key.split("_")[0], 0), listed[key]) for key in RESULT_KEYS}
+            out.write(summary_cards(counts, severities))
+            out.write(tabs(counts, timing))
+            for key, tab_id, title in SECTIONS:
+                out.write(section_start(tab_id, title, active=key == "failed_checks"))
+                if listed[key]:
+                    out.write(finding_list(tab_id, listed[key]))
+                elif not counts[key]:
+                    out.write(EMPTY_SECTIONS[key])
+                if counts[key] > listed[key]:
+                    out.write(f'<p><em>{counts[key] - listed[key]} {key.split("_")[0]} checks are counted '
+                              f'but not listed in the JSON report (e.g. scanned with --quiet).</em></p>\n')
+                out.write(SECTION_END)
+            if timing:
+                out.write(timing_section(timing))
+            out.write('''
+    </div>
+''')
+            out.write(page_footer(generated))
+
+            # Row data after the visible page, parsed by the page script on demand
+            for writer in writers.values():
+                writer.spool.seek(0)
+                shutil.copyfileobj(writer.spool, out, chunk_size)
+            out.write(f'<script type="application/json" id="report-strings">{script_json(strings.strings)}</script>\n')
+        finally:
+            for writer in writers.values():
+                writer.spool.close()
+        out.write(PAGE_END)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a Checkov JSON report as the One Platform HTML report")
+    parser.add_argument("report", help="Checkov JSON report, the directory Checkov wrote with --output-file, "
+                                       "or a compact report (.ckv.gz, .ckv.xz)")
+    parser.add_argument("output", help="HTML file to write")
+    parser.add_argument("--component", default="all", help="Component shown in the header (default: all)")
+    parser.add_argument("--stack", default="all", help="Stack shown in the header (default: all)")
+    args = parser.parse_args()
+    return 0 if write_report(args.report, args.output, args.component, args.stack) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
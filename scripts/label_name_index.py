@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Label Name Index
+Computes the name every component generates through the cloudposse/label
+module (0.25.0 `id` composition) from the resolved Atmos stack vars, without
+running Terraform, and indexes the names by uniqueness scope to report:
+
+- names that collide in their scope (global for storage accounts, Key Vaults
+  and function apps; subscription, resource group or VNet for the others)
+- names that break the Azure length or character rules for the resource
+
+A name set explicitly (e.g. `storage_account_name`) wins over the label ID,
+as the `coalesce(var.x_name, module.label.id)` in the modules does.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from atmos_stacks import ATMOS_DIR, StackRepository, TerraformOutput
+from resource_graph import MODULES_DIR, ModuleCatalog
+
+# cloudposse/label/null 0.25.0 defaults
+DEFAULT_LABEL_ORDER = ["namespace", "environment", "stage", "name", "attributes"]
+DEFAULT_DELIMITER = "-"
+DEFAULT_REGEX_REPLACE_CHARS = "/[^-a-zA-Z0-9]/"
+DEFAULT_LABEL_VALUE_CASE = "lower"
+ID_HASH_LENGTH = 5
+LABEL_ELEMENTS = ("namespace", "tenant", "environment", "stage", "name")
+
+
+class NameRule:
+    """How a module names its main resource and the Azure rules that name must follow"""
+
+    def __init__(self, resource_type, override, scope, min_length, max_length, pattern, random_suffix=0):
+        self.resource_type = resource_type
+        self.override = override
+        self.scope = scope
+        self.min_length = min_length
+        self.max_length = max_length
+        self.pattern = re.compile(pattern)
+        self.random_suffix = random_suffix
+
+
+NAME_RULES = {
+    "azure-rsg": NameRule("azurerm_resource_group", "resource_group_name", "subscription",
+                          1, 90, r"^[-\w.()]*[-\w()]$"),
+    "azure-storage-account": NameRule("azurerm_storage_account", "storage_account_name", "global",
+                                      3, 24, r"^[a-z0-9]+$", random_suffix=4),
+    "azure-keyvault": NameRule("azurerm_key_vault", None, "global",
+                               3, 24, r"^[a-zA-Z](?!.*--)[a-zA-Z0-9-]*[a-zA-Z0-9]$"),
+    "azure-function-app": NameRule("azurerm_linux_function_app", "function_app_name", "global",
+                                   2, 60, r"^[a-zA-Z0-9](?!.*--)[a-zA-Z0-9-]*[a-zA-Z0-9]$"),
+    "azure-app-service-plan": NameRule("azurerm_service_plan", "app_service_plan_name", "resource_group",
+                                       1, 60, r"^[a-zA-Z0-9-]+$"),
+    "azure-vnet": NameRule("azurerm_virtual_network", "vnet_name", "resource_group",
+                           2, 64, r"^[a-zA-Z0-9][-\w.]*\w$"),
+    "azure-subnet": NameRule("azurerm_subnet", "subnet_name", "virtual_network",
+                             1, 80, r"^[a-zA-Z0-9](?:[-\w.]*\w)?$"),
+    "azure-nsg": NameRule("azurerm_network_security_group", "nsg_name", "resource_group",
+                          1, 80, r"^[a-zA-Z0-9](?:[-\w.]*\w)?$"),
+    "azure-private-endpoint": NameRule("azurerm_private_endpoint", "private_endpoint_name", "resource_group",
+                                       2, 64, r"^[a-zA-Z0-9][-\w.]*\w$"),
+}
+
+# Var that holds the parent a name must be unique in, per scope
+SCOPE_VARS = {
+    "subscription": "subscription_id",
+    "resource_group": "resource_group_name",
+    "virtual_network": "virtual_network_name",
+}
+
+
+class Unresolved(Exception):
+    """A label input that is not known without running Terraform"""
+
+
+def terraform_replace(value, pattern):
+    """Terraform replace(value, pattern, ""): a regex when wrapped in slashes, a substring otherwise"""
+    if len(pattern) > 1 and pattern.startswith("/") and pattern.endswith("/"):
+        return re.sub(pattern[1:-1], "", value)
+    return value.replace(pattern, "") if pattern else value
+
+
+def format_case(value, case):
+    if case == "none":
+        return value
+    if case == "title":
+        return re.sub(r"\b[a-z]", lambda match: match.group(0).upper(), value.lower())
+    if case == "upper":
+        return value.upper()
+    return value.lower()
+
+
+def label_input(variables, key, default=None):
+    value = variables.get(key)
+    if value is None:
+        return default
+    if isinstance(value, str) and "${" in value or not isinstance(value, (str, int, float, list)):
+        raise Unresolved(f"{key} = {value!r}")
+    return value
+
+
+def label_id(variables):
+    """module.label.id for a component's vars (cloudposse/label/null 0.25.0)"""
+    if variables.get("enabled", True) is False:
+        return ""
+    delimiter = label_input(variables, "delimiter", DEFAULT_DELIMITER)
+    regex = label_input(variables, "regex_replace_chars", DEFAULT_REGEX_REPLACE_CHARS)
+    case = label_input(variables, "label_value_case", DEFAULT_LABEL_VALUE_CASE)
+    order = label_input(variables, "label_order", DEFAULT_LABEL_ORDER)
+    limit = int(label_input(variables, "id_length_limit", 0) or 0)
+
+    context = {}
+    for element in LABEL_ELEMENTS:
+        value = label_input(variables, element, "")
+        context[element] = format_case(terraform_replace(str(value), regex), case)
+    attributes = []
+    for value in label_input(variables, "attributes", []) or []:
+        if not isinstance(value, (str, int, float)):
+            raise Unresolved(f"attributes = {value!r}")
+        value = format_case(terraform_replace(str(value), regex), case)
+        if value and value not in attributes:
+            attributes.append(value)
+    context["attributes"] = delimiter.join(attributes)
+
+    id_full = delimiter.join(context[element] for element in order if context.get(element))
+    if limit == 0 or len(id_full) <= limit:
+        return id_full
+
+    truncated_limit = limit - (ID_HASH_LENGTH + len(delimiter))
+    truncated = "" if truncated_limit <= 0 else id_full[:truncated_limit]
+    if truncated and delimiter and truncated.endswith(delimiter):
+        truncated = truncated[:-len(delimiter)]
+    truncated = truncated + delimiter if truncated_limit > 0 else ""
+    id_hash = hashlib.md5(id_full.encode()).hexdigest() + "qrstuvwxyz"
+    id_hash = terraform_replace(format_case(id_hash, case), regex)
+    return (truncated + id_hash)[:limit]
+
+
+class GeneratedName:
+    __slots__ = ("stack", "component", "module", "name", "random_suffix", "scope")
+
+    def __init__(self, stack, component, module, name, random_suffix):
+        self.stack = stack
+        self.component = component
+        self.module = module
+        self.name = name
+        self.random_suffix = random_suffix
+        self.scope = None
+
+    @property
+    def address(self):
+        return f"{self.stack}/{self.component}"
+
+    def display(self):
+        return self.name + "?" * self.random_suffix
+
+    def describe(self):
+        return {"stack": self.stack, "component": self.component, "module": self.module,
+                "name": self.display(), "scope": self.scope}
+
+
+class NameIndex:
+    """Generated names of all stacks, hashed by (resource type, scope, lowercased name)"""
+
+    def __init__(self):
+        self.names = []
+        self.by_address = {}
+        self.skipped = []
+
+    @classmethod
+    def from_stacks(cls, stacks, modules_dir=MODULES_DIR):
+        index = cls()
+        modules = ModuleCatalog(modules_dir)
+        pending = []
+        for stack in stacks:
+            for component, base, section in stack.components():
+                rule = NAME_RULES.get(base)
+                variables = dict(modules.defaults(base))
+                variables.update(section.get("vars") or {})
+                if rule is None or variables.get("enabled", True) is False:
+                    continue
+                try:
+                    name, suffix = generated_name(rule, variables)
+                except Unresolved as error:
+                    index.skipped.append({"stack": stack.name, "component": component, "reason": str(error)})
+                    continue
+                entry = GeneratedName(stack.name, component, base, name, suffix)
+                index.names.append(entry)
+                index.by_address[entry.address] = entry
+                pending.append((entry, rule, variables))
+
+        # Parents are resolved once every name is known: a resource group
+        # referenced through !terraform.output is scoped by its generated name
+        for entry, rule, variables in pending:
+            entry.scope = index.resolve_scope(entry.stack, rule.scope, variables.get(SCOPE_VARS.get(rule.scope)))
+        return index
+
+    def resolve_scope(self, stack, scope, parent):
+        if scope == "global":
+            return "global"
+        if isinstance(parent, TerraformOutput):
+            referenced = self.by_address.get(f"{parent.stack or stack}/{parent.component}")
+            parent = referenced.name.lower() if referenced else repr(parent)
+        return f"{scope}:{parent or 'default'}"
+
+    def analyze(self):
+        findings = []
+        buckets = defaultdict(list)
+        for entry in self.names:
+            rule = NAME_RULES[entry.module]
+            length = len(entry.name) + entry.random_suffix
+            if not rule.min_length <= length <= rule.max_length:
+                findings.append({"type": "length", "name": entry.describe(), "length": length,
+                                 "limit": f"{rule.min_length}-{rule.max_length}"})
+            sample = entry.name + "a" * entry.random_suffix
+            if not rule.pattern.match(sample):
+                findings.append({"type": "invalid_characters", "name": entry.describe(),
+                                 "pattern": rule.pattern.pattern})
+            # A random suffix makes the final name unknown (and unique) until apply
+            if not entry.random_suffix:
+                buckets[(rule.resource_type, entry.scope, entry.name.lower())].append(entry)
+
+        for (_, scope, name), entries in buckets.items():
+            if len(entries) > 1:
+                findings.append({"type": "collision", "name": name, "scope": scope,
+                                 "components": [entry.address for entry in entries]})
+        return findings
+
+
+def generated_name(rule, variables):
+    """(name, random suffix length) a module creates for its vars"""
+    override = variables.get(rule.override) if rule.override else None
+    if isinstance(override, str) and override:
+        if "${" in override:
+            raise Unresolved(f"{rule.override} = {override!r}")
+        return override, 0
+    if override is not None and not isinstance(override, str):
+        raise Unresolved(f"{rule.override} = {override!r}")
+    suffix = rule.random_suffix if variables.get("use_random_suffix") else 0
+    return label_id(variables), suffix
+
+
+def render_text(index, findings):
+    lines = [f"Computed {len(index.names)} names"]
+    for entry in sorted(index.names, key=lambda e: e.address):
+        lines.append(f"   {entry.address:<55} {entry.display()}")
+    for finding in findings:
+        if finding["type"] == "collision":
+            lines.append(f"❌ collision: {finding['name']} ({finding['scope']}) "
+                         f"used by {', '.join(finding['components'])}")
+        elif finding["type"] == "length":
+            name = finding["name"]
+            lines.append(f"❌ length: {name['stack']}/{name['component']} {name['name']} "
+                         f"is {finding['length']} characters (allowed {finding['limit']})")
+        else:
+            name = finding["name"]
+            lines.append(f"❌ invalid characters: {name['stack']}/{name['component']} {name['name']}")
+    for skipped in index.skipped:
+        lines.append(f"⚠️  skipped {skipped['stack']}/{skipped['component']}: {skipped['reason']}")
+    if not findings:
+        lines.append("✅ No name collisions or invalid names")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute label-generated names across Atmos stacks and "
+                                                 "report collisions and Azure naming violations")
+    parser.add_argument("--atmos-dir", default=str(ATMOS_DIR), help="Directory containing atmos.yaml")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args()
+
+    atmos_dir = Path(args.atmos_dir)
+    stacks = StackRepository(atmos_dir).load_all()
+    index = NameIndex.from_stacks(stacks, atmos_dir / "components" / "terraform" / "modules")
+    findings = index.analyze()
+
+    if args.format == "json":
+        print(json.dumps({"names": [entry.describe() for entry in index.names],
+                          "findings": findings, "skipped": index.skipped}, indent=2))
+    else:
+        print(render_text(index, findings))
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
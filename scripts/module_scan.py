@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Per-Module Checkov Scans
+Scans every module directory with its own Checkov run (or run of
+run-custom-checks.py), up to --workers at a time, and stitches the
+per-module JSON reports into one report in Checkov's format, with file
+paths relative to the modules directory as a single run over it reports them.
+The exit code applies Checkov's soft-fail/hard-fail-on rules, read from the
+config file and the Checkov arguments, to the merged report.
+
+With --cache-dir, each module's report is stored under a key that hashes
+the module's files, the Checkov config file, the custom policy sources,
+the Checkov version and the Checkov arguments (and the files they name,
+such as a baseline). Only modules whose key changed are rescanned; the
+others are taken from the cache.
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+from pathlib import Path
+
+import yaml
+
+from changed_scope import REPORT_RESULT_KEYS, SUMMARY_KEYS
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MODULES_DIR = PROJECT_ROOT / "atmos" / "components" / "terraform" / "modules"
+CONFIG_FILE = PROJECT_ROOT / "security" / "checkov.yaml"
+POLICIES_DIR = PROJECT_ROOT / "security" / "checkov-policies"
+# Policy settings the custom checks read, next to the policies directory
+POLICY_CONFIG_NAME = "policy-config.yaml"
+CUSTOM_RUNNER = Path(__file__).resolve().parent / "run-custom-checks.py"
+
+# Directories that never hold scanned sources
+IGNORED_DIRS = {".terraform", "__pycache__", ".git"}
+
+# Checkov's severity levels (checkov.common.bridgecrew.severities)
+SEVERITY_LEVELS = {
+    "NONE": -999, "INFO": 1, "LOW": 2, "MEDIUM": 3, "MODERATE": 3,
+    "HIGH": 4, "IMPORTANT": 4, "CRITICAL": 5, "OFF": 999,
+}
+# Set to "true" to fail on parsing errors, as Checkov does
+PARSE_ERROR_FAIL_ENV_VAR = "CKV_PARSE_ERROR_FAIL"
+
+
+def module_dirs(modules_dir):
+    """Direct children of modules_dir that contain Terraform files"""
+    return sorted(path for path in Path(modules_dir).iterdir()
+                  if path.is_dir() and any(path.glob("*.tf")))
+
+
+def tree_digest(root):
+    """SHA-256 over the relative paths and contents of every file under root"""
+    digest = hashlib.sha256()
+    root = Path(root)
+    if not root.exists():
+        digest.update(b"missing")
+        return digest.hexdigest()
+    files = [root] if root.is_file() else sorted(
+        path for path in root.rglob("*")
+        if path.is_file() and not IGNORED_DIRS.intersection(path.relative_to(root).parts))
+    for path in files:
+        digest.update(str(path.relative_to(root) if path != root else path.name).encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def checkov_version():
+    try:
+        return metadata.version("checkov")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def scan_digest(config_file, policies_dir, checkov_args, runner="checkov"):
+    """Key part shared by every module of one scan"""
+    digest = hashlib.sha256()
+    policy_config = Path(policies_dir).parent / POLICY_CONFIG_NAME
+    for part in (tree_digest(config_file), tree_digest(policies_dir), tree_digest(policy_config),
+                 checkov_version(), runner):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    for arg in checkov_args:
+        digest.update(arg.encode())
+        digest.update(b"\0")
+        # Files named by arguments (baseline, config) change results too
+        if os.path.isfile(arg):
+            digest.update(tree_digest(arg).encode())
+    return digest.hexdigest()
+
+
+def module_key(module_dir, shared_digest):
+    return hashlib.sha256(f"{tree_digest(module_dir)}:{shared_digest}".encode()).hexdigest()
+
+
+class ReportCache:
+    """One JSON file per module: {"key", "report"} of its last scan"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def path(self, module_dir):
+        return self.cache_dir / f"{Path(module_dir).name}.json"
+
+    def get(self, module_dir, key):
+        try:
+            with open(self.path(module_dir), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("key") == key else None
+
+    def put(self, module_dir, key, report):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(module_dir)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporary, "w") as f:
+            json.dump({"key": key, "report": report}, f)
+        os.replace(temporary, path)
+
+
+def scan_command(runner, module_dir, scan_args):
+    if runner == "custom":
+        return [sys.executable, str(CUSTOM_RUNNER), str(module_dir), "--format", "json", "--workers", "1",
+                *scan_args]
+    return ["checkov", "--directory", str(module_dir), "--output", "json", *scan_args]
+
+
+def run_scan(module_dir, scan_args, runner="checkov"):
+    """JSON report of one scanner run over a module directory"""
+    command = scan_command(runner, module_dir, scan_args)
+    completed = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    try:
+        return json.loads(completed.stdout)
+    except ValueError:
+        raise RuntimeError(f"{runner} produced no JSON report for {module_dir} "
+                           f"(exit code {completed.returncode}): {completed.stderr.strip()[-500:]}")
+
+
+def relocate(report, module_name):
+    """Rewrite file paths from module-relative to modules_dir-relative, in place"""
+    for entry in report if isinstance(report, list) else [report]:
+        results = entry.get("results") or {}
+        for key in REPORT_RESULT_KEYS:
+            for result in results.get(key) or ():
+                file_path = result.get("file_path")
+                if isinstance(file_path, str) and file_path.startswith("/"):
+                    result["file_path"] = f"/{module_name}{file_path}"
+    return report
+
+
+def report_entries(report):
+    """Checkov prints a list for several frameworks and a bare summary when nothing was scanned"""
+    entries = report if isinstance(report, list) else [report]
+    return [entry if "results" in entry or "summary" in entry else {"summary": entry}
+            for entry in entries if isinstance(entry, dict)]
+
+
+def empty_report(check_type="terraform"):
+    results = {key: [] for key in REPORT_RESULT_KEYS}
+    results["parsing_errors"] = []
+    summary = {SUMMARY_KEYS[key]: 0 for key in REPORT_RESULT_KEYS}
+    summary.update(parsing_errors=0, resource_count=0)
+    return {"check_type": check_type, "results": results, "summary": summary}
+
+
+def merge_reports(reports):
+    """One Checkov report (a list of them for several check types) from per-module reports"""
+    merged = {}
+    for report in reports:
+        for entry in report_entries(report):
+            check_type = entry.get("check_type", "terraform")
+            target = merged.get(check_type)
+            if target is None:
+                target = merged[check_type] = empty_report(check_type)
+            results = entry.get("results") or {}
+            for key in REPORT_RESULT_KEYS + ("parsing_errors",):
+                target["results"][key].extend(results.get(key) or ())
+            summary = entry.get("summary") or {}
+            for key in ("passed", "failed", "skipped", "parsing_errors", "resource_count"):
+                target["summary"][key] += summary.get(key) or 0
+            if "checkov_version" in summary:
+                target["summary"]["checkov_version"] = summary["checkov_version"]
+    if not merged:
+        return empty_report()
+    documents = list(merged.values())
+    return documents[0] if len(documents) == 1 else documents
+
+
+def _as_list(value):
+    """Checkov takes these options as YAML lists or comma-separated strings"""
+    if value is None or value is False:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return [str(item) for item in value]
+
+
+def fail_thresholds(config_file=None, checkov_args=()):
+    """
+    {"soft_fail", "soft_fail_on", "hard_fail_on"} from the config file,
+    overridden by the same options among the Checkov arguments
+    """
+    options = {"soft-fail": False, "soft-fail-on": [], "hard-fail-on": []}
+    if config_file and os.path.isfile(config_file):
+        with open(config_file, "r") as f:
+            config = yaml.safe_load(f) or {}
+        options["soft-fail"] = bool(config.get("soft-fail", False))
+        options["soft-fail-on"] = _as_list(config.get("soft-fail-on"))
+        options["hard-fail-on"] = _as_list(config.get("hard-fail-on"))
+    args = list(checkov_args)
+    for index, arg in enumerate(args):
+        name, _, value = arg.partition("=")
+        if name == "--soft-fail":
+            options["soft-fail"] = True
+        elif name in ("--soft-fail-on", "--hard-fail-on"):
+            if not value and index + 1 < len(args):
+                value = args[index + 1]
+            options[name[2:]] = _as_list(value)
+    return {"soft_fail": options["soft-fail"], "soft_fail_on": options["soft-fail-on"],
+            "hard_fail_on": options["hard-fail-on"]}
+
+
+def checkov_fail_thresholds(checkov_args):
+    """fail_thresholds of a Checkov run, which reads only the config file named in its arguments"""
+    checkov_args = list(checkov_args)
+    config_file = None
+    if "--config-file" in checkov_args[:-1]:
+        config_file = checkov_args[checkov_args.index("--config-file") + 1]
+    return fail_thresholds(config_file, checkov_args)
+
+
+def _split_fail_on(values, pick):
+    """(check ID patterns, severity threshold) of a fail-on list; pick chooses among severities"""
+    checks, levels = [], []
+    for value in values:
+        if value.upper() in SEVERITY_LEVELS:
+            levels.append(SEVERITY_LEVELS[value.upper()])
+        else:
+            checks.append(value)
+    return checks, (pick(levels) if levels else None)
+
+
+def exit_code(report, thresholds):
+    """
+    0 or 1 for a (merged) report, following Checkov's Report.get_exit_code:
+    a failed check hard-fails when it is listed in hard-fail-on, when its
+    severity reaches the lowest hard-fail-on severity (and it is not listed in
+    soft-fail-on), or when no fail-on option applies and soft-fail is off
+    """
+    soft_checks, soft_level = _split_fail_on(thresholds["soft_fail_on"], max)
+    hard_checks, hard_level = _split_fail_on(thresholds["hard_fail_on"], min)
+    entries = report_entries(report)
+    parse_error_fail = os.environ.get(PARSE_ERROR_FAIL_ENV_VAR, "false").lower() == "true"
+
+    def matches(check, patterns):
+        return any(fnmatch.fnmatch(check.get("check_id") or "", pattern)
+                   or (check.get("bc_check_id") and fnmatch.fnmatch(check["bc_check_id"], pattern))
+                   for pattern in patterns)
+
+    for entry in entries:
+        results = entry.get("results") or {}
+        if parse_error_fail and results.get("parsing_errors"):
+            return 1
+        failed = results.get("failed_checks") or []
+        if not failed:
+            continue
+        if not (soft_checks or soft_level is not None or hard_checks or hard_level is not None):
+            if not thresholds["soft_fail"]:
+                return 1
+            continue
+        for check in failed:
+            level = SEVERITY_LEVELS.get(str(check.get("severity") or "").upper())
+            soft_severity = level is not None and soft_level is not None and level <= soft_level
+            hard_severity = level is not None and hard_level is not None and level >= hard_level
+            explicit_soft = matches(check, soft_checks)
+            explicit_hard = matches(check, hard_checks)
+            implicit_soft = not explicit_hard and not soft_checks and soft_level is None
+            implicit_hard = not explicit_soft and not soft_severity
+            if explicit_hard or (hard_severity and not explicit_soft) or (
+                    implicit_hard and not implicit_soft and not thresholds["soft_fail"]):
+                return 1
+    return 0
+
+
+def scan_modules(modules, scan_args, cache=None, shared_digest="", log=print, workers=None, runner="checkov"):
+    """
+    [(module, report)] in module order, reusing cached reports whose key still matches
+
+    Modules to scan are run up to ``workers`` at a time; each task only waits
+    on its scanner process, so the pool bounds the concurrent scanner processes.
+    """
+    reports, pending = {}, []
+    for module_dir in modules:
+        key = module_key(module_dir, shared_digest)
+        entry = cache.get(module_dir, key) if cache else None
+        if entry is not None:
+            log(f"cached   {module_dir.name}")
+            reports[module_dir] = entry["report"]
+        else:
+            pending.append((module_dir, key))
+
+    def scan(task):
+        module_dir, key = task
+        log(f"scanning {module_dir.name}")
+        report = relocate(run_scan(module_dir, scan_args, runner), module_dir.name)
+        if cache:
+            cache.put(module_dir, key, report)
+        return report
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending) or 1))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for (module_dir, _), report in zip(pending, pool.map(scan, pending)):
+                reports[module_dir] = report
+    else:
+        for task in pending:
+            reports[task[0]] = scan(task)
+    return [(module_dir, reports[module_dir]) for module_dir in modules]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scan each module with Checkov, reusing cached per-module reports, and merge the results",
+        epilog="Arguments after -- are passed to every scanner run.")
+    parser.add_argument("modules", nargs="*", help="Module directories to scan (default: every module)")
+    parser.add_argument("--modules-dir", default=str(MODULES_DIR), help="Directory holding the modules")
+    parser.add_argument("--output", required=True, help="Merged JSON report path")
+    parser.add_argument("--cache-dir", help="Reuse per-module reports stored here when their key is unchanged")
+    parser.add_argument("--config-file", default=str(CONFIG_FILE),
+                        help="Checkov config file, part of the key (its fail options apply with --runner custom)")
+    parser.add_argument("--policies-dir", default=str(POLICIES_DIR), help="Custom policies part of the key")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Concurrent scans (default: CPU count); each pays the scanner's startup, so "
+                             "this only beats one run over all modules with several CPUs and large modules")
+    parser.add_argument("--runner", choices=["checkov", "custom"], default="checkov",
+                        help="Scan with Checkov or with run-custom-checks.py (CKV_OP_* checks only)")
+    argv = sys.argv[1:]
+    split = argv.index("--") if "--" in argv else len(argv)
+    args = parser.parse_args(argv[:split])
+    scan_args = argv[split + 1:]
+
+    modules = [Path(path) for path in args.modules] or module_dirs(args.modules_dir)
+    cache = ReportCache(args.cache_dir) if args.cache_dir else None
+    shared_digest = scan_digest(args.config_file, args.policies_dir, scan_args, args.runner)
+    # Checkov takes its fail options from its own arguments; the custom
+    # runner has none, so those of the config file apply
+    if args.runner == "checkov":
+        thresholds = checkov_fail_thresholds(scan_args)
+    else:
+        thresholds = fail_thresholds(args.config_file)
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    try:
+        scanned = scan_modules(modules, scan_args, cache, shared_digest, log, args.workers, args.runner)
+    except RuntimeError as error:
+        log(f"❌ {error}")
+        return 2
+    merged = merge_reports([report for _, report in scanned])
+    with open(args.output, "w") as f:
+        json.dump(merged, f, indent=4)
+    return exit_code(merged, thresholds)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,17 +4,40 @@ Terraform Plan Parser and Dashboard Generator
 Parses terraform plan output and creates a beautiful summary table
 """
 
+import os
 import sys
 import re
 import json
+import sqlite3
+import tempfile
 from tabulate import tabulate
 from collections import defaultdict, Counter
 
+try:
+    from wcwidth import wcswidth as display_width
+except ImportError:
+    # tabulate measures cells with len() as well when wcwidth is not installed
+    display_width = len
+
+# Memory budget for the change aggregation before it spills to SQLite.
+# Override with --memory-budget or PLAN_DASHBOARD_MEMORY_BUDGET (e.g. "256M").
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Approximate per-change overhead of the dict holding one resource change
+CHANGE_OVERHEAD_BYTES = 400
+
+DETAIL_ACTIONS = ['CREATE', 'UPDATE', 'REPLACE', 'DESTROY']
+DETAIL_HEADERS = ["Component", "Resource Type", "Resource Name"]
+
+# Actions whose resources a change-scoped policy scan covers
+SCOPED_ACTIONS = frozenset(['CREATE', 'UPDATE', 'REPLACE'])
+
 def parse_terraform_plan(plan_output):
     """Parse terraform plan output and extract resource changes"""
-    changes = []
-    current_resource = None
-    
+    return list(iter_terraform_plan_changes(plan_output))
+
+def iter_terraform_plan_changes(plan_output):
+    """Yield resource changes from terraform plan output one line at a time"""
     # Patterns for different operations
     patterns = {
         'create': r'^\s*\+\s+resource\s+"([^"]+)"\s+"([^"]+)"',
@@ -24,7 +47,7 @@ def parse_terraform_plan(plan_output):
         'read': r'^\s*<=\s+data\s+"([^"]+)"\s+"([^"]+)"'
     }
     
-    for line in plan_output.split('\n'):
+    for line in _iter_lines(plan_output):
         for action, pattern in patterns.items():
             match = re.match(pattern, line)
             if match:
@@ -35,15 +58,29 @@ def parse_terraform_plan(plan_output):
                 if action == 'read':
                     continue
                     
-                changes.append({
+                yield {
                     'action': action.upper(),
                     'resource_type': resource_type,
                     'resource_name': resource_name,
                     'full_name': f"{resource_type}.{resource_name}"
-                })
+                }
                 break
-    
-    return changes
+
+def changed_resources(plan_output, actions=SCOPED_ACTIONS):
+    """Set of "type.name" for the resources the plan creates, updates or replaces"""
+    return {change['full_name'] for change in iter_terraform_plan_changes(plan_output)
+            if change['action'] in actions}
+
+def _iter_lines(plan_output):
+    """Iterate over plan lines without materialising a split copy of the plan"""
+    start = 0
+    while True:
+        end = plan_output.find('\n', start)
+        if end == -1:
+            yield plan_output[start:]
+            return
+        yield plan_output[start:end]
+        start = end + 1
 
 def extract_resource_counts(plan_output):
     """Extract the summary counts from terraform plan output"""
@@ -60,19 +97,180 @@ def extract_resource_counts(plan_output):
     
     return counts
 
-def generate_dashboard(component_plans):
+def parse_memory_budget(value):
+    """Parse a memory budget such as 1048576, "512K", "64M" or "1G" into bytes"""
+    if value is None or value == '':
+        return DEFAULT_MEMORY_BUDGET
+    if isinstance(value, int):
+        return value
+
+    match = re.match(r'^\s*(\d+)\s*([KMG]?)B?\s*$', str(value), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid memory budget: {value}")
+
+    multiplier = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}[match.group(2).upper()]
+    return int(match.group(1)) * multiplier
+
+class ChangeStore:
+    """
+    Aggregates resource changes in memory until the estimated size exceeds
+    the memory budget, then spills them into a temporary SQLite database.
+    Grouped reads come back in insertion order either way.
+    """
+
+    def __init__(self, memory_budget=None):
+        if memory_budget is None:
+            memory_budget = os.environ.get('PLAN_DASHBOARD_MEMORY_BUDGET')
+        self.memory_budget = parse_memory_budget(memory_budget)
+        self.estimated_bytes = 0
+        self.counts = Counter()
+        self._changes = []
+        self._db = None
+        self._db_path = None
+        self._pending = []
+
+    @property
+    def spilled(self):
+        return self._db is not None
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def add(self, component, change):
+        row = (change['action'], component, change['resource_type'], change['resource_name'])
+        self.counts[row[0]] += 1
+
+        if self._db is not None:
+            self._pending.append(row)
+            if len(self._pending) >= 1000:
+                self._flush()
+            return
+
+        self._changes.append(row)
+        self.estimated_bytes += CHANGE_OVERHEAD_BYTES + sum(len(value) for value in row)
+        if self.estimated_bytes > self.memory_budget:
+            self._spill()
+
+    def _spill(self):
+        """Move the in-memory changes into an on-disk SQLite store"""
+        fd, self._db_path = tempfile.mkstemp(prefix='plan-dashboard-', suffix='.sqlite')
+        os.close(fd)
+        self._db = sqlite3.connect(self._db_path)
+        self._db.create_function('DISPLAY_WIDTH', 1, display_width, deterministic=True)
+        self._db.execute('PRAGMA journal_mode = OFF')
+        self._db.execute('PRAGMA synchronous = OFF')
+        self._db.execute(
+            'CREATE TABLE changes (seq INTEGER PRIMARY KEY, action TEXT, component TEXT, '
+            'resource_type TEXT, resource_name TEXT)'
+        )
+        self._pending = self._changes
+        self._changes = []
+        self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._db.executemany(
+                'INSERT INTO changes (action, component, resource_type, resource_name) VALUES (?, ?, ?, ?)',
+                self._pending
+            )
+            self._pending = []
+
+    def finalize(self):
+        """Flush pending rows and index the spilled store for grouped reads"""
+        if self._db is not None:
+            self._flush()
+            self._db.execute('CREATE INDEX IF NOT EXISTS idx_changes_action ON changes (action, seq)')
+            self._db.commit()
+
+    def iter_action(self, action):
+        """Yield (component, resource_type, resource_name) rows for one action"""
+        if self._db is None:
+            for row in self._changes:
+                if row[0] == action:
+                    yield row[1:]
+            return
+
+        self.finalize()
+        cursor = self._db.execute(
+            'SELECT component, resource_type, resource_name FROM changes WHERE action = ? ORDER BY seq',
+            (action,)
+        )
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            yield from rows
+
+    def column_widths(self, action):
+        """Widest value per detail column for one action, in terminal columns as tabulate counts them"""
+        if self._db is None:
+            widths = [0, 0, 0]
+            for row in self.iter_action(action):
+                widths = [max(width, display_width(value)) for width, value in zip(widths, row)]
+            return widths
+
+        self.finalize()
+        return list(self._db.execute(
+            'SELECT MAX(DISPLAY_WIDTH(component)), MAX(DISPLAY_WIDTH(resource_type)), '
+            'MAX(DISPLAY_WIDTH(resource_name)) '
+            'FROM changes WHERE action = ?',
+            (action,)
+        ).fetchone())
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            os.unlink(self._db_path)
+        self._changes = []
+
+def _pad(value, width):
+    """Left-align a cell to ``width`` terminal columns (wide CJK/emoji characters take two)"""
+    return value + ' ' * (width - display_width(value))
+
+def _iter_grid_table(headers, rows, widths):
+    """
+    Stream a left-aligned table in tabulate's "grid" layout, one line at a time,
+    so large grouped tables never have to be materialised as a list of rows
+    """
+    widths = [max(display_width(header) + 2, width) for header, width in zip(headers, widths)]
+    separator = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+
+    yield separator
+    yield '| ' + ' | '.join(_pad(header, width) for header, width in zip(headers, widths)) + ' |'
+    yield separator.replace('-', '=')
+    for row in rows:
+        yield '| ' + ' | '.join(_pad(value, width) for value, width in zip(row, widths)) + ' |'
+        yield separator
+
+def generate_dashboard(component_plans, memory_budget=None):
     """Generate a beautiful dashboard from component plans"""
-    
+    dashboard = []
+    write_dashboard(component_plans, dashboard.append, memory_budget)
+    return "\n".join(dashboard)
+
+def write_dashboard(component_plans, write, memory_budget=None):
+    """
+    Generate the dashboard line by line, passing each line to ``write``.
+    Change aggregation is bounded by ``memory_budget`` (bytes or "64M" style).
+    """
+    store = ChangeStore(memory_budget)
+    try:
+        _write_dashboard(component_plans, write, store)
+    finally:
+        store.close()
+
+def _write_dashboard(component_plans, write, store):
     # Overall summary
     total_counts = Counter()
-    all_changes = []
+    component_counts = {}
     
     # Process each component
     for component, plan_output in component_plans.items():
-        changes = parse_terraform_plan(plan_output)
+        for change in iter_terraform_plan_changes(plan_output):
+            store.add(component, change)
         counts = extract_resource_counts(plan_output)
-        
-        all_changes.extend([{**change, 'component': component} for change in changes])
+        component_counts[component] = counts
         
         for action, count in counts.items():
             if action == 'add':
@@ -82,12 +280,9 @@ def generate_dashboard(component_plans):
             elif action == 'destroy':
                 total_counts['DESTROY'] += count
     
-    # Create summary tables
-    dashboard = []
-    
     # Overall Summary
-    dashboard.append("# 🚀 Terraform Plan Dashboard")
-    dashboard.append("")
+    write("# 🚀 Terraform Plan Dashboard")
+    write("")
     
     if total_counts:
         summary_data = [
@@ -97,21 +292,20 @@ def generate_dashboard(component_plans):
             ["📊 TOTAL", sum(total_counts.values()), "ℹ️"]
         ]
         
-        dashboard.append("## 📊 Overall Summary")
-        dashboard.append("```")
-        dashboard.append(tabulate(summary_data, headers=["Action", "Count", "Status"], 
-                                tablefmt="grid", colalign=("left", "center", "center")))
-        dashboard.append("```")
-        dashboard.append("")
+        write("## 📊 Overall Summary")
+        write("```")
+        write(tabulate(summary_data, headers=["Action", "Count", "Status"], 
+                       tablefmt="grid", colalign=("left", "center", "center")))
+        write("```")
+        write("")
     
     # Component-wise breakdown
     if len(component_plans) > 1:
-        dashboard.append("## 🧩 Component Breakdown")
-        dashboard.append("")
+        write("## 🧩 Component Breakdown")
+        write("")
         
         component_data = []
-        for component, plan_output in component_plans.items():
-            counts = extract_resource_counts(plan_output)
+        for component, counts in component_counts.items():
             component_data.append([
                 component,
                 counts.get('add', 0),
@@ -121,22 +315,17 @@ def generate_dashboard(component_plans):
             ])
         
         if component_data:
-            dashboard.append("```")
-            dashboard.append(tabulate(component_data, 
-                                    headers=["Component", "Create", "Update", "Destroy", "Total"],
-                                    tablefmt="grid", colalign=("left", "center", "center", "center", "center")))
-            dashboard.append("```")
-            dashboard.append("")
+            write("```")
+            write(tabulate(component_data, 
+                           headers=["Component", "Create", "Update", "Destroy", "Total"],
+                           tablefmt="grid", colalign=("left", "center", "center", "center", "center")))
+            write("```")
+            write("")
     
     # Detailed resource changes
-    if all_changes:
-        dashboard.append("## 📝 Detailed Changes")
-        dashboard.append("")
-        
-        # Group by action
-        by_action = defaultdict(list)
-        for change in all_changes:
-            by_action[change['action']].append(change)
+    if len(store):
+        write("## 📝 Detailed Changes")
+        write("")
         
         action_icons = {
             'CREATE': '🟢',
@@ -145,49 +334,54 @@ def generate_dashboard(component_plans):
             'REPLACE': '🔄'
         }
         
-        for action in ['CREATE', 'UPDATE', 'REPLACE', 'DESTROY']:
-            if action in by_action:
-                changes = by_action[action]
-                dashboard.append(f"### {action_icons.get(action, '📋')} {action} ({len(changes)} resources)")
-                dashboard.append("")
-                
-                change_data = []
-                for change in changes:
-                    change_data.append([
-                        change['component'],
-                        change['resource_type'],
-                        change['resource_name']
-                    ])
+        for action in DETAIL_ACTIONS:
+            if store.counts.get(action):
+                write(f"### {action_icons.get(action, '📋')} {action} ({store.counts[action]} resources)")
+                write("")
                 
-                dashboard.append("```")
-                dashboard.append(tabulate(change_data,
-                                        headers=["Component", "Resource Type", "Resource Name"],
-                                        tablefmt="grid", colalign=("left", "left", "left")))
-                dashboard.append("```")
-                dashboard.append("")
+                write("```")
+                if store.spilled:
+                    # Spilled aggregations are streamed straight from the store
+                    for line in _iter_grid_table(DETAIL_HEADERS, store.iter_action(action),
+                                                 store.column_widths(action)):
+                        write(line)
+                else:
+                    write(tabulate(list(store.iter_action(action)),
+                                   headers=DETAIL_HEADERS,
+                                   tablefmt="grid", colalign=("left", "left", "left")))
+                write("```")
+                write("")
     
     # Add warnings if destroying resources
     if total_counts.get('DESTROY', 0) > 0:
-        dashboard.append("## ⚠️ DESTRUCTION WARNING")
-        dashboard.append("")
-        dashboard.append("🔥 **This plan will DESTROY resources!**")
-        dashboard.append("")
-        dashboard.append("Please review the destruction carefully before applying.")
-        dashboard.append("Destroyed resources cannot be recovered.")
-        dashboard.append("")
-    
-    return "\n".join(dashboard)
+        write("## ⚠️ DESTRUCTION WARNING")
+        write("")
+        write("🔥 **This plan will DESTROY resources!**")
+        write("")
+        write("Please review the destruction carefully before applying.")
+        write("Destroyed resources cannot be recovered.")
+        write("")
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 parse-terraform-plan.py <component_name> [plan_file]")
+    args = sys.argv[1:]
+    memory_budget = None
+    if '--memory-budget' in args:
+        index = args.index('--memory-budget')
+        if index + 1 >= len(args):
+            print("--memory-budget requires a value (e.g. 256M)")
+            sys.exit(1)
+        memory_budget = args[index + 1]
+        del args[index:index + 2]
+
+    if len(args) < 1:
+        print("Usage: python3 parse-terraform-plan.py [--memory-budget SIZE] <component_name> [plan_file]")
         sys.exit(1)
     
-    component_name = sys.argv[1]
+    component_name = args[0]
     
     # Read from file or stdin
-    if len(sys.argv) > 2:
-        with open(sys.argv[2], 'r') as f:
+    if len(args) > 1:
+        with open(args[1], 'r') as f:
             plan_output = f.read()
     else:
         plan_output = sys.stdin.read()
@@ -195,9 +389,8 @@ def main():
     # For single component, create a dict
     component_plans = {component_name: plan_output}
     
-    # Generate and print dashboard
-    dashboard = generate_dashboard(component_plans)
-    print(dashboard)
+    # Generate and print dashboard line by line
+    write_dashboard(component_plans, print, memory_budget)
 
 # Make functions available when imported or executed
 if __name__ == "__main__":
@@ -206,6 +399,8 @@ else:
     # When imported, make functions available in global scope
     globals().update({
         'parse_terraform_plan': parse_terraform_plan,
+        'changed_resources': changed_resources,
         'extract_resource_counts': extract_resource_counts,
-        'generate_dashboard': generate_dashboard
+        'generate_dashboard': generate_dashboard,
+        'write_dashboard': write_dashboard
     })
\ No newline at end of file
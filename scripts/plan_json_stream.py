@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for `terraform show -json` output
+Yields planned resources (or resource changes) one at a time without loading
+the whole plan document, so org-wide plans are processed in bounded memory
+"""
+
+import codecs
+import json
+import re
+import sys
+
+CHUNK_SIZE = 1024 * 1024
+
+# A complete string, a structural character, or a lone quote (string cut by a chunk boundary)
+TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]:,]|"')
+# Characters that can continue a number cut short by the end of the buffer
+NUMBER_CHARS = set("0123456789.eE+-")
+
+
+class ContainerEvent(str):
+    """Opening or closing of an object or array, as yielded by iter_values"""
+
+
+OBJECT_START, OBJECT_END = ContainerEvent("{"), ContainerEvent("}")
+ARRAY_START, ARRAY_END = ContainerEvent("["), ContainerEvent("]")
+CONTAINER_EVENTS = {"{": OBJECT_START, "}": OBJECT_END, "[": ARRAY_START, "]": ARRAY_END}
+
+
+def iter_array_items(stream, is_target, chunk_size=CHUNK_SIZE):
+    """
+    Yield the decoded items of every JSON array whose key path satisfies is_target.
+
+    The key path is the tuple of object keys from the document root to the
+    array (array positions are not included), e.g. ("planned_values",
+    "root_module", "child_modules", "resources"). Only structural tokens are
+    scanned; each matching item is decoded with json once it is fully buffered.
+    """
+    for _, item in iter_values(stream, is_target, None, chunk_size):
+        yield item
+
+
+def iter_values(stream, is_item, is_member=None, chunk_size=CHUNK_SIZE, is_container=None):
+    """
+    Yield (key path, value) for the items of every array whose key path
+    satisfies is_item, and for every object member whose key path (ending
+    with the member's key) satisfies is_member, in document order.
+
+    Selected values are decoded whole, so their nested arrays and members are
+    not matched again. With is_container, objects and arrays whose key path
+    satisfies it (and that are not decoded whole) also yield (key path,
+    OBJECT_START / ARRAY_START) when they open and (key path, OBJECT_END /
+    ARRAY_END) when they close, so a caller can follow the document's shape.
+    Nothing inside such a container is skipped: a member or item that is not
+    selected is yielded whole too, unless it is itself an object or array
+    whose key path satisfies is_container. A document that is not an object
+    or array is yielded whole when is_container(()) holds.
+    """
+    decoder = json.JSONDecoder()
+    # Binary streams are decoded incrementally: a chunk may end inside a multibyte character
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    eof = False
+    # Frames: [kind, key, is_target, event path] - kind "{" or "[", key is the
+    # current object key, event path is set when the container yields events
+    stack = []
+    last_string = None
+    # Key path of the array item or object member decoded next
+    pending = None
+    # Key path of the next value inside a container that yields events: it is
+    # decoded whole (like pending) unless it opens an object or array
+    peek = () if is_container is not None and is_container(()) else None
+
+    def refill(keep_from):
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+        if isinstance(chunk, bytes):
+            # An empty result only means the chunk ended mid-character; EOF flushes the decoder
+            chunk = utf8.decode(chunk, final=eof)
+        buffer = buffer[keep_from:] + chunk
+        position = 0
+
+    def inside_events(path):
+        """Set pending or peek for the next member or item of a container that yields events"""
+        nonlocal pending, peek
+        if is_container(path):
+            peek = path
+        else:
+            pending = path
+
+    while True:
+        if peek is not None:
+            start = position
+            while start < len(buffer) and buffer[start] in " \t\r\n":
+                start += 1
+            if start == len(buffer) and not eof:
+                refill(position)
+                continue
+            if start == len(buffer) or buffer[start] in "{[]":
+                # A container (or an empty array's end): scanned as usual
+                peek = None
+                continue
+            pending = peek
+            peek = None
+            continue
+
+        if pending is not None:
+            start = position
+            while start < len(buffer) and buffer[start] in " \t\r\n":
+                start += 1
+            if start < len(buffer) and buffer[start] == "]":
+                # Empty target array
+                pending = None
+                continue
+            try:
+                if start == len(buffer):
+                    raise json.JSONDecodeError("Expecting value", buffer, start)
+                value, end = decoder.raw_decode(buffer, start)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                refill(position)
+                continue
+            if not eof and (end == len(buffer) or (isinstance(value, (int, float)) and buffer[end] in NUMBER_CHARS)):
+                # A number may continue in the next chunk (e.g. "1e" followed by "+30")
+                refill(position)
+                continue
+            yield pending, value
+            position = end
+            pending = None
+            continue
+
+        match = TOKEN.search(buffer, position)
+        if match is None or match.group() == '"':
+            if eof:
+                if match is not None:
+                    raise ValueError("Unterminated string in JSON document")
+                return
+            refill(position if match is None else match.start())
+            continue
+
+        token = match.group()
+        position = match.end()
+        if token in ("{", "["):
+            path = tuple(frame[1] for frame in stack if frame[0] == "{")
+            events = is_container is not None and is_container(path)
+            stack.append([token, None, token == "[" and bool(is_item(path)), path if events else None])
+            if events:
+                yield path, CONTAINER_EVENTS[token]
+            if stack[-1][2]:
+                # Items of a target array are decoded whole
+                pending = path
+            elif token == "[" and events:
+                inside_events(path)
+        elif token in ("}", "]"):
+            frame = stack.pop()
+            if frame[3] is not None:
+                yield frame[3], CONTAINER_EVENTS[token]
+        elif token == ":":
+            stack[-1][1] = last_string
+            if is_member is not None:
+                path = tuple(frame[1] for frame in stack if frame[0] == "{")
+                if is_member(path):
+                    pending = path
+            if pending is None and stack[-1][3] is not None:
+                inside_events(tuple(frame[1] for frame in stack if frame[0] == "{"))
+        elif token == ",":
+            if stack[-1][0] == "[" and stack[-1][2]:
+                pending = tuple(frame[1] for frame in stack if frame[0] == "{")
+            elif stack[-1][0] == "[" and stack[-1][3] is not None:
+                inside_events(stack[-1][3])
+        else:
+            last_string = json.loads(token)
+
+
+def is_planned_resources(path):
+    """Resource lists of the root module and every child module in planned_values"""
+    return len(path) >= 3 and path[0] == "planned_values" and path[-1] == "resources"
+
+
+def is_resource_changes(path):
+    return path == ("resource_changes",)
+
+
+def iter_planned_resources(stream, chunk_size=CHUNK_SIZE):
+    """Planned managed resources ({address, type, name, values, ...}) from a plan JSON stream"""
+    for resource in iter_array_items(stream, is_planned_resources, chunk_size):
+        if resource.get("mode", "managed") == "managed":
+            yield resource
+
+
+def iter_resource_changes(stream, chunk_size=CHUNK_SIZE):
+    """Entries of resource_changes from a plan JSON stream"""
+    yield from iter_array_items(stream, is_resource_changes, chunk_size)
+
+
+def to_conf(values):
+    """Planned attribute values in the list-wrapped shape Checkov uses for resource confs"""
+    conf = {}
+    for key, value in (values or {}).items():
+        # Nested blocks are lists of objects; maps such as tags stay as plain values
+        if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+            conf[key] = [to_conf(item) for item in value]
+        else:
+            conf[key] = [value]
+    return conf
+
+
+def open_plan(path):
+    """A text stream for a plan JSON file, or stdin for '-'"""
+    if path == "-":
+        return sys.stdin
+    return open(path, "r", encoding="utf-8")
+
+
+def main():
+    """Print the address and type of every planned resource"""
+    if len(sys.argv) != 2:
+        print("Usage: plan_json_stream.py <plan.json|->", file=sys.stderr)
+        return 1
+    with open_plan(sys.argv[1]) as stream:
+        for resource in iter_planned_resources(stream):
+            print(f"{resource.get('address')}\t{resource.get('type')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Checkov Report Index
+Ingests Checkov JSON reports (such as the security/reports/checkov-*.json
+outputs of checkov-scan.sh) into a local SQLite database, so questions about
+the history of the scans are queries instead of re-reading every report.
+
+Tables:
+
+- runs: one row per report, with its scan time (from the report name, or the
+  file's modification time), its summary counts and a hash of its content
+- checks: one row per check ID, with its name and guideline
+- resources: one row per (resource address, file)
+- findings: one row per check result of a run (PASSED, FAILED or SKIPPED)
+- strings: the interned check names, file paths, guidelines, skip reasons
+  and details the other tables refer to by ID
+
+Findings are indexed by check, resource and file. Ingestion is incremental:
+reports whose content is unchanged since they were ingested are skipped, and
+a changed report replaces its run. Reports, in Checkov JSON or the compact
+format of compact_report.py, are read one check at a time with
+compact_report.open_report, so large reports are ingested in bounded memory.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from compact_report import COMPACT_SUFFIXES, open_report
+from plan_json_stream import CHUNK_SIZE
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+REPORTS_DIR = PROJECT_ROOT / "security" / "reports"
+DEFAULT_DB = PROJECT_ROOT / "security" / ".report-index.sqlite"
+
+RESULT_KEYS = {"passed_checks": "PASSED", "failed_checks": "FAILED", "skipped_checks": "SKIPPED"}
+SUMMARY_FIELDS = ("passed", "failed", "skipped", "parsing_errors", "resource_count")
+
+# checkov-{component}-{stack}-{DDMMYYYY-HHMM}, as generate_report_filename names reports
+REPORT_NAME = re.compile(r"^checkov-(?P<scope>.+)-(?P<stamp>\d{8}-\d{4})$")
+# Checkov 3 writes --output-file as a directory holding this file
+CHECKOV_JSON_NAME = "results_json.json"
+
+INSERT_BATCH = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS strings (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    report_path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    scope TEXT,
+    scanned_at TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    check_types TEXT,
+    checkov_version TEXT,
+    passed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    parsing_errors INTEGER NOT NULL DEFAULT 0,
+    resource_count INTEGER NOT NULL DEFAULT 0,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY,
+    check_id TEXT NOT NULL UNIQUE,
+    bc_check_id TEXT,
+    name_id INTEGER REFERENCES strings (id),
+    guideline_id INTEGER REFERENCES strings (id)
+);
+CREATE TABLE IF NOT EXISTS resources (
+    id INTEGER PRIMARY KEY,
+    address TEXT NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES strings (id),
+    UNIQUE (address, file_id)
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    check_id INTEGER NOT NULL REFERENCES checks (id),
+    resource_id INTEGER NOT NULL REFERENCES resources (id),
+    result TEXT NOT NULL,
+    severity TEXT,
+    line_start INTEGER,
+    line_end INTEGER,
+    comment_id INTEGER REFERENCES strings (id),
+    details_id INTEGER REFERENCES strings (id)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_scanned_at ON runs (scanned_at);
+CREATE INDEX IF NOT EXISTS idx_resources_file ON resources (file_id);
+CREATE INDEX IF NOT EXISTS idx_findings_check ON findings (check_id, result, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_resource ON findings (resource_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_run ON findings (run_id, result);
+"""
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def report_files(paths):
+    """
+    Checkov JSON and compact reports under the given files and directories,
+    including Checkov 3 output directories
+    """
+    found = []
+    for path in map(Path, paths):
+        if path.is_file():
+            found.append(path)
+        elif (path / CHECKOV_JSON_NAME).is_file():
+            found.append(path / CHECKOV_JSON_NAME)
+        elif path.is_dir():
+            for candidate in sorted(path.iterdir()):
+                if candidate.is_dir() and (candidate / CHECKOV_JSON_NAME).is_file():
+                    found.append(candidate / CHECKOV_JSON_NAME)
+                elif candidate.is_file() and (candidate.suffix == ".json" or
+                                              candidate.name.endswith(COMPACT_SUFFIXES)):
+                    found.append(candidate)
+    return found
+
+
+def run_identity(report_file):
+    """(name, scope, scanned_at) of a report; the time comes from its name or its modification time"""
+    report_file = Path(report_file)
+    named = report_file.parent if report_file.name == CHECKOV_JSON_NAME else report_file
+    name = named.name
+    for suffix in (".json", *COMPACT_SUFFIXES):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    match = REPORT_NAME.match(name)
+    if match:
+        try:
+            scanned_at = datetime.strptime(match.group("stamp"), "%d%m%Y-%H%M")
+            return name, match.group("scope"), scanned_at.strftime("%Y-%m-%dT%H:%M")
+        except ValueError:
+            pass
+    scanned_at = datetime.fromtimestamp(report_file.stat().st_mtime)
+    return name, match.group("scope") if match else None, scanned_at.strftime("%Y-%m-%dT%H:%M")
+
+
+def is_result_list(path):
+    return len(path) == 2 and path[0] == "results" and path[1] in RESULT_KEYS
+
+
+def is_report_member(path):
+    return path in (("summary",), ("check_type",))
+
+
+class ReportIndex:
+    """The SQLite database, with in-memory maps of the IDs of interned values"""
+
+    def __init__(self, db_path):
+        self.db = sqlite3.connect(str(db_path))
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(SCHEMA)
+        self._strings = {}
+        self._checks = {}
+        self._resources = {}
+
+    def close(self):
+        self.db.close()
+
+    def intern(self, value):
+        """ID of a string in the strings table; None for empty values"""
+        if value is None or value == "" or value == []:
+            return None
+        if not isinstance(value, str):
+            value = "\n".join(map(str, value)) if isinstance(value, list) else str(value)
+        string_id = self._strings.get(value)
+        if string_id is None:
+            self.db.execute("INSERT OR IGNORE INTO strings (value) VALUES (?)", (value,))
+            string_id = self._strings[value] = self.db.execute(
+                "SELECT id FROM strings WHERE value = ?", (value,)).fetchone()[0]
+        return string_id
+
+    def check(self, finding):
+        check_id = finding.get("check_id") or "Unknown"
+        row_id = self._checks.get(check_id)
+        if row_id is None:
+            self.db.execute(
+                "INSERT OR IGNORE INTO checks (check_id, bc_check_id, name_id, guideline_id) VALUES (?, ?, ?, ?)",
+                (check_id, finding.get("bc_check_id"), self.intern(finding.get("check_name")),
+                 self.intern(finding.get("guideline"))))
+            row_id = self._checks[check_id] = self.db.execute(
+                "SELECT id FROM checks WHERE check_id = ?", (check_id,)).fetchone()[0]
+        return row_id
+
+    def resource(self, finding):
+        key = (finding.get("resource") or "Unknown", self.intern(finding.get("file_path") or "Unknown"))
+        row_id = self._resources.get(key)
+        if row_id is None:
+            self.db.execute("INSERT OR IGNORE INTO resources (address, file_id) VALUES (?, ?)", key)
+            row_id = self._resources[key] = self.db.execute(
+                "SELECT id FROM resources WHERE address = ? AND file_id = ?", key).fetchone()[0]
+        return row_id
+
+    def finding_row(self, run_id, result, finding):
+        line_range = finding.get("file_line_range") or [None, None]
+        comment = (finding.get("check_result") or {}).get("suppress_comment") or finding.get("suppress_comment")
+        return (run_id, self.check(finding), self.resource(finding), result, finding.get("severity"),
+                line_range[0], line_range[-1], self.intern(comment), self.intern(finding.get("details")))
+
+    def ingest(self, report_file, chunk_size=CHUNK_SIZE):
+        """
+        Add a report as a run and return its run ID, or None when the same
+        content is already indexed under that path
+        """
+        report_path = str(Path(report_file).resolve())
+        content_hash = file_digest(report_file)
+        existing = self.db.execute("SELECT id, content_hash FROM runs WHERE report_path = ?",
+                                   (report_path,)).fetchone()
+        if existing and existing[1] == content_hash:
+            return None
+        name, scope, scanned_at = run_identity(report_file)
+        with self.db:
+            if existing:
+                self.db.execute("DELETE FROM runs WHERE id = ?", (existing[0],))
+            run_id = self.db.execute(
+                "INSERT INTO runs (report_path, name, scope, scanned_at, content_hash, ingested_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (report_path, name, scope, scanned_at, content_hash, time.strftime("%Y-%m-%dT%H:%M:%S"))).lastrowid
+            summary = dict.fromkeys(SUMMARY_FIELDS, 0)
+            check_types, versions, batch = [], set(), []
+            with open_report(report_file) as report:
+                for path, value in report.iter_values(is_result_list, is_report_member, chunk_size):
+                    if path == ("check_type",):
+                        check_types.append(str(value))
+                    elif path == ("summary",):
+                        if isinstance(value, dict):
+                            for field in SUMMARY_FIELDS:
+                                summary[field] += value.get(field) or 0
+                            if value.get("checkov_version"):
+                                versions.add(value["checkov_version"])
+                    elif isinstance(value, dict):
+                        batch.append(self.finding_row(run_id, RESULT_KEYS[path[1]], value))
+                        if len(batch) >= INSERT_BATCH:
+                            self._insert_findings(batch)
+                            batch = []
+            self._insert_findings(batch)
+            self.db.execute(
+                "UPDATE runs SET check_types = ?, checkov_version = ?, passed = ?, failed = ?, skipped = ?, "
+                "parsing_errors = ?, resource_count = ? WHERE id = ?",
+                (",".join(dict.fromkeys(check_types)) or None, ",".join(sorted(versions)) or None,
+                 *(summary[field] for field in SUMMARY_FIELDS), run_id))
+        return run_id
+
+    def _insert_findings(self, rows):
+        if rows:
+            self.db.executemany(
+                "INSERT INTO findings (run_id, check_id, resource_id, result, severity, line_start, line_end, "
+                "comment_id, details_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def first_failures(self, check_id, resource=None, scope=None):
+        """
+        Per resource, the first run in which the check failed, the last such
+        run and the number of failing runs, earliest first
+        """
+        query = """
+            SELECT resources.address, file.value, MIN(runs.scanned_at), MAX(runs.scanned_at), COUNT(*)
+            FROM findings
+            JOIN checks ON checks.id = findings.check_id
+            JOIN runs ON runs.id = findings.run_id
+            JOIN resources ON resources.id = findings.resource_id
+            JOIN strings AS file ON file.id = resources.file_id
+            WHERE checks.check_id = ? AND findings.result = 'FAILED'
+        """
+        parameters = [check_id]
+        if resource:
+            query += " AND resources.address = ?"
+            parameters.append(resource)
+        if scope:
+            query += " AND runs.scope = ?"
+            parameters.append(scope)
+        query += " GROUP BY resources.id ORDER BY MIN(runs.scanned_at), resources.address"
+        return [{"resource": address, "file_path": file_path, "first_failed": first, "last_failed": last,
+                 "failed_runs": runs}
+                for address, file_path, first, last, runs in self.db.execute(query, parameters)]
+
+    def trend(self, scope=None, limit=None):
+        """
+        Per run, oldest first: its summary and, against the previous run of the
+        same scope, the (check, resource) pairs that started or stopped failing
+        """
+        query = ("SELECT id, name, scope, scanned_at, passed, failed, skipped, parsing_errors, resource_count "
+                 "FROM runs")
+        parameters = []
+        if scope:
+            query += " WHERE scope = ?"
+            parameters.append(scope)
+        query += " ORDER BY scanned_at, id"
+        runs = self.db.execute(query, parameters).fetchall()
+        previous_failures = {}
+        trend = []
+        for run_id, name, run_scope, scanned_at, passed, failed, skipped, parsing_errors, resource_count in runs:
+            failures = set(self.db.execute(
+                "SELECT check_id, resource_id FROM findings WHERE run_id = ? AND result = 'FAILED'", (run_id,)))
+            before = previous_failures.get(run_scope)
+            trend.append({
+                "run": name, "scope": run_scope, "scanned_at": scanned_at, "passed": passed, "failed": failed,
+                "skipped": skipped, "parsing_errors": parsing_errors, "resource_count": resource_count,
+                "new_failures": len(failures - before) if before is not None else None,
+                "fixed": len(before - failures) if before is not None else None,
+            })
+            previous_failures[run_scope] = failures
+        return trend[-limit:] if limit else trend
+
+
+def print_table(headers, rows):
+    widths = [max([len(str(header))] + [len(str(row[index])) for row in rows]) for index, header in enumerate(headers)]
+    print("  ".join(str(header).ljust(width) for header, width in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(value).ljust(width) for value, width in zip(row, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index Checkov JSON reports in SQLite and query their history")
+    parser.add_argument("--db", default=str(DEFAULT_DB), help=f"SQLite database (default: {DEFAULT_DB})")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    ingest = subcommands.add_parser("ingest", help="Add new or changed reports to the index")
+    ingest.add_argument("paths", nargs="*", default=[str(REPORTS_DIR)],
+                        help="Report files or directories (default: security/reports)")
+    first = subcommands.add_parser("first-failure", help="When a check first failed, per resource")
+    first.add_argument("check_id")
+    first.add_argument("--resource", help="Only this resource address")
+    first.add_argument("--scope", help="Only runs of this scope (e.g. all-all)")
+    trend = subcommands.add_parser("trend", help="Per-run summary with new and fixed failures")
+    trend.add_argument("--scope", help="Only runs of this scope (e.g. all-all)")
+    trend.add_argument("--limit", type=int, help="Only the most recent runs")
+    args = parser.parse_args()
+
+    index = ReportIndex(args.db)
+    try:
+        if args.command == "ingest":
+            results = []
+            for report_file in report_files(args.paths):
+                start = time.perf_counter()
+                try:
+                    run_id = index.ingest(report_file)
+                except (OSError, ValueError) as error:
+                    print(f"❌ {report_file}: {error}", file=sys.stderr)
+                    results.append({"report": str(report_file), "status": "error"})
+                    continue
+                results.append({"report": str(report_file), "status": "unchanged" if run_id is None else "ingested",
+                                "seconds": round(time.perf_counter() - start, 3)})
+            if args.format == "json":
+                print(json.dumps(results, indent=2))
+            else:
+                for result in results:
+                    print(f"{result['status']:<10} {result['report']}")
+            return 1 if any(result["status"] == "error" for result in results) else 0
+
+        if args.command == "first-failure":
+            failures = index.first_failures(args.check_id, args.resource, args.scope)
+            if args.format == "json":
+                print(json.dumps(failures, indent=2))
+            elif not failures:
+                print(f"{args.check_id} never failed in the indexed runs")
+            else:
+                print(f"{args.check_id} first failed at {failures[0]['first_failed']}\n")
+                print_table(["Resource", "File", "First failed", "Last failed", "Failed runs"],
+                            [[failure["resource"], failure["file_path"], failure["first_failed"],
+                              failure["last_failed"], failure["failed_runs"]] for failure in failures])
+            return 0
+
+        runs = index.trend(args.scope, args.limit)
+        if args.format == "json":
+            print(json.dumps(runs, indent=2))
+        else:
+            print_table(["Scanned at", "Run", "Passed", "Failed", "Skipped", "New failures", "Fixed"],
+                        [[run["scanned_at"], run["run"], run["passed"], run["failed"], run["skipped"],
+                          "-" if run["new_failures"] is None else run["new_failures"],
+                          "-" if run["fixed"] is None else run["fixed"]] for run in runs])
+        return 0
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
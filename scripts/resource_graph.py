@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Resource Reference Graph
+Builds the references between resources once - from the resolved Atmos stacks
+(`!terraform.output` values) or from a `terraform show -json` plan (attribute
+values that hold another resource's ID or name) - and evaluates the checks
+that span resources over it:
+
+- a private endpoint's subnet allows network policies for private endpoints
+- a function app, its service plan and its storage account share a region
+- references point at resources that exist (and are enabled)
+
+Nodes are stored by address and by cloud ID, so every lookup is a dict access
+and the checks run in a single O(V + E) pass over the whole stack.
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from atmos_stacks import ATMOS_DIR, StackRepository, TerraformOutput
+from plan_json_stream import iter_planned_resources, open_plan
+
+MODULES_DIR = ATMOS_DIR / "components" / "terraform" / "modules"
+RESOURCE_DECLARATION = re.compile(r'^\s*resource\s+"([^"]+)"\s+"this"', re.MULTILINE)
+
+# Plan attributes that reference another resource by name rather than by ID
+NAME_REFERENCES = {
+    "storage_account_name": "azurerm_storage_account",
+    "resource_group_name": "azurerm_resource_group",
+    "virtual_network_name": "azurerm_virtual_network",
+}
+
+PRIVATE_ENDPOINT_TYPES = ("azurerm_private_endpoint",)
+SUBNET_TYPES = ("azurerm_subnet",)
+FUNCTION_APP_TYPES = ("azurerm_linux_function_app", "azurerm_windows_function_app")
+
+# Values of private_endpoint_network_policies that keep NSGs and/or route tables
+# applied to private endpoints in the subnet
+PRIVATE_ENDPOINT_NETWORK_POLICIES = ("Enabled", "NetworkSecurityGroupEnabled", "RouteTableEnabled")
+
+
+class Node:
+    """A resource (plan) or component instance (stacks) with its attribute values"""
+
+    __slots__ = ("address", "types", "attributes")
+
+    def __init__(self, address, types, attributes):
+        self.address = address
+        self.types = tuple(types)
+        self.attributes = attributes
+
+    def is_a(self, types):
+        return any(resource_type in types for resource_type in self.types)
+
+
+class ResourceGraph:
+    """Directed reference graph: an edge (src, attribute, dst) for each reference"""
+
+    def __init__(self):
+        self.nodes = {}
+        self.by_id = {}
+        self.out_edges = defaultdict(dict)   # address -> {attribute: [target address]}
+        self.in_edges = defaultdict(list)    # address -> [(source address, attribute)]
+        self.dangling = []                   # (source address, attribute, missing target)
+
+    def add_node(self, node, resource_id=None):
+        self.nodes[node.address] = node
+        if isinstance(resource_id, str) and resource_id:
+            self.by_id[resource_id] = node
+
+    def add_edge(self, source, attribute, target):
+        self.out_edges[source].setdefault(attribute, []).append(target)
+        self.in_edges[target].append((source, attribute))
+
+    def get(self, key):
+        """Node by address or by cloud resource ID"""
+        return self.nodes.get(key) or self.by_id.get(key)
+
+    def targets(self, address, attribute):
+        """Nodes referenced by an attribute of a node"""
+        return [self.nodes[target] for target in self.out_edges.get(address, {}).get(attribute, ())]
+
+    def edge_count(self):
+        return sum(len(targets) for attributes in self.out_edges.values() for targets in attributes.values())
+
+    @classmethod
+    def from_stacks(cls, stacks, modules_dir=MODULES_DIR):
+        """Nodes are "stack/component"; edges come from `!terraform.output` vars"""
+        graph = cls()
+        modules = ModuleCatalog(modules_dir)
+        pending = []
+        for stack in stacks:
+            for name, base, section in stack.components():
+                variables = section.get("vars") or {}
+                if variables.get("enabled", True) is False:
+                    continue
+                address = f"{stack.name}/{name}"
+                attributes = dict(modules.defaults(base))
+                attributes.update(variables)
+                graph.add_node(Node(address, modules.resource_types(base), attributes))
+                for attribute, ref in iter_references(variables):
+                    pending.append((address, attribute, f"{ref.stack or stack.name}/{ref.component}"))
+        graph._link(pending)
+        return graph
+
+    @classmethod
+    def from_plan(cls, stream):
+        """Nodes are plan addresses; edges are attribute values equal to a known ID or name"""
+        graph = cls()
+        names = {}
+        resources = []
+        for resource in iter_planned_resources(stream):
+            values = resource.get("values") or {}
+            graph.add_node(Node(resource["address"], [resource.get("type")], values), values.get("id"))
+            if isinstance(values.get("name"), str):
+                names[(resource.get("type"), values["name"])] = resource["address"]
+            resources.append((resource["address"], values))
+
+        pending = []
+        for address, values in resources:
+            for attribute, value in values.items():
+                if attribute == "id" or not isinstance(value, str):
+                    continue
+                target = graph.by_id.get(value)
+                if target is not None:
+                    pending.append((address, attribute, target.address))
+                elif (NAME_REFERENCES.get(attribute), value) in names:
+                    pending.append((address, attribute, names[(NAME_REFERENCES[attribute], value)]))
+        graph._link(pending)
+        return graph
+
+    def _link(self, pending):
+        for source, attribute, target in pending:
+            if target in self.nodes:
+                self.add_edge(source, attribute, target)
+            else:
+                self.dangling.append((source, attribute, target))
+
+    def check(self, checks=None):
+        """Run every graph check against every node it applies to: O(V + E)"""
+        checks = GRAPH_CHECKS if checks is None else checks
+        findings = [{"check_id": "CKV_OP_AZURE_GRAPH_0", "resource": source, "attribute": attribute,
+                     "message": f"References {target}, which is not deployed"}
+                    for source, attribute, target in self.dangling]
+        for node in self.nodes.values():
+            for check in checks:
+                if node.is_a(check.resource_types):
+                    for attribute, message in check.evaluate(self, node):
+                        findings.append({"check_id": check.id, "resource": node.address,
+                                         "attribute": attribute, "message": message})
+        return findings
+
+
+class ModuleCatalog:
+    """Resource types and variable defaults of the Terraform modules, read once per module"""
+
+    def __init__(self, modules_dir=MODULES_DIR):
+        self.modules_dir = Path(modules_dir)
+        self._types = {}
+        self._defaults = {}
+
+    def resource_types(self, module):
+        if module not in self._types:
+            main_tf = self.modules_dir / module / "main.tf"
+            self._types[module] = RESOURCE_DECLARATION.findall(main_tf.read_text()) if main_tf.exists() else []
+        return self._types[module]
+
+    def defaults(self, module):
+        if module not in self._defaults:
+            self._defaults[module] = variable_defaults(self.modules_dir / module / "variables.tf")
+        return self._defaults[module]
+
+
+def variable_defaults(path):
+    """{variable: default} of a variables.tf file (empty if missing or unparsable)"""
+    try:
+        import hcl2
+        with open(path, "r") as f:
+            document = hcl2.load(f)
+    except Exception:
+        return {}
+    defaults = {}
+    for block in document.get("variable", []):
+        for name, body in block.items():
+            if "default" not in body:
+                continue
+            # bc-python-hcl2 (Checkov's parser) wraps every attribute value in a list
+            wrapped = isinstance(body.get("type", body.get("description")), list)
+            defaults[name] = body["default"][0] if wrapped else body["default"]
+    return defaults
+
+
+def iter_references(value, attribute=None):
+    """(top-level attribute, TerraformOutput) for every reference nested in a vars value"""
+    if isinstance(value, TerraformOutput):
+        yield attribute, value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from iter_references(item, key if attribute is None else attribute)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_references(item, attribute)
+
+
+def normalize_location(value):
+    """'East US' -> 'eastus'; None for values that are not literal locations"""
+    if not isinstance(value, str) or not value or "${" in value:
+        return None
+    return value.replace(" ", "").lower()
+
+
+class GraphCheck:
+    """
+    A check on a node and the nodes it references. evaluate(graph, node)
+    yields (attribute, message) for each violation.
+    """
+
+    def __init__(self, id, name, resource_types, evaluate):
+        self.id = id
+        self.name = name
+        self.resource_types = resource_types
+        self.evaluate = evaluate
+
+
+def subnet_allows_private_endpoint_policies(graph, node):
+    for subnet in graph.targets(node.address, "subnet_id"):
+        if not subnet.is_a(SUBNET_TYPES):
+            continue
+        value = subnet.attributes.get("private_endpoint_network_policies")
+        if isinstance(value, str) and value not in PRIVATE_ENDPOINT_NETWORK_POLICIES:
+            yield "subnet_id", (f"Subnet {subnet.address} has private_endpoint_network_policies = {value!r}; "
+                                f"expected one of {', '.join(PRIVATE_ENDPOINT_NETWORK_POLICIES)}")
+
+
+def co_located(*attributes):
+    """The node and the nodes referenced by the given attributes are in the same region"""
+    def evaluate(graph, node):
+        location = normalize_location(node.attributes.get("location"))
+        if location is None:
+            return
+        for attribute in attributes:
+            for target in graph.targets(node.address, attribute):
+                other = normalize_location(target.attributes.get("location"))
+                if other and other != location:
+                    yield attribute, f"Points at {target.address} in {other}, but the resource is in {location}"
+    return evaluate
+
+
+GRAPH_CHECKS = [
+    GraphCheck("CKV_OP_AZURE_GRAPH_1", "AzurePrivateEndpointSubnetAllowsNetworkPolicies",
+               PRIVATE_ENDPOINT_TYPES, subnet_allows_private_endpoint_policies),
+    GraphCheck("CKV_OP_AZURE_GRAPH_2", "AzureFunctionAppColocatedWithDependencies",
+               FUNCTION_APP_TYPES, co_located("service_plan_id", "storage_account_name")),
+]
+
+
+def render_text(graph, findings):
+    lines = [f"Graph: {len(graph.nodes)} resources, {graph.edge_count()} references"]
+    for finding in findings:
+        lines.append(f"❌ {finding['check_id']} {finding['resource']} ({finding['attribute']}): "
+                     f"{finding['message']}")
+    if not findings:
+        lines.append("✅ No cross-resource violations")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate cross-resource checks over the resource reference graph")
+    parser.add_argument("--atmos-dir", default=str(ATMOS_DIR), help="Directory containing atmos.yaml")
+    parser.add_argument("--plan", help="Build the graph from a `terraform show -json` plan ('-' for stdin) "
+                                       "instead of the Atmos stacks")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args()
+
+    if args.plan:
+        with open_plan(args.plan) as stream:
+            graph = ResourceGraph.from_plan(stream)
+    else:
+        atmos_dir = Path(args.atmos_dir)
+        stacks = StackRepository(atmos_dir).load_all()
+        graph = ResourceGraph.from_stacks(stacks, atmos_dir / "components" / "terraform" / "modules")
+    findings = graph.check()
+
+    if args.format == "json":
+        print(json.dumps({"resources": len(graph.nodes), "references": graph.edge_count(),
+                          "findings": findings}, indent=2))
+    else:
+        print(render_text(graph, findings))
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
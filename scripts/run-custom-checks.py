@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Fast runner for the One Platform custom Checkov checks
+Parses Terraform files directly and evaluates only the CKV_OP_* policies,
+without Checkov's startup or built-in checks (pre-commit / inner loop use).
+With --plan, evaluates the resolved values of a plan JSON instead.
+With --changed-from, only the resources a plan creates, updates or replaces
+are checked (see changed_scope.py).
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import hcl2
+
+from changed_scope import files_declaring, load_changed_resources, resource_key
+from plan_json_stream import iter_planned_resources, open_plan, to_conf as plan_conf
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+POLICIES_DIR = REPO_ROOT / "security" / "checkov-policies"
+DEFAULT_MODULES_DIR = REPO_ROOT / "atmos" / "components" / "terraform" / "modules"
+
+RESOURCE_BLOCK = re.compile(r'^\s*resource\s+"', re.MULTILINE)
+VARIABLE_BLOCK = re.compile(r'^\s*variable\s+"', re.MULTILINE)
+VARIABLE_REFERENCE = re.compile(r"^var\.([A-Za-z_][\w-]*)$")
+
+# Checks of the current process, loaded before the worker pool forks
+_checks_by_type = None
+
+
+def prepare_policies(timing=False, cache_path=None):
+    """
+    Set up standalone checks (no Checkov check registry) before any policy module is imported.
+
+    With timing, the checks record per-check latency (see instrumentation.py).
+    With cache_path, verdicts are memoized there by conf fingerprint (see result_cache.py).
+    """
+    if str(POLICIES_DIR) in sys.path:
+        return
+    sys.path.insert(0, str(POLICIES_DIR))
+    if timing:
+        import instrumentation
+        instrumentation.enable()
+    if cache_path:
+        import result_cache
+        result_cache.enable(cache_path)
+    import rule_engine
+    rule_engine.use_standalone_checks()
+
+
+def load_policies(resource_types=None):
+    """
+    {resource_type: [check, ...]}, importing only the policy modules for
+    resource_types when given (see policy_index.py)
+    """
+    global _checks_by_type
+    if _checks_by_type is None:
+        prepare_policies()
+        from parallel_evaluator import load_checks
+        _checks_by_type = load_checks(str(POLICIES_DIR), resource_types)
+    return _checks_by_type
+
+
+def strip_interpolation(value):
+    """'${var.location}' -> 'var.location', as Checkov presents expressions"""
+    if value.startswith("${") and value.endswith("}"):
+        return value[2:-1]
+    return value
+
+
+def to_conf(value, defaults=None):
+    """
+    Convert python-hcl2 output to the shape Checkov hands to scan_resource_conf.
+
+    Plain ``var.name`` expressions are replaced by the variable's default when
+    ``defaults`` has one, like Checkov's evaluate-variables.
+    """
+    if isinstance(value, str):
+        expression = strip_interpolation(value)
+        if defaults:
+            match = VARIABLE_REFERENCE.match(expression)
+            if match and match.group(1) in defaults:
+                return defaults[match.group(1)]
+        return expression
+    if isinstance(value, list):
+        return [to_conf(item, defaults) for item in value]
+    if isinstance(value, dict):
+        conf = {}
+        for key, item in value.items():
+            if key == "dynamic":
+                # dynamic "name" { content { ... } } -> [{"name": [content]}], and the
+                # rendered block itself, as Checkov shows it
+                conf[key] = [{name: to_conf(block.get("content", []), defaults) for name, block in entry.items()}
+                             for entry in item if isinstance(entry, dict)]
+                for entry in conf[key]:
+                    for name, content in entry.items():
+                        conf.setdefault(name, content)
+            else:
+                conf[key] = to_conf(item, defaults)
+        return conf
+    return value
+
+
+_module_defaults = {}
+
+
+def variable_defaults(module_dir):
+    """{name: default} for the variables of a module that have a non-null default"""
+    module_dir = Path(module_dir)
+    if module_dir not in _module_defaults:
+        defaults = {}
+        for path in sorted(module_dir.glob("*.tf")):
+            text = path.read_text()
+            if not VARIABLE_BLOCK.search(text):
+                continue
+            try:
+                document = hcl2.loads(text)
+            except Exception:
+                continue
+            for block in document.get("variable", []):
+                for name, variable in block.items():
+                    default = variable.get("default")
+                    if isinstance(default, list) and default and default[0] is not None:
+                        defaults[name] = default[0]
+        _module_defaults[module_dir] = defaults
+    return _module_defaults[module_dir]
+
+
+def find_tf_files(paths):
+    """Terraform files under the given paths that declare resources"""
+    files = []
+    for path in paths:
+        path = Path(path)
+        candidates = [path] if path.is_file() else sorted(path.rglob("*.tf"))
+        for candidate in candidates:
+            if ".terraform" in candidate.parts:
+                continue
+            files.append(candidate)
+    return files
+
+
+def scan_file(path, root, evaluate_variables=True, only=None):
+    """
+    Evaluate every applicable custom check for the resources of one .tf file
+    (only those whose "type.name" is in ``only``, when given)
+    """
+    with open(path, "r") as f:
+        text = f.read()
+    # Most files (variables, outputs, providers) hold no resources: skip parsing them
+    if not RESOURCE_BLOCK.search(text):
+        return []
+    try:
+        document = hcl2.loads(text)
+    except Exception as error:
+        return [{"file_path": display_path(path, root), "parsing_error": str(error)}]
+
+    checks_by_type = load_policies()
+    defaults = variable_defaults(Path(path).parent) if evaluate_variables else None
+    file_path = display_path(path, root)
+    records = []
+    for block in document.get("resource", []):
+        for resource_type, resources in block.items():
+            checks = checks_by_type.get(resource_type)
+            if not checks:
+                continue
+            for name, raw_conf in resources.items():
+                if only is not None and f"{resource_type}.{name}" not in only:
+                    continue
+                conf = to_conf(raw_conf, defaults)
+                line_range = [conf.get("__start_line__"), conf.get("__end_line__")]
+                for check in checks:
+                    result, details = check.evaluate(conf)
+                    records.append(make_record(check, result, details, f"{resource_type}.{name}",
+                                               file_path, line_range))
+    return records
+
+
+def make_record(check, result, details, resource, file_path, line_range):
+    """One check result in Checkov's JSON report shape"""
+    return {
+        "check_id": check.id,
+        "check_name": check.name,
+        "check_result": {"result": result.name},
+        "resource": resource,
+        "file_path": file_path,
+        "file_line_range": line_range,
+        "details": [details] if details else [],
+    }
+
+
+def iter_plan_records(plan_path, only=None):
+    """
+    Evaluate the checks against the planned values of a `terraform show -json` plan.
+
+    Resources are streamed one at a time. Rules that inspect Terraform
+    expressions (label module references, count = var.enabled, ...) are
+    skipped: plan values are already resolved. With ``only``, resources
+    whose "type.name" is not in it are skipped.
+    """
+    prepare_policies()
+    from parallel_evaluator import LazyChecks
+    # Resource types are only known as the plan streams by: import policy modules on demand
+    lazy_checks = LazyChecks(str(POLICIES_DIR))
+    checks_by_type = {}
+    with open_plan(plan_path) as stream:
+        for resource in iter_planned_resources(stream):
+            resource_type = resource.get("type")
+            if only is not None and resource_key(resource.get("address", "")) not in only:
+                continue
+            checks = checks_by_type.get(resource_type)
+            if checks is None:
+                checks = checks_by_type[resource_type] = [
+                    check for check in lazy_checks[resource_type] if not check.source_only]
+            if not checks:
+                continue
+            conf = plan_conf(resource.get("values"))
+            for check in checks:
+                result, details = check.evaluate(conf)
+                yield make_record(check, result, details, resource.get("address"), plan_path, [0, 0])
+
+
+def display_path(path, root):
+    """Paths are shown relative to the scan root with a leading slash, like Checkov"""
+    try:
+        return "/" + Path(path).resolve().relative_to(Path(root).resolve()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _scan_file_task(args):
+    return scan_file(*args)
+
+
+def run(paths, workers=None, evaluate_variables=True, only=None):
+    """
+    Scan .tf files, one task per file, and return (records, parsing_errors).
+
+    With ``only`` (a set of "type.name"), files that declare none of those
+    resources are not parsed and other resources are skipped.
+    """
+    root = paths[0] if len(paths) == 1 and Path(paths[0]).is_dir() else os.getcwd()
+    # Only the policy modules for resource types that appear in the files are imported
+    prepare_policies()
+    if only is not None:
+        files = sorted(files_declaring(only, paths))
+        load_policies({address.split(".", 1)[0] for address in only})
+    else:
+        files = find_tf_files(paths)
+        from policy_index import resource_types_in
+        load_policies(resource_types_in([str(path) for path in files]))
+    tasks = [(path, root, evaluate_variables, only) for path in files]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        # Policies and the HCL parser are loaded before the pool starts, so forked workers inherit them
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            per_file = list(pool.map(_scan_file_task, tasks))
+    else:
+        per_file = [scan_file(*task) for task in tasks]
+
+    records, errors = [], []
+    for file_records in per_file:
+        for record in file_records:
+            (errors if "parsing_error" in record else records).append(record)
+    return records, errors
+
+
+def render_record(record):
+    start, end = record["file_line_range"]
+    lines = [
+        f"Check: {record['check_id']}: \"{record['check_name']}\"",
+        f"\t{record['check_result']['result']} for resource: {record['resource']}",
+        f"\tFile: {record['file_path']}:{start}-{end}",
+    ]
+    lines.extend(f"\tDetails: {detail}" for detail in record["details"])
+    lines.append("")
+    return "\n".join(lines)
+
+
+def summary_line(passed, failed, errors):
+    return f"Passed checks: {passed}, Failed checks: {failed}, Parsing errors: {errors}"
+
+
+def policy_timing():
+    """Per-check timing summary when the checks were loaded with timing, else None"""
+    from instrumentation import recorder
+    timings = recorder()
+    return timings.summary() if timings is not None else None
+
+
+def policy_cache():
+    """Result cache statistics when the checks were loaded with a cache, else None"""
+    from result_cache import result_cache
+    cache = result_cache()
+    return cache.stats() if cache is not None else None
+
+
+def report(records, errors, output_format, quiet=False):
+    """
+    Print the results and return the number of failed checks.
+
+    Text output is written as records arrive, so plan scans stream.
+    """
+    if output_format == "json":
+        records = list(records)
+        passed = [record for record in records if record["check_result"]["result"] == "PASSED"]
+        failed = [record for record in records if record["check_result"]["result"] == "FAILED"]
+        document = {
+            "check_type": "terraform",
+            "results": {
+                "passed_checks": passed,
+                "failed_checks": failed,
+                "parsing_errors": [error["file_path"] for error in errors],
+            },
+            "summary": {"passed": len(passed), "failed": len(failed), "parsing_errors": len(errors)},
+        }
+        timing = policy_timing()
+        if timing is not None:
+            document["policy_timing"] = timing
+        cache = policy_cache()
+        if cache is not None:
+            document["policy_cache"] = cache
+        print(json.dumps(document, indent=2))
+        return len(failed)
+
+    passed = failed = 0
+    for record in records:
+        if record["check_result"]["result"] == "PASSED":
+            passed += 1
+            if quiet:
+                continue
+        else:
+            failed += 1
+        print(render_record(record))
+    for error in errors:
+        print(f"Parsing error: {error['file_path']}: {error['parsing_error']}")
+    print(summary_line(passed, failed, len(errors)))
+    timing = policy_timing()
+    if timing:
+        print("\nCheck timing (total ms, p95 ms, invocations):")
+        for check_id, stats in sorted(timing.items(), key=lambda item: -item[1]["total_ms"]):
+            print(f"\t{check_id}: {stats['total_ms']:.3f}, {stats['p95_ms']:.4f}, {stats['invocations']}")
+    cache = policy_cache()
+    if cache is not None:
+        print(f"Result cache: {cache['hits']} hits, {cache['misses']} misses, {cache['entries']} entries")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the One Platform custom checks without Checkov")
+    parser.add_argument("paths", nargs="*", default=[str(DEFAULT_MODULES_DIR)],
+                        help="Directories or .tf files to scan (default: atmos/components/terraform/modules)")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--quiet", action="store_true", help="Only show failed checks")
+    parser.add_argument("--no-evaluate-variables", action="store_true",
+                        help="Keep var.* references instead of substituting variable defaults")
+    parser.add_argument("--plan", metavar="PLAN_JSON",
+                        help="Check the planned values of a `terraform show -json` file ('-' for stdin) "
+                             "instead of .tf files")
+    parser.add_argument("--changed-from", metavar="PLAN_OUTPUT",
+                        help="Only check resources that this `terraform plan` text output creates, updates or "
+                             "replaces ('-' for stdin)")
+    parser.add_argument("--timing", action="store_true",
+                        help="Record per-check invocations and latency (implies --workers 1)")
+    parser.add_argument("--result-cache", metavar="PATH",
+                        help="Memoize verdicts by conf fingerprint in this file across runs (implies --workers 1)")
+    parser.add_argument("--soft-fail", action="store_true", help="Exit 0 even when checks fail")
+    args = parser.parse_args()
+
+    prepare_policies(timing=args.timing, cache_path=args.result_cache)
+    if args.timing or args.result_cache:
+        # Timings are collected, and new cache entries written, in-process
+        args.workers = 1
+    only = load_changed_resources(args.changed_from) if args.changed_from else None
+    if args.plan:
+        records, errors = iter_plan_records(args.plan, only=only), []
+    else:
+        records, errors = run(args.paths, workers=args.workers, evaluate_variables=not args.no_evaluate_variables,
+                              only=only)
+    failed = report(records, errors, args.format, quiet=args.quiet)
+
+    if args.soft_fail:
+        return 0
+    return 1 if failed or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
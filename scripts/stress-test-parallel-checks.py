@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Stress test for parallel evaluation of the custom Checkov checks
+Runs every CKV_OP_* check serially, through the thread and process pools and
+through the batch API over many randomised resource confs and fails if any
+verdict differs, or if confs (or batches) edited in place between two
+evaluations get the verdicts of their old values
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+POLICIES_DIR = Path(__file__).resolve().parent.parent / "security" / "checkov-policies"
+
+# Attribute values covering passing, failing and variable-reference cases
+VARIANTS = {
+    "name": [["module.label.id"], ["coalesce(var.nsg_name, module.label.id)"], ["Bad Name!"], ["var.name"]],
+    "tags": [["module.label.tags"], [{"environment": "dev", "namespace": "lazylabs", "name": "x"}],
+             [{"environment": "dev"}], ["var.tags"]],
+    "count": [["var.enabled ? 1 : 0"], [1]],
+    "resource_group_name": [["var.resource_group_name"], ["azurerm_resource_group.this.name"], ["literal-rg"]],
+    "location": [["var.location"], ["West Europe"], ["eastus"], ["Mars"]],
+    "address_space": [[["10.0.0.0/16"]], [["8.8.8.0/24"]], [["10.0.0.0/28"]], [["var.address_space"]]],
+    "address_prefixes": [[["10.0.1.0/24"]], [["8.8.8.0/24"]], [["var.address_prefixes"]]],
+    "enable_https_traffic_only": [[True], [False]],
+    "min_tls_version": [["TLS1_2"], ["TLS1_0"]],
+    "public_network_access_enabled": [[False], [True]],
+    "network_rules": [[], [{"default_action": ["Deny"]}]],
+    "soft_delete_retention_days": [[7], [3], ["var.days"]],
+    "purge_protection_enabled": [[True], [False]],
+    "network_acls": [[], [{"default_action": ["Deny"]}]],
+    "access_policy": [[], [{"tenant_id": ["x"]}]],
+    "sku_name": [["standard"], ["premium"], ["P1v3"], ["Y1"], ["var.sku"]],
+    "os_type": [["Linux"], ["Windows"], ["var.os"]],
+    "https_only": [[True], [False]],
+    "site_config": [[], [{"minimum_tls_version": ["1.2"], "application_stack": [{"python_version": ["3.11"]}]}]],
+    "storage_account_name": [["var.storage_account_name"], [""]],
+    "service_plan_id": [["var.service_plan_id"], ["bogus"]],
+    "subnet_id": [["var.subnet_id"], ["hard"]],
+    "private_service_connection": [[], [{"name": ["x"], "private_connection_resource_id": ["var.id"],
+                                         "is_manual_connection": [False]}]],
+    "virtual_network_name": [["var.virtual_network_name"], ["hard"]],
+}
+
+
+def build_security_rules(rng, count):
+    """Security rules with overlapping ports and sources so NSG analysis has work to do"""
+    sources = ["*", "Internet", "VirtualNetwork", "10.0.0.0/8", "10.1.0.0/16", "192.168.0.0/16"]
+    rules = []
+    for i in range(count):
+        rules.append({
+            "name": [f"rule-{i}"],
+            "priority": [100 + i],
+            "direction": [rng.choice(["Inbound", "Outbound"])],
+            "access": [rng.choice(["Allow", "Deny"])],
+            "protocol": [rng.choice(["Tcp", "Udp", "*"])],
+            "source_port_range": ["*"],
+            "destination_port_range": [rng.choice(["*", "22", "443", "8000-8100", str(rng.randint(1, 2000))])],
+            "source_address_prefix": [rng.choice(sources)],
+            "destination_address_prefix": ["*"],
+        })
+    return rules
+
+
+def build_resources(checks_by_type, count, seed):
+    """(resource_id, resource_type, conf) tuples; some conf objects are reused to exercise caching"""
+    rng = random.Random(seed)
+    resource_types = sorted(checks_by_type)
+    resources = []
+    for i in range(count):
+        if resources and rng.random() < 0.1:
+            _, resource_type, conf = rng.choice(resources)
+        else:
+            resource_type = rng.choice(resource_types)
+            conf = {key: rng.choice(values) for key, values in VARIANTS.items() if rng.random() < 0.6}
+            if resource_type == "azurerm_network_security_group" and rng.random() < 0.8:
+                conf["security_rule"] = build_security_rules(rng, rng.randint(1, 200))
+        resources.append((f"{resource_type}.r{i}", resource_type, conf))
+    return resources
+
+
+def check_in_place_edits(resources, checks_by_type, seed):
+    """
+    [(expected, actual)] for confs and batches that are edited in place between
+    two evaluations, as Checkov does with its conf dicts; expected verdicts come
+    from fresh copies of the edited values. Also returns how many edits changed
+    a verdict, so a run shows the edits mattered.
+    """
+    rng = random.Random(seed)
+    mismatches, changed = [], 0
+
+    def edit(conf):
+        key = rng.choice(sorted(VARIANTS))
+        conf[key] = rng.choice(VARIANTS[key])
+
+    for _, resource_type, conf in resources:
+        checks = checks_by_type.get(resource_type, ())
+        conf = copy.deepcopy(conf)
+        before = [check.evaluate(conf) for check in checks]
+        edit(conf)
+        after = [check.evaluate(conf) for check in checks]
+        fresh = copy.deepcopy(conf)
+        expected = [check.evaluate(fresh) for check in checks]
+        changed += before != expected
+        if after != expected:
+            mismatches.append((expected, after))
+
+    by_type = {}
+    for _, resource_type, conf in resources:
+        by_type.setdefault(resource_type, []).append(copy.deepcopy(conf))
+    for resource_type, confs in by_type.items():
+        checks = checks_by_type.get(resource_type, ())
+        before = [check.evaluate_batch(confs) for check in checks]
+        edit(confs[0])
+        confs.append(copy.deepcopy(rng.choice(confs)))
+        after = [check.evaluate_batch(confs) for check in checks]
+        fresh = copy.deepcopy(confs)
+        expected = [check.evaluate_batch(fresh) for check in checks]
+        changed += before != expected
+        if after != expected:
+            mismatches.append((expected, after))
+    return mismatches, changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that parallel and batch evaluation match serial evaluation")
+    parser.add_argument("--resources", type=int, default=5000, help="Resources per run (default: 5000)")
+    parser.add_argument("--rounds", type=int, default=5, help="Thread-pool rounds with different seeds (default: 5)")
+    parser.add_argument("--workers", type=int, default=16, help="Pool size (default: 16)")
+    parser.add_argument("--skip-processes", action="store_true", help="Only test the thread pool")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(POLICIES_DIR))
+    from parallel_evaluator import ParallelEvaluator, evaluate_batched, evaluate_serial, load_checks
+
+    # Switch threads as often as possible to surface races
+    sys.setswitchinterval(1e-6)
+
+    checks_by_type = load_checks(str(POLICIES_DIR))
+    failures = 0
+    for round_number in range(args.rounds):
+        resources = build_resources(checks_by_type, args.resources, seed=round_number)
+        start = time.perf_counter()
+        expected = evaluate_serial(resources, checks_by_type)
+        serial_time = time.perf_counter() - start
+
+        modes = ["batch", "thread"] + ([] if args.skip_processes or round_number else ["process"])
+        for mode in modes:
+            start = time.perf_counter()
+            if mode == "batch":
+                actual = evaluate_batched(resources, checks_by_type)
+            else:
+                evaluator = ParallelEvaluator(str(POLICIES_DIR), workers=args.workers, mode=mode, chunk_size=8)
+                actual = evaluator.evaluate(resources)
+            elapsed = time.perf_counter() - start
+            mismatches = [(e, a) for e, a in zip(expected, actual) if e != a]
+            if len(expected) != len(actual):
+                mismatches.append((f"{len(expected)} results", f"{len(actual)} results"))
+            status = "✅" if not mismatches else "❌"
+            print(f"{status} round {round_number} {mode}: {len(actual)} verdicts, "
+                  f"serial {serial_time:.2f}s, {mode} {elapsed:.2f}s, {len(mismatches)} mismatches")
+            for serial_result, other_result in mismatches[:5]:
+                print(f"   serial: {serial_result}\n   {mode}: {other_result}")
+            failures += len(mismatches)
+
+    resources = build_resources(checks_by_type, min(args.resources, 1000), seed=args.rounds)
+    mismatches, changed = check_in_place_edits(resources, checks_by_type, seed=args.rounds)
+    status = "✅" if not mismatches else "❌"
+    print(f"{status} in-place edits: {len(resources)} confs and their batches edited between evaluations "
+          f"({changed} edits changed verdicts), {len(mismatches)} stale results")
+    for expected, actual in mismatches[:5]:
+        print(f"   expected: {expected}\n   got: {actual}")
+    failures += len(mismatches)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Regression tests for compact Checkov reports
+Encodes Checkov JSON reports of every shape the format may meet (regular
+reports, lists of reports, and broken ones where results or a check list is
+not what Checkov writes) with compact_report.py, and fails unless each
+decodes back to the same document and --verify's comparison accepts it, or
+if that comparison accepts a compact report of a different document
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from compact_report import decode, encode, same_report  # noqa: E402
+
+ROOT = "/home/runner/work/one-platform/one-platform"
+
+
+def check(check_id, result, file_path="/atmos/components/terraform/azure-nsg/main.tf"):
+    return {
+        "check_id": check_id,
+        "check_name": "Ensure Azure NSG doesn't allow unrestricted inbound internet access",
+        "check_result": {"result": result, "evaluated_keys": ["security_rule"]},
+        "code_block": [[12, "resource \"azurerm_network_security_group\" \"this\" {\n"]],
+        "file_path": file_path,
+        "file_abs_path": ROOT + file_path,
+        "repo_file_path": file_path,
+        "file_line_range": [12, 40],
+        "resource": "azurerm_network_security_group.this",
+        "guideline": None,
+        "severity": None,
+        "fixed_definition": None,
+    }
+
+
+def report(results):
+    return {
+        "check_type": "terraform",
+        "results": results,
+        "summary": {"passed": 1, "failed": 1, "skipped": 0, "parsing_errors": 0, "checkov_version": "3.3.29"},
+        "url": "Add an api key '--bc-api-key <api-key>' to see more detailed insights via https://bridgecrew.cloud",
+    }
+
+
+REGULAR_RESULTS = {
+    "passed_checks": [check("CKV_OP_AZURE_NSG_1", "PASSED")],
+    "failed_checks": [check("CKV_OP_AZURE_NSG_2", "FAILED"), check("CKV_OP_AZURE_NSG_7", "FAILED", "/ストレージ/main.tf")],
+    "skipped_checks": [],
+    "parsing_errors": [ROOT + "/atmos/components/terraform/broken/main.tf"],
+}
+
+DOCUMENTS = {
+    "regular report": report(REGULAR_RESULTS),
+    "one report per framework": [report(REGULAR_RESULTS), report({**REGULAR_RESULTS, "failed_checks": []})],
+    "results is a list": report([check("CKV_OP_AZURE_NSG_2", "FAILED"), 3, None, {"failed_checks": []}]),
+    "results is null": report(None),
+    "results is a string": report("not scanned"),
+    "results is a number": report(0),
+    "results is empty": report({}),
+    "check list is null": report({**REGULAR_RESULTS, "failed_checks": None}),
+    "check list is an object": report({**REGULAR_RESULTS, "failed_checks": {"count": 2, "checks": [1, 2]}}),
+    "check list holds scalars": report({**REGULAR_RESULTS, "skipped_checks": [1, "@/x", None, [2]]}),
+    "no results": {"check_type": "terraform", "summary": {"passed": 0}},
+    "empty list of reports": [],
+    "scalar document": None,
+}
+
+
+def round_trip(document, indent, compression, directory):
+    """(decoded document, whether --verify accepts it) for one encoding of document"""
+    source = Path(directory) / "report.json"
+    source.write_text(json.dumps(document, indent=indent, ensure_ascii=False), encoding="utf-8")
+    compact = Path(directory) / f"report.{compression}"
+    encode(str(source), str(compact), compression)
+    decoded = Path(directory) / "decoded.json"
+    with open(decoded, "w", encoding="utf-8") as out:
+        decode(str(compact), out)
+    return json.loads(decoded.read_text(encoding="utf-8")), same_report(str(source), str(compact))
+
+
+def test_round_trip_every_shape():
+    """Every report shape decodes to the original document, and --verify accepts it"""
+    problems = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, document in DOCUMENTS.items():
+            for indent in (None, 2):
+                for compression in ("gzip", "lzma"):
+                    label = f"{name} (indent={indent}, {compression})"
+                    try:
+                        decoded, verified = round_trip(document, indent, compression, directory)
+                    except (OSError, ValueError) as error:
+                        problems.append(f"{label}: {type(error).__name__}: {error}")
+                        continue
+                    if decoded != document:
+                        problems.append(f"{label}: decodes to {json.dumps(decoded)[:120]}")
+                    if not verified:
+                        problems.append(f"{label}: --verify rejects its own report")
+    return problems
+
+
+def test_verify_rejects_other_documents():
+    """--verify fails when the compact report is of a document that differs anywhere"""
+    altered = {
+        "results is null, not a list": (report([1]), report(None)),
+        "a scalar in results differs": (report([1, 2]), report([1, 3])),
+        "a check list differs in shape": (report({**REGULAR_RESULTS, "failed_checks": None}),
+                                          report({**REGULAR_RESULTS, "failed_checks": []})),
+        "a string that reads like a container event": (report(["{"]), report([{}])),
+        "true, not 1": (report({"passed_checks": [], "x": True}), report({"passed_checks": [], "x": 1})),
+        "a member is missing": (report(REGULAR_RESULTS), {**report(REGULAR_RESULTS), "extra": None}),
+        "a field inside a check differs": (report(REGULAR_RESULTS), report({
+            **REGULAR_RESULTS, "passed_checks": [{**check("CKV_OP_AZURE_NSG_1", "PASSED"), "file_line_range": [12, 41]}]})),
+    }
+    problems = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (encoded, source) in altered.items():
+            compact = Path(directory) / "report.ckv.gz"
+            encoded_path = Path(directory) / "encoded.json"
+            encoded_path.write_text(json.dumps(encoded), encoding="utf-8")
+            encode(str(encoded_path), str(compact))
+            source_path = Path(directory) / "source.json"
+            source_path.write_text(json.dumps(source), encoding="utf-8")
+            if same_report(str(source_path), str(compact)):
+                problems.append(f"{name}: --verify accepts a compact report of another document")
+    return problems
+
+
+TESTS = [
+    test_round_trip_every_shape,
+    test_verify_rejects_other_documents,
+]
+
+
+def main():
+    failures = 0
+    for test in TESTS:
+        problems = test()
+        status = "✅" if not problems else "❌"
+        print(f"{status} {test.__name__}: {test.__doc__}")
+        for problem in problems:
+            print(f"   {problem}")
+        failures += len(problems)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -125,6 +125,32 @@ Plan: 2 to add, 0 to change, 2 to destroy.
 """
 }
 
+# Wide (CJK, emoji) and combining characters, which take two or zero terminal columns
+WIDE_CHARACTER_PLANS = {
+    "azure-ストレージ": """
+  # azurerm_storage_account.データ[0] will be created
+  + resource "azurerm_storage_account" "データ" {
+    }
+
+  # azurerm_storage_container.rocket will be created
+  + resource "azurerm_storage_container" "🚀rocket" {
+    }
+
+Plan: 2 to add, 0 to change, 0 to destroy.
+""",
+    "azure-keyvault-🔐": """
+  # azurerm_key_vault.café will be updated in-place
+  ~ resource "azurerm_key_vault" "cafe\u0301" {
+    }
+
+  # azurerm_key_vault_secret.plain will be created
+  + resource "azurerm_key_vault_secret" "plain" {
+    }
+
+Plan: 1 to add, 1 to change, 0 to destroy.
+"""
+}
+
 def create_sample_plans():
     """Create sample plan files for testing"""
     os.makedirs('/tmp/test-plans', exist_ok=True)
@@ -135,17 +161,17 @@ def create_sample_plans():
             f.write(plan_content)
         print(f"Created sample plan: {plan_file}")
 
+def load_dashboard_module():
+    """Import parse_terraform_plan.py from this directory"""
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    import parse_terraform_plan
+    return parse_terraform_plan
+
 def test_dashboard():
     """Test the dashboard generation"""
     # Import the dashboard generator
-    script_dir = Path(__file__).parent
-    
-    # Load the module directly
-    parse_module = {}
-    with open(script_dir / 'parse-terraform-plan.py', 'r') as f:
-        exec(f.read(), parse_module)
-    
-    generate_dashboard = parse_module['generate_dashboard']
+    generate_dashboard = load_dashboard_module().generate_dashboard
     
     # Read all sample plan files
     component_plans = {}
@@ -168,6 +194,23 @@ def test_dashboard():
     print(dashboard)
     print("=" * 80)
 
+def test_spilled_dashboard():
+    """The spilled (SQLite, streamed) detail tables must match tabulate's in-memory output"""
+    generate_dashboard = load_dashboard_module().generate_dashboard
+
+    for name, plans in (("sample", SAMPLE_PLANS), ("wide-character", WIDE_CHARACTER_PLANS)):
+        in_memory = generate_dashboard(plans, memory_budget="64M")
+        spilled = generate_dashboard(plans, memory_budget=1)
+        if spilled != in_memory:
+            print(f"❌ Spilled dashboard differs from the in-memory one ({name} plans)")
+            for expected, actual in zip(in_memory.splitlines(), spilled.splitlines()):
+                if expected != actual:
+                    print(f"   in memory: {expected}")
+                    print(f"   spilled:   {actual}")
+            return False
+        print(f"✅ Spilled dashboard matches the in-memory one ({name} plans)")
+    return True
+
 def main():
     """Main test function"""
     print("🚀 Testing Terraform Plan Dashboard")
@@ -189,6 +232,10 @@ def main():
     # Test dashboard generation
     print("\n🎨 Testing dashboard generation...")
     test_dashboard()
+
+    print("\n🧮 Testing spilled dashboard output...")
+    if not test_spilled_dashboard():
+        return 1
     
     print("\n🎉 Test completed successfully!")
     print("\n💡 Tips:")
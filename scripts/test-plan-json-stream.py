@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the streaming plan JSON reader
+Reads plan documents with non-ASCII values through plan_json_stream.py with
+chunk sizes small enough to cut every multibyte character, from binary and
+text streams, and fails unless the resources match json.loads of the whole
+document
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from plan_json_stream import iter_planned_resources, iter_resource_changes  # noqa: E402
+
+# Two-, three- and four-byte UTF-8 characters, combining marks and escapes
+NON_ASCII_VALUES = ["café", "café", "Zürich-北欧", "ストレージ", "🚀🔐", "naïve \\ \"quoted\"", "é🚀"]
+
+
+def sample_plan():
+    resources = [{
+        "address": f"azurerm_storage_account.account_{index}",
+        "mode": "managed",
+        "type": "azurerm_storage_account",
+        "name": f"account_{index}",
+        "values": {"name": value, "tags": {"owner": value, value: "ok"}, "weight": 1.5e3 + index},
+    } for index, value in enumerate(NON_ASCII_VALUES)]
+    return {
+        "format_version": "1.2",
+        "planned_values": {"root_module": {"resources": resources}},
+        "resource_changes": [{"address": resource["address"], "change": {"after": resource["values"]}}
+                             for resource in resources],
+    }
+
+
+def test_multibyte_characters_across_chunks():
+    """Multibyte characters split between chunks decode the same as the whole document"""
+    plan = sample_plan()
+    problems = []
+    for ensure_ascii in (False, True):
+        text = json.dumps(plan, ensure_ascii=ensure_ascii)
+        data = text.encode("utf-8")
+        for chunk_size in (1, 2, 3, 5, 7, 64, len(data)):
+            for kind, stream in (("bytes", lambda: io.BytesIO(data)), ("text", lambda: io.StringIO(text))):
+                label = f"{kind} stream, chunk_size={chunk_size}, ensure_ascii={ensure_ascii}"
+                try:
+                    resources = list(iter_planned_resources(stream(), chunk_size))
+                    changes = list(iter_resource_changes(stream(), chunk_size))
+                except (UnicodeDecodeError, ValueError) as error:
+                    problems.append(f"{label}: {type(error).__name__}: {error}")
+                    continue
+                if resources != plan["planned_values"]["root_module"]["resources"]:
+                    problems.append(f"{label}: planned resources differ")
+                if changes != plan["resource_changes"]:
+                    problems.append(f"{label}: resource changes differ")
+    return problems
+
+
+def test_truncated_multibyte_character():
+    """A document ending inside a multibyte character raises UnicodeDecodeError"""
+    data = json.dumps(sample_plan(), ensure_ascii=False).encode("utf-8")
+    # Cut inside the final character of the last non-ASCII string value
+    cut = data.rindex("🚀".encode("utf-8")) + 2
+    try:
+        list(iter_planned_resources(io.BytesIO(data[:cut]), 3))
+    except UnicodeDecodeError:
+        return []
+    except ValueError as error:
+        return [f"raised {type(error).__name__} instead of UnicodeDecodeError: {error}"]
+    return ["no error for a document cut inside a character"]
+
+
+TESTS = [
+    test_multibyte_characters_across_chunks,
+    test_truncated_multibyte_character,
+]
+
+
+def main():
+    failures = 0
+    for test in TESTS:
+        problems = test()
+        status = "✅" if not problems else "❌"
+        print(f"{status} {test.__name__}: {test.__doc__}")
+        for problem in problems:
+            print(f"   {problem}")
+        failures += len(problems)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the custom Checkov check rule engine
+Runs the CKV_OP_* checks and small synthetic rule sets through every
+evaluation path (evaluate, scan_resource_conf, evaluate_batch, evaluate_timed
+and evaluate_cached) and fails if a predicate that raises takes the verdicts
+of the other checks of the resource down with it, or if the NSG internet
+inbound checks drift from their documented semantics
+"""
+
+import sys
+from pathlib import Path
+
+POLICIES_DIR = Path(__file__).resolve().parent.parent / "security" / "checkov-policies"
+
+
+def outcome(call):
+    """(result name, details) of a check call, or the name of the exception it raised"""
+    try:
+        result, details = call()
+    except Exception as error:
+        return type(error).__name__
+    return result.name, details
+
+
+def test_malformed_resource_group_tags():
+    """tags = [None] fails RG_1 as missing every required tag; the other checks keep their verdicts"""
+    import azure_resource_group_checks
+    from policy_config import get_policy_config
+
+    required = ", ".join(get_policy_config().required_tags)
+    problems = []
+    for tags in ([None], [["environment"]], ["module.label.tags"]):
+        conf = {"name": ["lalb-services-eus"], "location": ["westeurope"], "count": ["var.enabled ? 1 : 0"],
+                "tags": tags}
+        for check in azure_resource_group_checks.checks:
+            results = {
+                "evaluate": outcome(lambda: check.evaluate(conf)),
+                "batch": outcome(lambda: check.evaluate_batch([conf, dict(conf)])[1]),
+                "scan": outcome(lambda: (check.scan_resource_conf(conf), check.details or None)),
+            }
+            if check.id == "CKV_OP_AZURE_RG_1":
+                expected = ("FAILED", f"Missing required tags: {required}")
+                if results["evaluate"] != expected:
+                    problems.append(f"tags={tags!r}: {check.id} gave {results['evaluate']}, expected {expected}")
+            for path, result in results.items():
+                if isinstance(result, str):
+                    problems.append(f"tags={tags!r}: {check.id} raised {result} ({path})")
+    return problems
+
+
+def test_raising_predicate_is_isolated():
+    """A raising predicate or fused evaluator only fails the checks it computes, on every path"""
+    from result_cache import ResultCache
+    from rule_engine import PASSED, Raised, RuleSet, reads, register_checks, rule, verdict
+
+    @reads("value")
+    def fragile(c):
+        return PASSED, f"length {len(c.scalar('value'))}"
+
+    def fused(c):
+        if c.scalar("value") is None:
+            raise KeyError("value")
+        return {"TEST_FUSED": (PASSED, None)}
+
+    rule_set = RuleSet(
+        resources=["test_resource"],
+        categories=["general"],
+        rules=[
+            rule("TEST_FRAGILE", "TestFragile", "Fragile predicate", fragile),
+            rule("TEST_FUSED", "TestFused", "Fused rule", None),
+            rule("TEST_SOUND", "TestSound", "Sound predicate", reads("value")(lambda c: (PASSED, None))),
+        ],
+        evaluator=fused,
+    )
+    namespace = {"__name__": "test_rule_engine"}
+    checks = {check.id: check for check in register_checks(rule_set, namespace)}
+    expected = {"TEST_FRAGILE": "TypeError", "TEST_FUSED": "KeyError", "TEST_SOUND": ("PASSED", None)}
+
+    problems = []
+    confs = [{"value": ["abc"]}, {"value": [None]}, {"value": [None]}]
+    cache = ResultCache()
+    for pass_number in range(2):
+        results = {
+            "evaluate": {check_id: outcome(lambda: check.evaluate(confs[1])) for check_id, check in checks.items()},
+            # A batch raises for the check whose predicate raised on one of its rows, and only for it
+            "batch": {check_id: outcome(lambda: check.evaluate_batch(confs)[0])
+                      for check_id, check in checks.items()},
+            "timed": {check_id: outcome(lambda: verdict(rule_set.evaluate_timed(confs[2])[0], check_id))
+                      for check_id in checks},
+            "cached": {check_id: outcome(lambda: verdict(rule_set.evaluate_cached(dict(confs[1]), cache, "v1"),
+                                                         check_id))
+                       for check_id in checks},
+        }
+        for path, outcomes in results.items():
+            for check_id, result in outcomes.items():
+                if result != expected[check_id]:
+                    problems.append(f"pass {pass_number} {path}: {check_id} gave {result}, "
+                                    f"expected {expected[check_id]}")
+
+    cached = [key for key in cache._entries if not key.startswith("TEST_SOUND:")]
+    if cached:
+        problems.append(f"errors stored in the result cache: {cached}")
+    if any(isinstance(value, Raised) for value in cache._entries.values()):
+        problems.append("Raised stored in the result cache")
+    healthy = [outcome(lambda: check.evaluate(confs[0])) for check in checks.values()]
+    if any(isinstance(result, str) for result in healthy):
+        problems.append(f"a conf without errors raised: {healthy}")
+    return problems
+
+
+def security_rule(name, priority, source, access="Allow"):
+    """An inbound TCP security_rule block as Checkov parses it"""
+    return {
+        "name": [name], "priority": [priority], "direction": ["Inbound"], "access": [access],
+        "protocol": ["Tcp"], "source_port_range": ["*"], "destination_port_range": ["443"],
+        "source_address_prefix": [source], "destination_address_prefix": ["*"],
+    }
+
+
+def test_nsg_internet_inbound_semantics():
+    """NSG_2 matches the literal internet sources only; NSG_7 reports internet Allow rules that take effect"""
+    import azure_nsg_checks
+
+    checks = {check.id: check for check in azure_nsg_checks.checks}
+    deny_all = security_rule("deny-all", 100, "*", access="Deny")
+    cases = [
+        # (description, security rules, NSG_2 verdict, NSG_7 verdict)
+        ("lower-case 'internet'", [security_rule("web", 200, "internet")], "FAILED", "FAILED"),
+        ("service tag 'Internet'", [security_rule("web", 200, "Internet")], "PASSED", "FAILED"),
+        ("service tag 'INTERNET'", [security_rule("web", 200, "INTERNET")], "PASSED", "FAILED"),
+        ("'::/0'", [security_rule("web", 200, "::/0")], "PASSED", "FAILED"),
+        ("'*' behind a Deny", [deny_all, security_rule("web", 200, "*")], "FAILED", "PASSED"),
+        ("private range", [security_rule("web", 200, "10.0.0.0/8")], "PASSED", "PASSED"),
+    ]
+    problems = []
+    for description, rules, *expected in cases:
+        conf = {"name": ["module.label.id"], "security_rule": rules}
+        for check_id, verdict in zip(("CKV_OP_AZURE_NSG_2", "CKV_OP_AZURE_NSG_7"), expected):
+            result = outcome(lambda: checks[check_id].evaluate(conf))
+            if isinstance(result, str) or result[0] != verdict:
+                problems.append(f"{description}: {check_id} gave {result}, expected {verdict}")
+    return problems
+
+
+TESTS = [
+    test_malformed_resource_group_tags,
+    test_raising_predicate_is_isolated,
+    test_nsg_internet_inbound_semantics,
+]
+
+
+def main():
+    sys.path.insert(0, str(POLICIES_DIR))
+    import rule_engine
+    rule_engine.use_standalone_checks()
+
+    failures = 0
+    for test in TESTS:
+        problems = test()
+        status = "✅" if not problems else "❌"
+        print(f"{status} {test.__name__}: {test.__doc__}")
+        for problem in problems:
+            print(f"   {problem}")
+        failures += len(problems)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
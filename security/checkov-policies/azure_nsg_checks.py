@@ -3,169 +3,126 @@ Custom Checkov checks for Azure Network Security Group (azure-nsg) component
 One Platform Infrastructure - Security Policies
 """
 
-from checkov.terraform.checks.resource.base_resource_check import BaseResourceCheck
-from checkov.common.models.enums import CheckResult
+from nsg_rule_analyzer import analyze
+from rule_engine import (
+    DETAILS_SEPARATOR, FAILED, PASSED, RuleSet, conditional_creation, label_module, reads,
+    register_checks, resource_group_reference, rule,
+)
 
+INTERNET_SOURCES = frozenset(["*", "0.0.0.0/0", "any", "internet"])
 
-class AzureNSGHasSecurityRules(BaseResourceCheck):
-    """
-    Ensure that Azure NSGs have security rules defined
-    """
-    def __init__(self):
-        name = "Ensure Azure NSG has security rules defined"
-        id = "CKV_OP_AZURE_NSG_1"
-        supported_resources = ["azurerm_network_security_group"]
-        categories = ["networking"]
-        super().__init__(name=name, id=id, categories=categories, supported_resources=supported_resources)
-
-    def scan_resource_conf(self, conf):
-        """
-        Checks if NSG has security rules
-        """
-        if "security_rule" in conf:
-            security_rules = conf["security_rule"]
-            if isinstance(security_rules, list) and len(security_rules) > 0:
-                return CheckResult.PASSED
-            elif security_rules:  # Not empty
-                return CheckResult.PASSED
-        
-        self.details = "NSG should have security rules defined for proper access control"
-        return CheckResult.FAILED
-
+# Findings listed in a check's details before truncating
+MAX_LISTED_RULES = 5
 
-class AzureNSGDeniesInternetInbound(BaseResourceCheck):
-    """
-    Ensure that Azure NSGs don't allow unrestricted inbound access from internet
-    """
-    def __init__(self):
-        name = "Ensure Azure NSG doesn't allow unrestricted inbound internet access"
-        id = "CKV_OP_AZURE_NSG_2"
-        supported_resources = ["azurerm_network_security_group"]
-        categories = ["networking"]
-        super().__init__(name=name, id=id, categories=categories, supported_resources=supported_resources)
 
-    def scan_resource_conf(self, conf):
-        """
-        Checks for overly permissive inbound rules
-        """
-        if "security_rule" in conf:
-            security_rules = conf["security_rule"]
-            if not isinstance(security_rules, list):
-                security_rules = [security_rules]
-            
-            for rule in security_rules:
-                if isinstance(rule, dict):
-                    direction = rule.get("direction", [""])
-                    access = rule.get("access", [""])
-                    source_address_prefix = rule.get("source_address_prefix", [""])
-                    
-                    # Extract values from lists if needed
-                    direction_val = direction[0] if isinstance(direction, list) else direction
-                    access_val = access[0] if isinstance(access, list) else access
-                    source_val = source_address_prefix[0] if isinstance(source_address_prefix, list) else source_address_prefix
-                    
-                    if (str(direction_val).lower() == "inbound" and 
-                        str(access_val).lower() == "allow" and
-                        str(source_val) in ["*", "0.0.0.0/0", "any", "internet"]):
-                        self.details = "Found overly permissive inbound rule allowing access from internet"
-                        return CheckResult.FAILED
-        
-        return CheckResult.PASSED
+def _listed(items):
+    """First MAX_LISTED_RULES items plus a count of the rest"""
+    listed = items[:MAX_LISTED_RULES]
+    if len(items) > MAX_LISTED_RULES:
+        listed.append(f"and {len(items) - MAX_LISTED_RULES} more")
+    return listed
 
 
-class AzureNSGUsesLabelModule(BaseResourceCheck):
+def _allows_internet_source(security_rules):
     """
-    Ensure that Azure NSGs use the cloudposse/label/null module for consistent naming and tagging
+    Whether any inbound Allow rule names an INTERNET_SOURCES literal as its
+    source_address_prefix (case-sensitive, like the original NSG_2 check)
     """
-    def __init__(self):
-        name = "Ensure Azure NSG uses cloudposse/label module for naming"
-        id = "CKV_OP_AZURE_NSG_3"
-        supported_resources = ["azurerm_network_security_group"]
-        categories = ["networking"]
-        super().__init__(name=name, id=id, categories=categories, supported_resources=supported_resources)
-
-    def scan_resource_conf(self, conf):
-        """
-        Checks if NSG uses label module
-        """
-        checks = []
-        
-        if "name" in conf:
-            name_value = conf["name"][0] if isinstance(conf["name"], list) else conf["name"]
-            if "module.label" in str(name_value):
-                checks.append(True)
-            else:
-                checks.append(False)
-                self.details = "Name should reference module.label.id"
-        
-        if "tags" in conf:
-            tags_value = conf["tags"][0] if isinstance(conf["tags"], list) else conf["tags"]
-            if "module.label.tags" in str(tags_value):
-                checks.append(True)
-            else:
-                checks.append(False)
-                self.details += " | Tags should reference module.label.tags"
-        
-        return CheckResult.PASSED if all(checks) else CheckResult.FAILED
-
-
-class AzureNSGUsesConditionalCreation(BaseResourceCheck):
-    """
-    Ensure that Azure NSGs use conditional creation with 'enabled' variable
+    # Attribute unwrapping is inlined: this loop dominates on large NSGs
+    for security_rule in security_rules:
+        if not isinstance(security_rule, dict):
+            continue
+        direction = security_rule.get("direction")
+        if isinstance(direction, list):
+            direction = direction[0] if direction else None
+        if str(direction).lower() != "inbound":
+            continue
+        access = security_rule.get("access")
+        if isinstance(access, list):
+            access = access[0] if access else None
+        if str(access).lower() != "allow":
+            continue
+        source = security_rule.get("source_address_prefix")
+        if isinstance(source, list):
+            source = source[0] if source else None
+        if str(source) in INTERNET_SOURCES:
+            return True
+    return False
+
+
+@reads("security_rule")
+def evaluate_security_rules(c):
     """
-    def __init__(self):
-        name = "Ensure Azure NSG uses conditional creation pattern"
-        id = "CKV_OP_AZURE_NSG_4"
-        supported_resources = ["azurerm_network_security_group"]
-        categories = ["networking"]
-        super().__init__(name=name, id=id, categories=categories, supported_resources=supported_resources)
-
-    def scan_resource_conf(self, conf):
-        """
-        Checks if NSG uses conditional creation
-        """
-        if "count" in conf:
-            count_value = conf["count"][0] if isinstance(conf["count"], list) else conf["count"]
-            if "var.enabled" in str(count_value):
-                return CheckResult.PASSED
-            
-            self.details = "Count parameter exists but doesn't reference var.enabled"
-            return CheckResult.FAILED
-        
-        self.details = "Missing conditional creation pattern"
-        return CheckResult.FAILED
-
+    Fused evaluator for the security_rule checks (NSG_1, NSG_2, NSG_6 and NSG_7)
 
-class AzureNSGHasProperResourceGroupReference(BaseResourceCheck):
+    NSG_2 keeps its literal source match. nsg_rule_analyzer runs once per NSG
+    for the others: rules are normalised to address and port intervals and
+    walked in priority order, so NSG_7 only reports internet Allow rules that
+    take effect, whatever the spelling of their source.
     """
-    Ensure that Azure NSGs properly reference their resource group
-    """
-    def __init__(self):
-        name = "Ensure Azure NSG properly references resource group"
-        id = "CKV_OP_AZURE_NSG_5"
-        supported_resources = ["azurerm_network_security_group"]
-        categories = ["networking"]
-        super().__init__(name=name, id=id, categories=categories, supported_resources=supported_resources)
-
-    def scan_resource_conf(self, conf):
-        """
-        Checks if NSG references resource group properly
-        """
-        if "resource_group_name" in conf:
-            rg_name = conf["resource_group_name"][0] if isinstance(conf["resource_group_name"], list) else conf["resource_group_name"]
-            if "var." in str(rg_name) or "azurerm_resource_group" in str(rg_name):
-                return CheckResult.PASSED
-            else:
-                self.details = "Resource group name should reference variable or resource"
-                return CheckResult.FAILED
-        
-        self.details = "No resource_group_name defined"
-        return CheckResult.FAILED
-
+    security_rules = c.raw("security_rule")
+    results = {
+        "CKV_OP_AZURE_NSG_1": (PASSED, None),
+        "CKV_OP_AZURE_NSG_2": (PASSED, None),
+        "CKV_OP_AZURE_NSG_6": (PASSED, None),
+        "CKV_OP_AZURE_NSG_7": (PASSED, None),
+    }
+    if not security_rules:
+        results["CKV_OP_AZURE_NSG_1"] = (FAILED, "NSG should have security rules defined for proper access control")
+        return results
+    if not isinstance(security_rules, list):
+        security_rules = [security_rules]
+
+    if _allows_internet_source(security_rules):
+        results["CKV_OP_AZURE_NSG_2"] = (FAILED, "Found overly permissive inbound rule allowing access from internet")
+    findings = analyze(security_rules)
+    open_rules = [finding for finding in findings if finding.kind == "open"]
+    if open_rules:
+        names = ", ".join(_listed([f"'{finding.rule}'" for finding in open_rules]))
+        results["CKV_OP_AZURE_NSG_7"] = (
+            FAILED, f"Found inbound rule effectively open to the internet: {names}")
+    unreachable = [finding for finding in findings if finding.kind in ("shadowed", "redundant")]
+    if unreachable:
+        results["CKV_OP_AZURE_NSG_6"] = (
+            FAILED, DETAILS_SEPARATOR.join(_listed([finding.message for finding in unreachable])))
+    return results
+
+
+RULES = RuleSet(
+    resources=["azurerm_network_security_group"],
+    categories=["networking"],
+    rules=[
+        rule("CKV_OP_AZURE_NSG_1", "AzureNSGHasSecurityRules",
+             "Ensure Azure NSG has security rules defined",
+             None,  # evaluate_security_rules
+             doc="Ensure that Azure NSGs have security rules defined"),
+        rule("CKV_OP_AZURE_NSG_2", "AzureNSGDeniesInternetInbound",
+             "Ensure Azure NSG doesn't allow unrestricted inbound internet access",
+             None,  # evaluate_security_rules
+             doc="Ensure that Azure NSGs don't allow unrestricted inbound access from internet"),
+        rule("CKV_OP_AZURE_NSG_3", "AzureNSGUsesLabelModule",
+             "Ensure Azure NSG uses cloudposse/label module for naming",
+             label_module(),
+             doc="Ensure that Azure NSGs use the cloudposse/label/null module for consistent naming and tagging"),
+        rule("CKV_OP_AZURE_NSG_4", "AzureNSGUsesConditionalCreation",
+             "Ensure Azure NSG uses conditional creation pattern",
+             conditional_creation(),
+             doc="Ensure that Azure NSGs use conditional creation with 'enabled' variable"),
+        rule("CKV_OP_AZURE_NSG_5", "AzureNSGHasProperResourceGroupReference",
+             "Ensure Azure NSG properly references resource group",
+             resource_group_reference(),
+             doc="Ensure that Azure NSGs properly reference their resource group"),
+        rule("CKV_OP_AZURE_NSG_6", "AzureNSGHasNoUnreachableRules",
+             "Ensure Azure NSG has no shadowed or redundant security rules",
+             None,  # evaluate_security_rules
+             doc="Ensure that every Azure NSG security rule can take effect in priority order"),
+        rule("CKV_OP_AZURE_NSG_7", "AzureNSGHasNoEffectiveInternetInbound",
+             "Ensure no Azure NSG inbound rule is effectively open to the internet",
+             None,  # evaluate_security_rules
+             doc="Ensure that no Azure NSG inbound Allow rule that takes effect admits every internet address"),
+    ],
+    evaluator=evaluate_security_rules,
+)
 
 # Register the checks
-check = AzureNSGHasSecurityRules()
-check = AzureNSGDeniesInternetInbound()
-check = AzureNSGUsesLabelModule()
-check = AzureNSGUsesConditionalCreation()
-check = AzureNSGHasProperResourceGroupReference()
\ No newline at end of file
+checks = register_checks(RULES, globals())
@@ -2,7 +2,7 @@
 Template for Custom Checkov checks for new Azure components
 One Platform Infrastructure - Security Policies
 
-Replace COMPONENT_NAME with actual component name (e.g., azure-cosmosdb)
+Replace COMPONENT_NAME with actual component name (e.g., CosmosDb)
 Replace COMPONENT_SHORT with abbreviated name (e.g., COSMOSDB)
 Replace RESOURCE_TYPE with actual Azure resource type (e.g., azurerm_cosmosdb_account)
 Replace CATEGORY with appropriate category (e.g., database, networking, storage, etc.)
@@ -11,8 +11,13 @@ Instructions:
 1. Copy this template to a new file: azure_[component_name]_checks.py
 2. Replace all placeholders with actual values
 3. Implement component-specific checks based on security requirements
-4. Update security/checkov.yaml to include the new check IDs
-5. Test the checks with the checkov-scan.sh script
+4. Uncomment the register_checks() call at the bottom of the file
+5. Update security/checkov.yaml to include the new check IDs
+6. Test the checks with the checkov-scan.sh script
+
+Checks are declared as rows of a RuleSet (see rule_engine.py). Standard checks
+use the predicate factories; component-specific logic goes in a small function
+that takes the normalised conf and returns (CheckResult, details).
 
 ALWAYS include these standard checks for consistency:
 - Label module usage (naming and tagging)
@@ -21,161 +26,10 @@ ALWAYS include these standard checks for consistency:
 - Component-specific security requirements
 """
 
-from checkov.terraform.checks.resource.base_resource_check import BaseResourceCheck
-from checkov.common.models.enums import CheckResult
-
-
-class Azure{COMPONENT_NAME}UsesLabelModule(BaseResourceCheck):
-    """
-    Ensure that Azure {COMPONENT_NAME} uses the cloudposse/label/null module for consistent naming and tagging
-    """
-    def __init__(self):
-        name = "Ensure Azure {COMPONENT_NAME} uses cloudposse/label module"
-        id = "CKV_OP_AZURE_{COMPONENT_SHORT}_1"
-        supported_resources = ["{RESOURCE_TYPE}"]
-        categories = ["{CATEGORY}"]
-        super().__init__(name=name, id=id, categories=categories, supported_resources=supported_resources)
-
-    def scan_resource_conf(self, conf):
-        """
-        Checks if {COMPONENT_NAME} uses label module for naming and tagging
-        """
-        checks = []
-        
-        # Check name
-        if "name" in conf:
-            name_value = conf["name"][0] if isinstance(conf["name"], list) else conf["name"]
-            if "module.label" in str(name_value):
-                checks.append(True)
-            else:
-                checks.append(False)
-                self.details = "Name should reference module.label.id"
-        else:
-            checks.append(False)
-            self.details = "No name parameter found"
-        
-        # Check tags
-        if "tags" in conf:
-            tags_value = conf["tags"][0] if isinstance(conf["tags"], list) else conf["tags"]
-            if "module.label.tags" in str(tags_value):
-                checks.append(True)
-            else:
-                checks.append(False)
-                self.details += " | Tags should reference module.label.tags"
-        else:
-            checks.append(False)
-            self.details += " | No tags parameter found"
-        
-        return CheckResult.PASSED if all(checks) else CheckResult.FAILED
-
-
-class Azure{COMPONENT_NAME}UsesConditionalCreation(BaseResourceCheck):
-    """
-    Ensure that Azure {COMPONENT_NAME} uses conditional creation with 'enabled' variable
-    """
-    def __init__(self):
-        name = "Ensure Azure {COMPONENT_NAME} uses conditional creation pattern"
-        id = "CKV_OP_AZURE_{COMPONENT_SHORT}_2"
-        supported_resources = ["{RESOURCE_TYPE}"]
-        categories = ["{CATEGORY}"]
-        super().__init__(name=name, id=id, categories=categories, supported_resources=supported_resources)
-
-    def scan_resource_conf(self, conf):
-        """
-        Checks if {COMPONENT_NAME} uses conditional creation with count parameter
-        """
-        if "count" in conf:
-            count_value = conf["count"][0] if isinstance(conf["count"], list) else conf["count"]
-            
-            if "var.enabled" in str(count_value):
-                return CheckResult.PASSED
-            
-            self.details = "Count parameter exists but doesn't reference var.enabled"
-            return CheckResult.FAILED
-        
-        self.details = "Missing conditional creation pattern - should use 'count = var.enabled ? 1 : 0'"
-        return CheckResult.FAILED
-
-
-class Azure{COMPONENT_NAME}HasProperResourceGroupReference(BaseResourceCheck):
-    """
-    Ensure that Azure {COMPONENT_NAME} properly references their resource group
-    """
-    def __init__(self):
-        name = "Ensure Azure {COMPONENT_NAME} properly references resource group"
-        id = "CKV_OP_AZURE_{COMPONENT_SHORT}_3"
-        supported_resources = ["{RESOURCE_TYPE}"]
-        categories = ["{CATEGORY}"]
-        super().__init__(name=name, id=id, categories=categories, supported_resources=supported_resources)
-
-    def scan_resource_conf(self, conf):
-        """
-        Checks if {COMPONENT_NAME} properly references resource group
-        """
-        if "resource_group_name" in conf:
-            rg_name = conf["resource_group_name"][0] if isinstance(conf["resource_group_name"], list) else conf["resource_group_name"]
-            
-            # Should reference a variable or resource group resource
-            if "var." in str(rg_name) or "azurerm_resource_group" in str(rg_name):
-                return CheckResult.PASSED
-            else:
-                self.details = "Resource group name should reference variable or resource group resource"
-                return CheckResult.FAILED
-        
-        self.details = "No resource_group_name defined"
-        return CheckResult.FAILED
-
-
-class Azure{COMPONENT_NAME}HasValidLocation(BaseResourceCheck):
-    """
-    Ensure that Azure {COMPONENT_NAME} uses approved Azure regions
-    """
-    def __init__(self):
-        name = "Ensure Azure {COMPONENT_NAME} uses approved Azure regions"
-        id = "CKV_OP_AZURE_{COMPONENT_SHORT}_4"
-        supported_resources = ["{RESOURCE_TYPE}"]
-        categories = ["{CATEGORY}"]
-        super().__init__(name=name, id=id, categories=categories, supported_resources=supported_resources)
-
-    def scan_resource_conf(self, conf):
-        """
-        Looks for approved Azure regions in {COMPONENT_NAME} configuration
-        """
-        # One Platform approved regions
-        approved_regions = [
-            "East US",
-            "East US 2", 
-            "West US",
-            "West US 2",
-            "Central US",
-            "North Central US",
-            "South Central US",
-            "West Central US",
-            "Canada Central",
-            "Canada East",
-            "UK South",
-            "UK West",
-            "West Europe",
-            "North Europe"
-        ]
-        
-        if "location" in conf:
-            location = conf["location"][0] if isinstance(conf["location"], list) else conf["location"]
-            
-            # Handle variable references
-            if isinstance(location, str) and location.startswith("var."):
-                # For variable references, we pass - actual validation happens during runtime
-                return CheckResult.PASSED
-            
-            if location not in approved_regions:
-                self.details = f"Location '{location}' is not in approved regions list"
-                return CheckResult.FAILED
-            
-            return CheckResult.PASSED
-        
-        self.details = "No location specified"
-        return CheckResult.FAILED
-
+from rule_engine import (
+    PASSED, RuleSet, approved_region, conditional_creation, label_module, register_checks,
+    resource_group_reference, rule,
+)
 
 # TODO: Add component-specific security checks here
 # Examples:
@@ -184,45 +38,57 @@ class Azure{COMPONENT_NAME}HasValidLocation(BaseResourceCheck):
 # - For compute: secure communication, authentication, monitoring
 # - For storage: encryption, access policies, versioning
 
-class Azure{COMPONENT_NAME}ComponentSpecificCheck(BaseResourceCheck):
+def meets_component_requirements(c):
     """
-    Ensure that Azure {COMPONENT_NAME} meets component-specific security requirements
+    Implement component-specific security validation
     Replace this with actual security checks relevant to the component
     """
-    def __init__(self):
-        name = "Ensure Azure {COMPONENT_NAME} meets security requirements"
-        id = "CKV_OP_AZURE_{COMPONENT_SHORT}_5"
-        supported_resources = ["{RESOURCE_TYPE}"]
-        categories = ["{CATEGORY}"]
-        super().__init__(name=name, id=id, categories=categories, supported_resources=supported_resources)
-
-    def scan_resource_conf(self, conf):
-        """
-        Implement component-specific security validation
-        """
-        # TODO: Replace with actual component-specific checks
-        # Examples:
-        # - Check for encryption settings
-        # - Validate access policies
-        # - Ensure proper network configuration
-        # - Verify backup/disaster recovery settings
-        
-        self.details = "Replace this check with component-specific security validation"
-        return CheckResult.PASSED  # Change to actual validation logic
-
-
-# Register the checks
-check = Azure{COMPONENT_NAME}UsesLabelModule()
-check = Azure{COMPONENT_NAME}UsesConditionalCreation()
-check = Azure{COMPONENT_NAME}HasProperResourceGroupReference()
-check = Azure{COMPONENT_NAME}HasValidLocation()
-check = Azure{COMPONENT_NAME}ComponentSpecificCheck()
+    # TODO: Replace with actual component-specific checks
+    # Examples:
+    # - Check for encryption settings: c.lower("encryption_enabled") == "true"
+    # - Validate access policies: c.present("access_policy")
+    # - Ensure proper network configuration: c.block("network_rules")
+    # - Verify backup/disaster recovery settings
+    return PASSED, "Replace this check with component-specific security validation"
+
+
+RULES = RuleSet(
+    resources=["{RESOURCE_TYPE}"],
+    categories=["{CATEGORY}"],
+    rules=[
+        rule("CKV_OP_AZURE_{COMPONENT_SHORT}_1", "Azure{COMPONENT_NAME}UsesLabelModule",
+             "Ensure Azure {COMPONENT_NAME} uses cloudposse/label module",
+             label_module(required=True),
+             doc="Ensure that Azure {COMPONENT_NAME} uses the cloudposse/label/null module for consistent naming and tagging"),
+        rule("CKV_OP_AZURE_{COMPONENT_SHORT}_2", "Azure{COMPONENT_NAME}UsesConditionalCreation",
+             "Ensure Azure {COMPONENT_NAME} uses conditional creation pattern",
+             conditional_creation("Missing conditional creation pattern - should use 'count = var.enabled ? 1 : 0'"),
+             doc="Ensure that Azure {COMPONENT_NAME} uses conditional creation with 'enabled' variable"),
+        rule("CKV_OP_AZURE_{COMPONENT_SHORT}_3", "Azure{COMPONENT_NAME}HasProperResourceGroupReference",
+             "Ensure Azure {COMPONENT_NAME} properly references resource group",
+             resource_group_reference("Resource group name should reference variable or resource group resource"),
+             doc="Ensure that Azure {COMPONENT_NAME} properly references their resource group"),
+        rule("CKV_OP_AZURE_{COMPONENT_SHORT}_4", "Azure{COMPONENT_NAME}HasValidLocation",
+             "Ensure Azure {COMPONENT_NAME} uses approved Azure regions",
+             # For variable references we pass - actual validation happens during runtime
+             approved_region(variables="prefix"),
+             doc="Ensure that Azure {COMPONENT_NAME} uses approved Azure regions"),
+        rule("CKV_OP_AZURE_{COMPONENT_SHORT}_5", "Azure{COMPONENT_NAME}ComponentSpecificCheck",
+             "Ensure Azure {COMPONENT_NAME} meets security requirements",
+             meets_component_requirements,
+             doc="Ensure that Azure {COMPONENT_NAME} meets component-specific security requirements"),
+    ],
+)
+
+# Register the checks (uncomment once the placeholders above are replaced)
+# checks = register_checks(RULES, globals())
 
 """
 Checklist for implementing new component checks:
 
 □ Replace all placeholders with actual values
 □ Implement component-specific security checks
+□ Uncomment the register_checks() call
 □ Update security/checkov.yaml with new check IDs
 □ Test checks with ./scripts/checkov-scan.sh
 □ Document the checks in component README
@@ -257,4 +123,4 @@ Storage components:
 - Versioning enabled
 - Backup configured
 - Network restrictions applied
-"""
\ No newline at end of file
+"""
@@ -0,0 +1,239 @@
+"""
+Shared normalised access to Checkov resource configurations
+One Platform Infrastructure - Security Policies
+
+Checkov hands every check the same ``conf`` dict for a resource, with attribute
+values wrapped in single-element lists. ``NormalizedConf(conf)`` unwraps and
+stringifies each attribute on first use; the rule engine builds one per pass
+over a resource and shares it between all the rules of the pass.
+
+The pass is the only normalisation cache. RuleSet keeps its results for the
+conf object (see RuleSet.evaluate), so the other checks of the resource do
+not normalise it again. A conf is only evaluated by the RuleSet of its
+resource type, so a cache keyed on conf identity beyond that last pass would
+never hit. The view is a single access path for the checks, not a speed-up:
+module confs are small and each check reads different attributes, so there
+is little repeated unwrapping to save, and reading through the view costs
+more than indexing the conf directly.
+
+``snapshot(conf)`` and ``unchanged(conf, snapshot)`` tell cheaply whether a
+conf object still holds the same attribute values, so results can be reused
+while Checkov runs the checks of one resource. ``fingerprint(conf)`` is a
+stable digest of the attribute values, equal for identical resources in any
+process (see result_cache.py).
+"""
+
+import hashlib
+import json
+import pickle
+
+from terraform_expressions import refers_to, value_references
+
+
+class NormalizedConf:
+    """
+    Read-only view over a Checkov conf dict with memoised, typed getters
+    """
+    __slots__ = ("conf", "_texts", "_nested")
+
+    def __init__(self, conf):
+        self.conf = conf if isinstance(conf, dict) else {}
+        # String forms are built on first use and shared by every later check
+        self._texts = {}
+        self._nested = None
+
+    def has(self, key):
+        """True if the attribute is defined, whatever its value"""
+        return key in self.conf
+
+    def raw(self, key, default=None):
+        """The attribute exactly as Checkov provides it"""
+        return self.conf.get(key, default)
+
+    def present(self, key):
+        """True if the attribute is defined and not empty"""
+        return bool(self.conf.get(key))
+
+    def scalar(self, key, default=None):
+        """The attribute value with Checkov's list wrapping removed"""
+        value = self.conf.get(key)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        return default if value is None else value
+
+    def text(self, key):
+        """The unwrapped attribute value as a string"""
+        text = self._texts.get(key)
+        if text is None:
+            text = self._texts[key] = str(self.scalar(key))
+        return text
+
+    def lower(self, key):
+        """The unwrapped attribute value as a lowercase string"""
+        return self.text(key).lower()
+
+    def values(self, key):
+        """The unwrapped attribute value as a list (e.g. address_space)"""
+        value = self.scalar(key)
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
+    def blocks(self, key):
+        """Nested blocks (e.g. security_rule) as normalised views"""
+        if self._nested is None:
+            self._nested = {}
+        blocks = self._nested.get(key)
+        if blocks is None:
+            value = self.conf.get(key)
+            if value is None:
+                value = []
+            elif not isinstance(value, list):
+                value = [value]
+            blocks = self._nested[key] = [NormalizedConf(item) for item in value if isinstance(item, dict)]
+        return blocks
+
+    def block(self, key):
+        """The first nested block when it is a dict, otherwise None"""
+        value = self.conf.get(key)
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            return self.blocks(key)[0]
+        return None
+
+    def reference(self, key):
+        """The attribute expression used for reference checks (var., module.)"""
+        return self.text(key)
+
+    def references(self, key, *fragments):
+        """True if the attribute expression mentions any of the fragments"""
+        expression = self.text(key)
+        for fragment in fragments:
+            if fragment in expression:
+                return True
+        return False
+
+    def referenced(self, key):
+        """The references (var.x, module.label.id, ...) made by the attribute's expressions"""
+        return value_references(self.conf.get(key))
+
+    def refers_to(self, key, *targets):
+        """True if the attribute references any of the targets ("var", "module.label", ...)"""
+        found = self.referenced(key)
+        for target in targets:
+            if refers_to(found, target):
+                return True
+        return False
+
+
+def snapshot(conf):
+    """
+    A shallow copy of the conf's attributes, to compare with ``unchanged``
+    """
+    return dict(conf) if isinstance(conf, dict) else {}
+
+
+def unchanged(conf, previous):
+    """
+    True if no attribute of conf was added, removed or set to a different value since ``snapshot``
+
+    Attributes that still hold the same object compare equal at once, so the
+    test costs a fraction of a microsecond for a whole conf. The snapshot
+    shares the values with the conf: edits inside a value (e.g. to one
+    security_rule block) are not seen.
+    """
+    return (conf if isinstance(conf, dict) else {}) == previous
+
+
+def _is_metadata(key):
+    """Checkov's bookkeeping keys (__start_line__, __address__, ...), not Terraform attributes"""
+    return key.startswith("__") and key.endswith("__")
+
+
+def fingerprint(conf):
+    """
+    Stable digest of a conf's attribute values, or None when a value cannot be serialised.
+
+    Checkov's bookkeeping keys are left out, so the same configuration declared
+    in two places (or two stacks) has the same fingerprint. The digest is taken
+    over the pickled values, which is several times faster than JSON for the
+    nested blocks of a large resource: equal digests always mean equal values,
+    and the rare equal confs that pickle differently (attribute order, shared
+    objects) only cost a cache miss.
+    """
+    if not isinstance(conf, dict):
+        conf = {}
+    attributes = {key: value for key, value in conf.items() if not (isinstance(key, str) and _is_metadata(key))}
+    try:
+        encoded = pickle.dumps(attributes, protocol=4)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        return None
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+# Wrapped values that are their own cell: a str never equals a bool or a tagged tuple
+_OWN_CELL_TYPES = frozenset((str, bool))
+# Tags cells holding a JSON encoding, so they never equal a plain string cell
+_JSON = object()
+# Cell of a row whose value cannot be encoded
+UNHASHABLE = object()
+# Cell of a row without the attribute
+_MISSING = object()
+
+
+def cell(value):
+    """
+    A hashable stand-in for a conf value: equal cells mean equal values.
+
+    The common wrapped string or bool (["x"], [True]) is its own cell; other
+    values are JSON-encoded, which keeps True, 1 and 1.0 distinct and raises
+    TypeError for anything that is not plain data.
+    """
+    if type(value) is list and len(value) == 1 and type(value[0]) in _OWN_CELL_TYPES:
+        return value[0]
+    return (_JSON, json.dumps(value))
+
+
+class ConfBatch:
+    """
+    Columnar view over the confs of many resources of one type
+
+    ``column(key)`` extracts an attribute from every conf once, as hashable
+    cells, so a predicate can be evaluated once per distinct value instead of
+    once per resource. ``row(i)`` is the NormalizedConf of one resource, for
+    predicates that need to look at the whole conf.
+    """
+    __slots__ = ("confs", "_columns", "_rows")
+
+    def __init__(self, confs):
+        self.confs = [conf if isinstance(conf, dict) else {} for conf in confs]
+        self._columns = {}
+        self._rows = {}
+
+    def __len__(self):
+        return len(self.confs)
+
+    def column(self, key):
+        cells = self._columns.get(key)
+        if cells is None:
+            cells = []
+            append = cells.append
+            for conf in self.confs:
+                value = conf.get(key, _MISSING)
+                if value is _MISSING:
+                    append(_MISSING)
+                elif type(value) is list and len(value) == 1 and type(value[0]) in _OWN_CELL_TYPES:
+                    # cell()'s fast path, inlined: this loop runs once per resource
+                    append(value[0])
+                else:
+                    try:
+                        append(cell(value))
+                    except (TypeError, ValueError, RecursionError):
+                        append(UNHASHABLE)
+            self._columns[key] = cells
+        return cells
+
+    def row(self, index):
+        row = self._rows.get(index)
+        if row is None:
+            row = self._rows[index] = NormalizedConf(self.confs[index])
+        return row
@@ -0,0 +1,100 @@
+"""
+Opt-in timing instrumentation for the One Platform custom checks
+One Platform Infrastructure - Security Policies
+
+Set CHECKOV_POLICY_TIMING to a file path before Checkov (or any tool that
+loads the policy modules) starts, and every CKV_OP_* check records its
+invocation count, latency and the resource types it ran against. The
+summary is written to that path as JSON when the process exits;
+scripts/checkov-scan.sh --timing merges it into the report next to
+``results``.
+
+Latency is the time spent in the check's own predicate. Rules computed by
+a RuleSet's fused evaluator share one pass, whose time is split evenly
+between them (see RuleSet.evaluate_timed). When the variable is unset the
+checks are generated without any of this and pay nothing.
+"""
+
+import atexit
+import json
+import math
+import os
+import threading
+from array import array
+
+TIMING_ENV_VAR = "CHECKOV_POLICY_TIMING"
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+class CheckTimings:
+    """Thread-safe per-check counters and latency samples (seconds)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # check_id -> [invocations, total seconds, samples, resource types]
+        self._stats = {}
+
+    def record(self, check_id, elapsed, resource_type=None):
+        with self._lock:
+            stats = self._stats.get(check_id)
+            if stats is None:
+                stats = self._stats[check_id] = [0, 0.0, array("d"), set()]
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2].append(elapsed)
+            if resource_type:
+                stats[3].add(resource_type)
+
+    def summary(self):
+        """{check_id: {invocations, total_ms, mean_ms, p95_ms, max_ms, resource_types}}"""
+        with self._lock:
+            snapshot = {check_id: (count, total, sorted(samples), sorted(types))
+                        for check_id, (count, total, samples, types) in self._stats.items()}
+        summary = {}
+        for check_id, (count, total, samples, types) in sorted(snapshot.items()):
+            summary[check_id] = {
+                "invocations": count,
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total * 1000 / count, 4),
+                "p95_ms": round(percentile(samples, 95) * 1000, 4),
+                "max_ms": round(samples[-1] * 1000, 4),
+                "resource_types": types,
+            }
+        return summary
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+def percentile(sorted_samples, percent):
+    """Nearest-rank percentile of an ascending sequence"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def enable(path=None):
+    """
+    Start recording and return the recorder.
+
+    Must be called before the policy modules are imported. With a path, the
+    summary is written there at interpreter exit.
+    """
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = CheckTimings()
+            if path:
+                atexit.register(_recorder.write, path)
+    return _recorder
+
+
+def recorder():
+    """The active recorder, enabling it from CHECKOV_POLICY_TIMING on first use; None when off"""
+    if _recorder is None and os.environ.get(TIMING_ENV_VAR):
+        enable(os.environ[TIMING_ENV_VAR])
+    return _recorder
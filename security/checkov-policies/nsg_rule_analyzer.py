@@ -0,0 +1,400 @@
+"""
+NSG security rule analyzer
+One Platform Infrastructure - Security Policies
+
+Normalises azurerm_network_security_group security_rule blocks into integer
+intervals (addresses and ports) and walks them in priority order to find:
+
+- shadowed rules: fully covered by a higher-priority rule with the opposite access
+- redundant rules: fully covered by a higher-priority rule with the same access
+- effectively open rules: inbound Allow rules from the internet that are reachable
+
+Coverage is tested rule against rule. Candidate covering rules are looked up
+through destination port, source and destination indexes (single values in a
+dict, distinct intervals sorted by start, '*' in a bucket of its own), taking
+the most selective one, and tried in priority order so that a rule stops at
+its first covering rule. Rules that match the same ports and addresses and
+differ only in protocol or source ports are still compared pairwise.
+"""
+
+import bisect
+import heapq
+import ipaddress
+from functools import lru_cache
+from itertools import accumulate
+from operator import itemgetter
+
+PORT_MAX = 65535
+PROTOCOLS = frozenset(["tcp", "udp", "icmp", "esp", "ah"])
+WILDCARDS = frozenset(["*", "any"])
+INTERNET_TAGS = frozenset(["internet"])
+INTERNET_SOURCES = WILDCARDS | INTERNET_TAGS | frozenset(["0.0.0.0/0", "::/0"])
+REFERENCE_PREFIXES = ("var.", "local.", "module.", "data.", "each.")
+FULL_RANGES = {4: (4, 0, 2 ** 32 - 1), 6: (6, 0, 2 ** 128 - 1)}
+
+
+class Unresolved(ValueError):
+    """A rule attribute that cannot be analysed statically (e.g. a variable)"""
+
+
+def _unwrap(value):
+    """Checkov wraps scalars in single-item lists"""
+    if isinstance(value, list) and len(value) == 1 and not isinstance(value[0], (list, dict)):
+        return value[0]
+    return value
+
+
+def _values(rule, single, plural):
+    """Items of the singular attribute and its *_ranges / *_prefixes list"""
+    items = []
+    for key in (single, plural):
+        value = rule.get(key)
+        if isinstance(value, list):
+            if len(value) == 1 and isinstance(value[0], list):
+                value = value[0]
+            items.extend(value)
+        elif value is not None:
+            items.append(value)
+    return [item for item in items if item not in (None, "")]
+
+
+def _required(rule, single, plural):
+    values = _values(rule, single, plural)
+    if not values:
+        raise Unresolved(single)
+    return values
+
+
+def merge(ranges):
+    """Sort and merge overlapping or adjacent closed intervals"""
+    merged = []
+    for item in sorted(ranges):
+        if merged and merged[-1][:-2] == item[:-2] and item[-2] <= merged[-1][-1] + 1:
+            if item[-1] > merged[-1][-1]:
+                merged[-1] = merged[-1][:-1] + (item[-1],)
+        else:
+            merged.append(item)
+    return tuple(merged)
+
+
+def covers(outer, inner):
+    """Whether every interval of inner lies in one interval of outer (both merged)"""
+    for item in inner:
+        index = bisect.bisect_right(outer, item[:-1] + (float("inf"),)) - 1
+        if index < 0:
+            return False
+        candidate = outer[index]
+        if candidate[:-2] != item[:-2] or candidate[-1] < item[-1]:
+            return False
+    return True
+
+
+@lru_cache(maxsize=4096)
+def parse_port(value):
+    """A port, port range or '*' as an inclusive (start, end) interval"""
+    text = str(value).strip()
+    if text in WILDCARDS:
+        return (0, PORT_MAX)
+    start, _, end = text.partition("-")
+    try:
+        start, end = int(start), int(end or start)
+    except ValueError:
+        raise Unresolved(f"port '{text}'") from None
+    if not 0 <= start <= end <= PORT_MAX:
+        raise Unresolved(f"port '{text}'")
+    return (start, end)
+
+
+@lru_cache(maxsize=4096)
+def parse_address(value):
+    """
+    An address prefix as ('range', (version, start, end)), ('any', None)
+    or ('tag', name) for service tags such as Internet or VirtualNetwork
+    """
+    text = str(value).strip()
+    lowered = text.lower()
+    if lowered in WILDCARDS:
+        return ("any", None)
+    try:
+        network = ipaddress.ip_network(text, strict=False)
+    except ValueError:
+        # Service tags look like "Internet" or "Storage.WestEurope"; anything
+        # else (variables, interpolations, malformed IPs) cannot be analysed
+        if not text or text[0].isdigit() or lowered.startswith(REFERENCE_PREFIXES) or any(
+                char in text for char in "${}()[] /:"):
+            raise Unresolved(f"address '{text}'") from None
+        return ("tag", lowered)
+    return ("range", (network.version, int(network.network_address), int(network.broadcast_address)))
+
+
+def _ports(values):
+    return merge(parse_port(value) for value in values)
+
+
+class AddressSet:
+    """Union of CIDR intervals and service tags; '*' matches everything"""
+
+    __slots__ = ("any", "ranges", "tags")
+
+    def __init__(self, values):
+        self.any = False
+        ranges, tags = [], set()
+        for value in values:
+            kind, parsed = parse_address(value)
+            if kind == "any":
+                self.any = True
+            elif kind == "range":
+                ranges.append(parsed)
+            else:
+                tags.add(parsed)
+        self.ranges = merge(ranges)
+        self.tags = frozenset(tags)
+
+    def covers(self, other):
+        if self.any:
+            return True
+        if other.any or not other.tags <= self.tags:
+            return False
+        return covers(self.ranges, other.ranges)
+
+    @property
+    def internet(self):
+        """Whether the set includes every internet source"""
+        if self.any or self.tags & INTERNET_TAGS:
+            return True
+        return any(covers(self.ranges, (full,)) for full in FULL_RANGES.values())
+
+
+class SecurityRule:
+    """One normalised security rule"""
+
+    __slots__ = ("name", "priority", "direction", "allow", "protocols",
+                 "sources", "source_ports", "destinations", "destination_ports", "order")
+
+    def __init__(self, rule, order):
+        self.order = order
+        self.name = str(_unwrap(rule.get("name")) or f"rule[{order}]")
+        try:
+            self.priority = int(_unwrap(rule.get("priority")))
+        except (TypeError, ValueError):
+            raise Unresolved("priority") from None
+        self.direction = str(_unwrap(rule.get("direction"))).lower()
+        access = str(_unwrap(rule.get("access"))).lower()
+        if self.direction not in ("inbound", "outbound") or access not in ("allow", "deny"):
+            raise Unresolved("direction/access")
+        self.allow = access == "allow"
+
+        protocol = str(_unwrap(rule.get("protocol"))).lower()
+        if protocol in WILDCARDS:
+            self.protocols = PROTOCOLS
+        elif protocol in PROTOCOLS:
+            self.protocols = frozenset([protocol])
+        else:
+            raise Unresolved(f"protocol '{protocol}'")
+
+        self.sources = AddressSet(_required(rule, "source_address_prefix", "source_address_prefixes"))
+        self.destinations = AddressSet(_required(rule, "destination_address_prefix", "destination_address_prefixes"))
+        self.source_ports = _ports(_required(rule, "source_port_range", "source_port_ranges"))
+        self.destination_ports = _ports(_required(rule, "destination_port_range", "destination_port_ranges"))
+
+    @property
+    def access(self):
+        return "Allow" if self.allow else "Deny"
+
+    def covers(self, other):
+        """Whether every packet matched by other is also matched by this rule"""
+        return (other.protocols <= self.protocols
+                and covers(self.destination_ports, other.destination_ports)
+                and covers(self.source_ports, other.source_ports)
+                and self.sources.covers(other.sources)
+                and self.destinations.covers(other.destinations))
+
+
+def _before(bucket, position):
+    """Number of (position, rule) entries of a bucket walked before position"""
+    return bisect.bisect_left(bucket, (position,))
+
+
+class IntervalBuckets:
+    """
+    (position, rule) buckets keyed by closed interval, sorted by start with a
+    running maximum of the ends so that a containment lookup stops early
+    """
+
+    def __init__(self, by_interval):
+        self.intervals = sorted(by_interval)
+        self.buckets = [by_interval[interval] for interval in self.intervals]
+        self.starts = [start for start, _ in self.intervals]
+        self.max_ends = list(accumulate((end for _, end in self.intervals), max))
+
+    def containing(self, start, end):
+        """Buckets whose interval contains start-end"""
+        index = bisect.bisect_right(self.starts, start)
+        while index > 0 and self.max_ends[index - 1] >= end:
+            index -= 1
+            if self.intervals[index][1] >= end:
+                yield self.buckets[index]
+
+
+class PortIndex:
+    """Rules by the destination ports they match; '*' rules sit in a bucket of their own"""
+
+    def __init__(self, entries):
+        self.full = []
+        self.by_port = {}
+        by_range = {}
+        for entry in entries:
+            for start, end in entry[1].destination_ports:
+                if (start, end) == (0, PORT_MAX):
+                    self.full.append(entry)
+                elif start == end:
+                    self.by_port.setdefault(start, []).append(entry)
+                else:
+                    by_range.setdefault((start, end), []).append(entry)
+        self.ranges = IntervalBuckets(by_range)
+
+    def buckets(self, rule):
+        """Buckets of the rules whose destination ports include the first ports of rule"""
+        start, end = rule.destination_ports[0]
+        buckets = [self.full]
+        if start == end and start in self.by_port:
+            buckets.append(self.by_port[start])
+        buckets.extend(self.ranges.containing(start, end))
+        return buckets
+
+
+class AddressIndex:
+    """Rules by the source or destination addresses they match; '*' rules sit in a bucket of their own"""
+
+    def __init__(self, entries, attribute):
+        self.attribute = attribute
+        self.any = []
+        self.by_tag = {}
+        by_range = {}
+        for entry in entries:
+            addresses = getattr(entry[1], attribute)
+            if addresses.any:
+                self.any.append(entry)
+                continue
+            for tag in addresses.tags:
+                self.by_tag.setdefault(tag, []).append(entry)
+            for version, start, end in addresses.ranges:
+                by_range.setdefault(version, {}).setdefault((start, end), []).append(entry)
+        self.ranges = {version: IntervalBuckets(buckets) for version, buckets in by_range.items()}
+
+    def buckets(self, rule):
+        """Buckets of the rules whose addresses include the first address of rule"""
+        addresses = getattr(rule, self.attribute)
+        buckets = [self.any]
+        if addresses.any:
+            return buckets
+        if addresses.ranges:
+            version, start, end = addresses.ranges[0]
+            if version in self.ranges:
+                buckets.extend(self.ranges[version].containing(start, end))
+        elif addresses.tags:
+            buckets.append(self.by_tag.get(min(addresses.tags), []))
+        return buckets
+
+
+class RuleIndex:
+    """
+    The rules of one direction in walk order, looked up by destination port,
+    source address and destination address
+
+    A covering rule has to include the first destination ports, the first
+    source and the first destination of the rule it covers, so candidates
+    come from whichever of the three indexes holds the fewest rules walked
+    before it, in walk order.
+    """
+
+    def __init__(self, rules):
+        entries = list(enumerate(rules))
+        self.indexes = (PortIndex(entries), AddressIndex(entries, "sources"), AddressIndex(entries, "destinations"))
+
+    def candidates(self, position, rule):
+        """Rules walked before position that may cover rule, in walk order"""
+        buckets = min((index.buckets(rule) for index in self.indexes),
+                      key=lambda buckets: sum(_before(bucket, position) for bucket in buckets))
+        # Intervals of a rule are merged, so a rule sits in one bucket of a lookup at most
+        for seen, candidate in heapq.merge(*buckets, key=itemgetter(0)):
+            if seen >= position:
+                return
+            yield candidate
+
+
+class Finding:
+    """A shadowed, redundant, effectively open or unanalysable rule"""
+
+    __slots__ = ("kind", "rule", "by", "message")
+
+    def __init__(self, kind, rule, message, by=None):
+        self.kind = kind
+        self.rule = rule
+        self.by = by
+        self.message = message
+
+    def __repr__(self):
+        return f"{self.kind}: {self.message}"
+
+
+def normalise(security_rules):
+    """Parse security_rule blocks into (rules, unresolved findings)"""
+    if security_rules is None:
+        return [], []
+    if not isinstance(security_rules, list):
+        security_rules = [security_rules]
+    rules, unresolved = [], []
+    for order, block in enumerate(security_rules):
+        if not isinstance(block, dict):
+            continue
+        try:
+            rules.append(SecurityRule(block, order))
+        except Unresolved as error:
+            name = _unwrap(block.get("name")) or f"rule[{order}]"
+            unresolved.append(Finding("unresolved", name, f"Rule '{name}' not analysed: unresolved {error}"))
+            if _literal_internet_allow(block):
+                unresolved.append(Finding(
+                    "open", name, message=f"Rule '{name}' allows inbound access from the internet"))
+    return rules, unresolved
+
+
+def _literal_internet_allow(block):
+    """Fallback for rules that cannot be normalised: inbound Allow from a literal internet source"""
+    if str(_unwrap(block.get("direction"))).lower() != "inbound":
+        return False
+    if str(_unwrap(block.get("access"))).lower() != "allow":
+        return False
+    sources = _values(block, "source_address_prefix", "source_address_prefixes")
+    return any(str(source).strip().lower() in INTERNET_SOURCES for source in sources)
+
+
+def analyze(security_rules):
+    """Findings for a list of security_rule blocks, in priority order"""
+    rules, findings = normalise(security_rules)
+    walks = {"inbound": [], "outbound": []}
+    for rule in sorted(rules, key=lambda r: (r.priority, r.order)):
+        walks[rule.direction].append(rule)
+
+    for walk in walks.values():
+        index = RuleIndex(walk)
+        for position, rule in enumerate(walk):
+            # Candidates come in priority order: the first covering rule is the effective one
+            covering = next((candidate for candidate in index.candidates(position, rule)
+                             if candidate.covers(rule)), None)
+            if covering is not None:
+                if covering.allow == rule.allow:
+                    findings.append(Finding(
+                        "redundant", rule.name, by=covering.name,
+                        message=f"Rule '{rule.name}' ({rule.priority}) is redundant with "
+                                f"'{covering.name}' ({covering.priority})"))
+                else:
+                    findings.append(Finding(
+                        "shadowed", rule.name, by=covering.name,
+                        message=f"Rule '{rule.name}' ({rule.priority} {rule.access}) is shadowed by "
+                                f"'{covering.name}' ({covering.priority} {covering.access})"))
+            elif rule.allow and rule.direction == "inbound" and rule.sources.internet:
+                findings.append(Finding(
+                    "open", rule.name,
+                    message=f"Rule '{rule.name}' ({rule.priority}) allows inbound access from the internet"))
+    return findings
@@ -0,0 +1,192 @@
+"""
+Parallel evaluation of the One Platform custom checks
+One Platform Infrastructure - Security Policies
+
+Loads the policy modules in this directory and runs their checks over many
+resource confs with a thread or process pool. Checks are evaluated through
+their stateless ``evaluate(conf)`` method (see rule_engine.py), so results
+are identical to a serial run and come back in input order.
+
+Resources are ``(resource_id, resource_type, conf)`` tuples; results are
+``(resource_id, check_id, CheckResult, details)`` tuples.
+
+``evaluate_batched`` groups resources by type and runs each check over a whole
+group at once through the checks' ``evaluate_batch`` (see rule_engine.py),
+which evaluates predicates once per distinct attribute value instead of once
+per resource. Results are the same as, and in the order of, a serial run.
+
+Policy modules can be loaded selectively through the resource type index
+(see policy_index.py): ``load_checks(resource_types=...)`` imports only the
+modules for known types, and ``LazyChecks`` imports them on first lookup.
+"""
+
+import importlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from policy_index import POLICIES_DIR, load_index, modules_for, policy_modules
+
+# Resources handed to a worker per task
+DEFAULT_CHUNK_SIZE = 64
+
+# Checks of the current worker process (process mode), loaded by _init_worker
+_worker_checks = None
+
+
+def _import_checks(policies_dir, names, resource_types=None):
+    """{resource_type: [check, ...]} for the checks of the named policy modules"""
+    if policies_dir not in sys.path:
+        sys.path.insert(0, policies_dir)
+    checks_by_type = {}
+    for name in names:
+        module = importlib.import_module(name)
+        for check in getattr(module, "checks", ()):
+            for resource_type in check.supported_resources:
+                if resource_types is None or resource_type in resource_types:
+                    checks_by_type.setdefault(resource_type, []).append(check)
+    return checks_by_type
+
+
+def load_checks(policies_dir=POLICIES_DIR, resource_types=None):
+    """
+    {resource_type: [check, ...]} for every check of every policy module, or
+    only for the given resource types (importing just the modules that check them)
+    """
+    if resource_types is None:
+        return _import_checks(policies_dir, policy_modules(policies_dir))
+    resource_types = set(resource_types)
+    names = modules_for(load_index(policies_dir), resource_types)
+    return _import_checks(policies_dir, names, resource_types)
+
+
+class LazyChecks(dict):
+    """
+    {resource_type: [check, ...]} that imports the policy modules for a
+    resource type the first time it is looked up, for inputs whose resource
+    types are not known up front (streamed plans)
+    """
+
+    def __init__(self, policies_dir=POLICIES_DIR):
+        super().__init__()
+        self.policies_dir = policies_dir
+        self._index = load_index(policies_dir)
+
+    def __missing__(self, resource_type):
+        names = modules_for(self._index, [resource_type])
+        checks = _import_checks(self.policies_dir, names, {resource_type}).get(resource_type, [])
+        self[resource_type] = checks
+        return checks
+
+    def get(self, resource_type, default=None):
+        return self[resource_type] or default
+
+
+def evaluate_resource(checks_by_type, resource_id, resource_type, conf):
+    """Results of every check that applies to one resource"""
+    results = []
+    for check in checks_by_type.get(resource_type, ()):
+        result, details = check.evaluate(conf)
+        results.append((resource_id, check.id, result, details))
+    return results
+
+
+def evaluate_serial(resources, checks_by_type):
+    """Reference serial evaluation"""
+    results = []
+    for resource_id, resource_type, conf in resources:
+        results.extend(evaluate_resource(checks_by_type, resource_id, resource_type, conf))
+    return results
+
+
+def evaluate_batched(resources, checks_by_type):
+    """Serial results computed one resource type at a time with the batch API"""
+    resources = list(resources)
+    groups = {}
+    for index, (_, resource_type, conf) in enumerate(resources):
+        indices, confs = groups.setdefault(resource_type, ([], []))
+        indices.append(index)
+        confs.append(conf)
+
+    per_resource = [None] * len(resources)
+    for resource_type, (indices, confs) in groups.items():
+        checks = checks_by_type.get(resource_type, ())
+        check_ids = [check.id for check in checks]
+        # Transpose the per-check columns back into per-resource verdict rows
+        rows = zip(*(check.evaluate_batch(confs) for check in checks)) if checks else ([] for _ in indices)
+        for index, verdicts in zip(indices, rows):
+            per_resource[index] = (check_ids, verdicts)
+
+    results = []
+    for (resource_id, _, _), (check_ids, verdicts) in zip(resources, per_resource):
+        results.extend((resource_id, check_id, result, details)
+                       for check_id, (result, details) in zip(check_ids, verdicts))
+    return results
+
+
+def _evaluate_chunk(checks_by_type, chunk):
+    results = []
+    for resource_id, resource_type, conf in chunk:
+        results.extend(evaluate_resource(checks_by_type, resource_id, resource_type, conf))
+    return results
+
+
+def _init_worker(policies_dir):
+    global _worker_checks
+    _worker_checks = load_checks(policies_dir)
+
+
+def _evaluate_chunk_in_worker(chunk):
+    return _evaluate_chunk(_worker_checks, chunk)
+
+
+def _chunks(resources, size):
+    chunk = []
+    for resource in resources:
+        chunk.append(resource)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ParallelEvaluator:
+    """
+    Runs the custom checks over resource confs in a worker pool
+
+    ``mode`` is "thread" (shares the loaded checks, cheap to start) or
+    "process" (each worker imports the policy modules itself; confs and
+    results are pickled, so it only pays off for large inputs).
+    """
+
+    def __init__(self, policies_dir=POLICIES_DIR, workers=None, mode="thread", chunk_size=DEFAULT_CHUNK_SIZE):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown mode '{mode}', use 'thread' or 'process'")
+        self.policies_dir = policies_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self._checks = None
+
+    @property
+    def checks_by_type(self):
+        if self._checks is None:
+            self._checks = load_checks(self.policies_dir)
+        return self._checks
+
+    def evaluate(self, resources):
+        """Evaluate every resource; results are in the same order as a serial run"""
+        chunks = _chunks(resources, self.chunk_size)
+        results = []
+        if self.mode == "thread":
+            checks_by_type = self.checks_by_type
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for chunk_results in pool.map(lambda chunk: _evaluate_chunk(checks_by_type, chunk), chunks):
+                    results.extend(chunk_results)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.policies_dir,)) as pool:
+                for chunk_results in pool.map(_evaluate_chunk_in_worker, chunks):
+                    results.extend(chunk_results)
+        return results
@@ -0,0 +1,99 @@
+"""
+Central policy configuration for One Platform custom Checkov checks
+One Platform Infrastructure - Security Policies
+
+Approved regions, SKUs and required tags live in security/policy-config.yaml,
+next to this directory rather than in it: Checkov parses every YAML/JSON file
+of the external checks directory as a custom policy. The file is read once,
+on first use, and exposed as frozensets and dicts so checks do O(1) lookups
+instead of rebuilding list literals.
+
+Regions have a canonical programmatic name ("westeurope") and a display name
+("West Europe"); both forms are accepted wherever a region is checked.
+"""
+
+import os
+import threading
+
+# Resolved through the symlink when the module is staged by policy_index.stage()
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "policy-config.yaml")
+
+_config = None
+_config_lock = threading.Lock()
+
+
+def _region_key(value):
+    """Lookup key shared by both region forms: lowercase, no whitespace"""
+    return "".join(value.split()).lower()
+
+
+class PolicyConfig:
+    """
+    Read-only view of policy-config.yaml
+    """
+
+    def __init__(self, data):
+        regions = data.get("regions") or {}
+        # programmatic name -> display name, and the reverse
+        self.region_display_names = {str(name): str(display) for name, display in regions.items()}
+        self.region_names = {display: name for name, display in self.region_display_names.items()}
+        self.approved_regions = frozenset(self.region_display_names.values())
+        self.approved_region_names = frozenset(self.region_display_names)
+
+        self._region_lookup = {}
+        for name, display in self.region_display_names.items():
+            self._region_lookup[_region_key(name)] = name
+            self._region_lookup[_region_key(display)] = name
+
+        self.skus = {
+            service: frozenset(str(sku) for sku in skus)
+            for service, skus in (data.get("skus") or {}).items()
+        }
+        self._sku_lookup = {
+            service: frozenset(sku.casefold() for sku in skus)
+            for service, skus in self.skus.items()
+        }
+
+        # Kept as a tuple as well so messages list missing tags in a stable order
+        self.required_tags = tuple(str(tag) for tag in data.get("required_tags") or ())
+        self.required_tag_set = frozenset(self.required_tags)
+
+    def canonical_region(self, value):
+        """Programmatic name of an approved region given either form, else None"""
+        if not isinstance(value, str):
+            return None
+        return self._region_lookup.get(_region_key(value))
+
+    def display_region(self, value):
+        """Display name of an approved region given either form, else None"""
+        name = self.canonical_region(value)
+        return None if name is None else self.region_display_names[name]
+
+    def is_approved_region(self, value):
+        return self.canonical_region(value) is not None
+
+    def approved_skus(self, service):
+        return self.skus.get(service, frozenset())
+
+    def is_approved_sku(self, service, value):
+        if not isinstance(value, str):
+            return False
+        return value.casefold() in self._sku_lookup.get(service, ())
+
+
+def load_policy_config(path=CONFIG_PATH):
+    """Read a policy configuration file"""
+    import yaml
+
+    with open(path, "r") as f:
+        return PolicyConfig(yaml.safe_load(f) or {})
+
+
+def get_policy_config():
+    """The shared policy configuration, loaded on first use"""
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                _config = load_policy_config()
+    return _config
@@ -0,0 +1,195 @@
+"""
+Resource type index of the One Platform policy modules
+One Platform Infrastructure - Security Policies
+
+Checkov imports every module of the external checks directory and
+instantiates every check at startup, whatever the scanned resources are. The
+index maps each resource type to the policy modules (and CKV_OP_* IDs) that
+check it, so loaders can import only what a scan needs:
+
+- ``parallel_evaluator.load_checks(resource_types=...)`` and ``LazyChecks``
+  import policy modules on demand (scripts/run-custom-checks.py)
+- ``stage()`` builds a directory holding the helper modules and only the
+  relevant policy modules, which checkov-scan.sh passes to Checkov as
+  --external-checks-dir
+
+The index is stored in security/policy-index.json (outside this directory,
+which Checkov also scans for JSON/YAML policies, like security/policy-config.yaml)
+together with the SHA-256 of
+every policy module. It is rebuilt whenever a module is added, removed or
+edited, so a stale index never hides a check.
+
+    python3 policy_index.py build                    # regenerate the index
+    python3 policy_index.py stage SCAN_DIR OUT_DIR   # stage checks for a scan
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import re
+import sys
+
+POLICIES_DIR = os.path.dirname(os.path.abspath(__file__))
+POLICY_MODULE_PATTERN = ("azure_", "_checks.py")
+INDEX_FILENAME = "policy-index.json"
+
+RESOURCE_TYPE = re.compile(r'^\s*resource\s+"([A-Za-z0-9_-]+)"', re.MULTILINE)
+
+
+def default_index_path(policies_dir=POLICIES_DIR):
+    """The index lives next to the policies directory, e.g. security/policy-index.json"""
+    return os.path.join(os.path.dirname(os.path.abspath(policies_dir)), INDEX_FILENAME)
+
+
+def policy_modules(policies_dir=POLICIES_DIR):
+    """Names of the policy modules in a directory"""
+    prefix, suffix = POLICY_MODULE_PATTERN
+    return sorted(name[:-3] for name in os.listdir(policies_dir)
+                  if name.startswith(prefix) and name.endswith(suffix))
+
+
+def module_digests(policies_dir=POLICIES_DIR):
+    """{module name: SHA-256 of its source}"""
+    digests = {}
+    for name in policy_modules(policies_dir):
+        with open(os.path.join(policies_dir, name + ".py"), "rb") as f:
+            digests[name] = hashlib.sha256(f.read()).hexdigest()
+    return digests
+
+
+def build_index(policies_dir=POLICIES_DIR):
+    """
+    Import every policy module and record the resource types and check IDs it declares.
+
+    Call rule_engine.use_standalone_checks() first when running outside Checkov.
+    """
+    if policies_dir not in sys.path:
+        sys.path.insert(0, policies_dir)
+    modules = {}
+    resource_types = {}
+    for name, digest in module_digests(policies_dir).items():
+        module = importlib.import_module(name)
+        checks = list(getattr(module, "checks", ()))
+        types = sorted({resource_type for check in checks for resource_type in check.supported_resources})
+        modules[name] = {
+            "sha256": digest,
+            "resource_types": types,
+            "checks": [check.id for check in checks],
+        }
+        for resource_type in types:
+            resource_types.setdefault(resource_type, []).append(name)
+    return {"modules": modules, "resource_types": resource_types}
+
+
+def is_current(index, policies_dir=POLICIES_DIR):
+    """Whether the index was built from the policy modules as they are now"""
+    recorded = {name: entry.get("sha256") for name, entry in (index or {}).get("modules", {}).items()}
+    return recorded == module_digests(policies_dir)
+
+
+def write_index(index, path):
+    with open(path, "w") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_index(policies_dir=POLICIES_DIR, path=None):
+    """The stored index, rebuilt (and saved when possible) if it is missing or stale"""
+    path = path or default_index_path(policies_dir)
+    try:
+        with open(path, "r") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = None
+    if index is not None and is_current(index, policies_dir):
+        return index
+
+    index = build_index(policies_dir)
+    try:
+        write_index(index, path)
+    except OSError:
+        pass
+    return index
+
+
+def modules_for(index, resource_types):
+    """Policy modules that check any of the given resource types"""
+    names = set()
+    for resource_type in resource_types:
+        names.update(index["resource_types"].get(resource_type, ()))
+    return sorted(names)
+
+
+def resource_types_in(paths):
+    """Resource types declared by the .tf files under the given paths"""
+    types = set()
+    for path in paths:
+        if os.path.isfile(path):
+            files = [path]
+        else:
+            files = [os.path.join(root, name)
+                     for root, dirs, names in os.walk(path)
+                     if ".terraform" not in root.split(os.sep)
+                     for name in names if name.endswith(".tf")]
+        for file_path in files:
+            with open(file_path, "r", errors="replace") as f:
+                types.update(RESOURCE_TYPE.findall(f.read()))
+    return types
+
+
+def stage(resource_types, out_dir, policies_dir=POLICIES_DIR, index=None):
+    """
+    Populate out_dir with symlinks to the helper modules of policies_dir and the
+    policy modules for resource_types; return the staged policy module names.
+
+    Only Python files are staged: Checkov would parse any YAML/JSON file as a
+    custom policy.
+    """
+    index = index or load_index(policies_dir)
+    selected = modules_for(index, resource_types)
+    all_modules = set(policy_modules(policies_dir))
+    os.makedirs(out_dir, exist_ok=True)
+    for name in sorted(os.listdir(policies_dir)):
+        source = os.path.join(policies_dir, name)
+        if not os.path.isfile(source) or not name.endswith(".py"):
+            continue
+        if name[:-3] in all_modules and name[:-3] not in selected:
+            continue
+        target = os.path.join(out_dir, name)
+        if not os.path.lexists(target):
+            os.symlink(source, target)
+    return selected
+
+
+def main():
+    usage = ("Usage: policy_index.py build [INDEX_PATH]\n"
+             "       policy_index.py stage SCAN_PATH OUT_DIR")
+    if len(sys.argv) < 2 or sys.argv[1] not in ("build", "stage"):
+        print(usage, file=sys.stderr)
+        return 1
+
+    # Outside Checkov: generate lightweight check classes for indexing
+    sys.path.insert(0, POLICIES_DIR)
+    import rule_engine
+    rule_engine.use_standalone_checks()
+
+    if sys.argv[1] == "build":
+        path = sys.argv[2] if len(sys.argv) > 2 else default_index_path()
+        index = build_index()
+        write_index(index, path)
+        print(f"Indexed {len(index['modules'])} policy modules, "
+              f"{len(index['resource_types'])} resource types -> {path}")
+        return 0
+
+    if len(sys.argv) != 4:
+        print(usage, file=sys.stderr)
+        return 1
+    scan_path, out_dir = sys.argv[2], sys.argv[3]
+    selected = stage(resource_types_in([scan_path]), out_dir)
+    print(f"{len(selected)}/{len(policy_modules())} policy modules: {' '.join(selected) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Opt-in memoization of the One Platform custom check results
+One Platform Infrastructure - Security Policies
+
+The same module configuration is evaluated over and over: one module backs
+several components, and identical confs repeat across stacks. Set
+CHECKOV_POLICY_CACHE to a file path before Checkov (or any tool that loads
+the policy modules) starts, and every CKV_OP_* check looks its verdict up by
+a fingerprint of the normalised conf (see conf_accessor.fingerprint) before
+evaluating anything. Verdicts live in an LRU cache of
+CHECKOV_POLICY_CACHE_SIZE entries (default 100000) that is loaded from that
+path on first use and written back when the process exits, so repeated
+identical resources cost a dictionary lookup, across runs too.
+
+Keys also carry the check ID and a digest of the policy sources the check
+depends on (its module, the shared helpers and security/policy-config.yaml), so
+editing a policy never serves a stale verdict. Only the process that
+enabled the cache writes it: worker processes read the inherited entries
+but their new ones are lost. When the variable is unset the checks are
+generated without any of this and pay nothing.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from checkov.common.models.enums import CheckResult
+
+CACHE_ENV_VAR = "CHECKOV_POLICY_CACHE"
+CACHE_SIZE_ENV_VAR = "CHECKOV_POLICY_CACHE_SIZE"
+DEFAULT_MAX_ENTRIES = 100000
+FORMAT_VERSION = 1
+
+# Files, relative to the policy modules, that every check's verdicts depend on
+SHARED_SOURCES = ("rule_engine.py", "conf_accessor.py", "terraform_expressions.py",
+                  "nsg_rule_analyzer.py", "policy_config.py", os.path.join(os.pardir, "policy-config.yaml"))
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class ResultCache:
+    """
+    Thread-safe LRU map of cache key -> (CheckResult, details)
+
+    Lookups and inserts take all the keys of one conf at once; hits and misses
+    count confs.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_all(self, keys):
+        """The verdicts of all keys, or None (one miss) unless every key is cached"""
+        with self._lock:
+            entries = self._entries
+            verdicts = []
+            for key in keys:
+                verdict = entries.get(key)
+                if verdict is None:
+                    self.misses += 1
+                    return None
+                verdicts.append(verdict)
+            self.hits += 1
+            for key in keys:
+                entries.move_to_end(key)
+            return verdicts
+
+    def put_all(self, items):
+        with self._lock:
+            entries = self._entries
+            for key, verdict in items:
+                entries[key] = verdict
+                entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def load(self, path):
+        """Add the entries of a cache file; a missing or unreadable file is an empty cache"""
+        try:
+            with open(path, "r") as f:
+                document = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(document, dict) or document.get("format") != FORMAT_VERSION:
+            return
+        with self._lock:
+            for key, result, details in document.get("entries", [])[-self.max_entries:]:
+                if result in CheckResult.__members__:
+                    self._entries[key] = (CheckResult[result], details)
+                    self._entries.move_to_end(key)
+
+    def write(self, path):
+        """Persist the entries, least recently used first, replacing the file atomically"""
+        with self._lock:
+            entries = [[key, result.name, details] for key, (result, details) in self._entries.items()]
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"format": FORMAT_VERSION, "entries": entries}, f, separators=(",", ":"))
+        os.replace(temporary, path)
+
+
+def policy_version(module_file):
+    """Digest of a policy module and the shared sources next to it"""
+    digest = hashlib.blake2b(digest_size=8)
+    directory = os.path.dirname(os.path.realpath(module_file))
+    for path in (os.path.realpath(module_file),) + tuple(os.path.join(directory, name) for name in SHARED_SOURCES):
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b"-")
+    return digest.hexdigest()
+
+
+def enable(path=None, max_entries=None):
+    """
+    Start memoizing and return the cache.
+
+    Must be called before the policy modules are imported. With a path, the
+    cache is loaded from it now and written back at interpreter exit.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            if max_entries is None:
+                max_entries = int(os.environ.get(CACHE_SIZE_ENV_VAR) or DEFAULT_MAX_ENTRIES)
+            _cache = ResultCache(max_entries)
+            if path:
+                _cache.load(path)
+                atexit.register(_cache.write, path)
+    return _cache
+
+
+def result_cache():
+    """The active cache, enabling it from CHECKOV_POLICY_CACHE on first use; None when off"""
+    if _cache is None and os.environ.get(CACHE_ENV_VAR):
+        enable(os.environ[CACHE_ENV_VAR])
+    return _cache
@@ -0,0 +1,592 @@
+"""
+Declarative rule engine for One Platform custom Checkov checks
+One Platform Infrastructure - Security Policies
+
+Each policy module describes its checks as a RuleSet: a table of rules built
+from the predicate factories below (or from small module-level functions for
+component-specific logic). Factories run once at load time and return
+closures that take a NormalizedConf and return ``(CheckResult, details)``.
+
+``register_checks`` turns every rule into a BaseResourceCheck subclass with
+the rule's class name and CKV_OP_* ID, so reports and skip lists are
+unchanged. All rules of a RuleSet are evaluated together in a single pass over
+each resource's conf; the individual checks then only look up their verdict.
+
+Predicates are pure functions of the conf and every check exposes
+``evaluate(conf) -> (result, details)``, which keeps no per-resource state, so
+checks can be run concurrently (see parallel_evaluator.py). A predicate that
+raises only fails its own check: the pass records the error in place of the
+verdict and the owning check re-raises it.
+
+``evaluate_batch(confs)`` evaluates many resources of one type at once:
+predicates that declare the attributes they read (``reads``; every factory
+below does) are run once per distinct combination of those attribute values
+over a columnar view of the batch, and the verdicts are mapped back to each
+resource.
+
+With CHECKOV_POLICY_TIMING set, the generated checks also record their
+invocations and predicate latency (see instrumentation.py). With
+CHECKOV_POLICY_CACHE set, they look their verdicts up by conf fingerprint
+before evaluating (see result_cache.py).
+"""
+
+import time
+from operator import is_
+
+from checkov.common.models.enums import CheckResult
+
+from conf_accessor import UNHASHABLE, ConfBatch, NormalizedConf, fingerprint, snapshot, unchanged
+from instrumentation import recorder
+from policy_config import get_policy_config
+from result_cache import policy_version, result_cache
+
+PASSED = CheckResult.PASSED
+FAILED = CheckResult.FAILED
+
+# Separator used when a rule reports several problems at once
+DETAILS_SEPARATOR = " | "
+
+
+class Rule:
+    """
+    One check in a RuleSet
+    """
+    __slots__ = ("id", "class_name", "name", "doc", "predicate", "source_only")
+
+    def __init__(self, id, class_name, name, predicate, doc=None):
+        self.id = id
+        self.class_name = class_name
+        self.name = name
+        self.predicate = predicate
+        self.doc = doc
+        self.source_only = getattr(predicate, "source_only", False)
+
+
+def source_only(predicate):
+    """
+    Mark a predicate as inspecting Terraform expressions (var., module.label...).
+
+    Such rules only make sense on module source; they are skipped when checks
+    run against concrete plan values.
+    """
+    predicate.source_only = True
+    return predicate
+
+
+def reads(*keys):
+    """
+    Declare the only attributes a predicate looks at, so batch evaluation can
+    run it once per distinct combination of their values.
+    """
+    def decorate(predicate):
+        predicate.reads = keys
+        return predicate
+    return decorate
+
+
+class Raised:
+    """Stands in for the verdict of a predicate that raised, in a pass's results"""
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+
+def verdict(results, check_id):
+    """One check's (result, details) from a pass, re-raising the error of its predicate"""
+    found = results[check_id]
+    if type(found) is Raised:
+        raise found.error
+    return found
+
+
+def _call(predicate, c):
+    try:
+        return predicate(c)
+    except Exception as error:
+        return Raised(error)
+
+
+def evaluate_column(predicate, batch):
+    """(result, details) of a predicate for every row of a ConfBatch, or Raised for the rows it raised on"""
+    keys = getattr(predicate, "reads", None)
+    if keys is None:
+        return [_call(predicate, batch.row(index)) for index in range(len(batch))]
+
+    if len(keys) == 1:
+        cells = batch.column(keys[0])
+    else:
+        cells = [UNHASHABLE if any(value is UNHASHABLE for value in cell) else cell
+                 for cell in zip(*(batch.column(key) for key in keys))]
+    verdicts = []
+    memo = {}
+    for index, cell in enumerate(cells):
+        if cell is UNHASHABLE:
+            verdicts.append(_call(predicate, batch.row(index)))
+            continue
+        found = memo.get(cell)
+        if found is None:
+            found = memo[cell] = _call(predicate, batch.row(index))
+        verdicts.append(found)
+    return verdicts
+
+
+def rule(id, class_name, name, predicate, doc=None):
+    """
+    Declare a check; ``predicate`` takes a NormalizedConf and returns (result, details).
+
+    Pass None as the predicate for rules computed by the RuleSet's evaluator.
+    """
+    return Rule(id, class_name, name, predicate, doc)
+
+
+class RuleSet:
+    """
+    All rules for one group of resource types, evaluated together per resource
+
+    ``evaluator`` is an optional fused pass: a function taking the NormalizedConf
+    and returning {check_id: (result, details)} for the rules declared with a
+    None predicate, so verdicts that share an expensive traversal are computed
+    together. When it raises, the error stands for the verdicts of all of
+    those rules.
+    """
+
+    def __init__(self, resources, categories, rules, evaluator=None):
+        self.resources = list(resources)
+        self.categories = list(categories)
+        self.rules = list(rules)
+        self._fused = evaluator
+        self._evaluators = tuple((r.id, r.predicate) for r in self.rules if r.predicate is not None)
+        self._check_ids = tuple(r.id for r in self.rules)
+        self._fused_ids = tuple(r.id for r in self.rules if r.predicate is None)
+        if evaluator is None and len(self._evaluators) != len(self.rules):
+            raise ValueError("Rules without a predicate need a fused evaluator")
+        # Checkov runs every check for one resource back to back, so the
+        # verdicts of the most recent conf are all that needs to be kept. They
+        # are keyed on the conf object plus a snapshot of its attributes,
+        # because Checkov reuses and edits conf dicts in place; hashing the
+        # whole conf on every check would cost more than the pass itself. The
+        # (conf, snapshot, results) triple is replaced in a single assignment
+        # so concurrent evaluations never see one conf paired with another's
+        # results.
+        self._last = (None, None, None)
+        self._last_timed = (None, None, None, None)
+        self._last_batch = (None, None, None)
+
+    def evaluate(self, conf):
+        """
+        Return {check_id: (result, details)} for every rule, reusing the last
+        pass when it was over the same conf and no attribute was reassigned since
+
+        The returned dict must be treated as read-only: it is shared by every
+        check of the resource.
+        """
+        last_conf, last_snapshot, last_results = self._last
+        if last_conf is conf and last_snapshot is not None and unchanged(conf, last_snapshot):
+            return last_results
+        return self._evaluate(conf)
+
+    def _evaluate(self, conf):
+        current = snapshot(conf)
+        c = NormalizedConf(conf)
+        results = {} if self._fused is None else self._fused_verdicts(_call(self._fused, c))
+        for check_id, predicate in self._evaluators:
+            try:
+                results[check_id] = predicate(c)
+            except Exception as error:
+                results[check_id] = Raised(error)
+        self._last = (conf, current, results)
+        return results
+
+    def _fused_verdicts(self, verdicts):
+        """The fused evaluator's verdicts, or its error for each of its rules"""
+        if type(verdicts) is Raised:
+            return dict.fromkeys(self._fused_ids, verdicts)
+        return verdicts
+
+    def evaluate_cached(self, conf, cache, version):
+        """
+        Like evaluate, but look the verdicts up in a ResultCache first
+
+        Each rule's key is its check ID, the policy version and the conf's
+        fingerprint; a conf is only evaluated when one of its rules misses.
+        The fingerprint is taken once per resource, when the last pass was
+        over another conf.
+        """
+        last_conf, last_snapshot, last_results = self._last
+        if last_conf is conf and last_snapshot is not None and unchanged(conf, last_snapshot):
+            return last_results
+        digest = fingerprint(conf)
+        if digest is None:
+            return self._evaluate(conf)
+
+        keys = [f"{check_id}:{version}:{digest}" for check_id in self._check_ids]
+        current = snapshot(conf)
+        verdicts = cache.get_all(keys)
+        if verdicts is not None:
+            results = dict(zip(self._check_ids, verdicts))
+            self._last = (conf, current, results)
+            return results
+
+        results = self._evaluate(conf)
+        # Errors are not verdicts: they are raised again on every evaluation
+        cache.put_all((key, results[check_id]) for key, check_id in zip(keys, self._check_ids)
+                      if type(results[check_id]) is not Raised)
+        return results
+
+    def evaluate_batch(self, confs):
+        """
+        Return [{check_id: (result, details)}, ...], one dict per conf, reusing
+        the last batch like evaluate reuses the last conf: when the batch holds
+        the same confs in the same order, none with a reassigned attribute
+        """
+        confs = tuple(confs)
+        last_confs, last_snapshots, last_results = self._last_batch
+        if (last_confs is not None and len(confs) == len(last_confs)
+                and all(map(is_, confs, last_confs))
+                and all(map(unchanged, confs, last_snapshots))):
+            return last_results
+
+        snapshots = tuple(map(snapshot, confs))
+        batch = ConfBatch(confs)
+        results = [{} for _ in range(len(batch))]
+        if self._fused is not None:
+            for row, verdicts in zip(results, evaluate_column(self._fused, batch)):
+                row.update(self._fused_verdicts(verdicts))
+        for check_id, predicate in self._evaluators:
+            for row, found in zip(results, evaluate_column(predicate, batch)):
+                row[check_id] = found
+        self._last_batch = (confs, snapshots, results)
+        return results
+
+    def evaluate_timed(self, conf):
+        """
+        Like evaluate, but also return {check_id: seconds} spent in each predicate
+
+        The fused evaluator's time is split evenly between the rules it computes.
+        """
+        last_conf, last_snapshot, last_results, last_timings = self._last_timed
+        if last_conf is conf and last_snapshot is not None and unchanged(conf, last_snapshot):
+            return last_results, last_timings
+
+        current = snapshot(conf)
+        c = NormalizedConf(conf)
+        results, timings = {}, {}
+        if self._fused is not None:
+            start = time.perf_counter()
+            results = self._fused_verdicts(_call(self._fused, c))
+            elapsed = time.perf_counter() - start
+            timings = dict.fromkeys(results, elapsed / max(len(results), 1))
+        for check_id, predicate in self._evaluators:
+            start = time.perf_counter()
+            results[check_id] = _call(predicate, c)
+            timings[check_id] = time.perf_counter() - start
+        self._last_timed = (conf, current, results, timings)
+        return results, timings
+
+
+class StandaloneCheck:
+    """
+    Minimal stand-in for BaseResourceCheck, used when the policy modules are
+    loaded outside Checkov (see use_standalone_checks)
+    """
+
+    def __init__(self, name, id, categories, supported_resources):
+        self.name = name
+        self.id = id
+        self.categories = categories
+        self.supported_resources = supported_resources
+        self.details = []
+
+
+# Base class of the generated check classes; None means Checkov's BaseResourceCheck
+_check_base = None
+
+
+def use_standalone_checks():
+    """
+    Generate StandaloneCheck subclasses instead of BaseResourceCheck subclasses.
+
+    Must be called before the policy modules are imported. Skips importing
+    Checkov's resource check machinery (over a second of startup) for tools
+    that only call ``check.evaluate(conf)``, such as scripts/run-custom-checks.py.
+    """
+    global _check_base
+    _check_base = StandaloneCheck
+
+
+def register_checks(rule_set, namespace):
+    """
+    Create and register a BaseResourceCheck subclass for every rule.
+
+    The classes are published in ``namespace`` (the policy module's globals)
+    under their historical names.
+    """
+    if _check_base is not None:
+        base = _check_base
+    else:
+        # Imported here so rule tables can be loaded without Checkov's resource
+        # check machinery, which is slow to import
+        from checkov.terraform.checks.resource.base_resource_check import BaseResourceCheck as base
+
+    def make_init(r):
+        def __init__(self):
+            base.__init__(
+                self,
+                name=r.name,
+                id=r.id,
+                categories=rule_set.categories,
+                supported_resources=rule_set.resources,
+            )
+        return __init__
+
+    def evaluate(self, conf):
+        """Return (result, details) for a resource conf without touching the check instance"""
+        return verdict(rule_set.evaluate(conf), self.id)
+
+    def evaluate_batch(self, confs):
+        """Return [(result, details), ...] for many confs of one resource type, in order"""
+        return [verdict(results, self.id) for results in rule_set.evaluate_batch(confs)]
+
+    cache = result_cache()
+    if cache is not None:
+        # Verdicts depend on the policy module itself and the helpers next to it
+        version = policy_version(namespace.get("__file__") or __file__)
+
+        def evaluate(self, conf):
+            """Return (result, details) for a resource conf, memoized by its fingerprint"""
+            return verdict(rule_set.evaluate_cached(conf, cache, version), self.id)
+
+    timings = recorder()
+    if timings is not None:
+        # Latency is measured on real evaluations, so timing bypasses the cache
+        # Only resource type a standalone check can know about: its single supported one
+        default_type = rule_set.resources[0] if len(rule_set.resources) == 1 else None
+
+        def evaluate(self, conf):
+            """Return (result, details) for a resource conf, recording the predicate's latency"""
+            results, elapsed = rule_set.evaluate_timed(conf)
+            timings.record(self.id, elapsed[self.id], getattr(self, "entity_type", None) or default_type)
+            return verdict(results, self.id)
+
+    def scan_resource_conf(self, conf):
+        # Checkov reads details back from the instance after the scan; this is
+        # the only place a check writes to itself
+        result, details = self.evaluate(conf)
+        if details is not None:
+            self.details = details
+        return result
+
+    checks = []
+    for r in rule_set.rules:
+        cls = type(r.class_name, (base,), {
+            "__doc__": r.doc,
+            "__module__": namespace.get("__name__", __name__),
+            "__init__": make_init(r),
+            "source_only": r.source_only,
+            "evaluate": evaluate,
+            "evaluate_batch": evaluate_batch,
+            "scan_resource_conf": scan_resource_conf,
+        })
+        namespace[r.class_name] = cls
+        checks.append(cls())
+    return checks
+
+
+# Predicate factories
+
+def all_of(*predicates):
+    """Pass only if every predicate passes; failure details are joined"""
+    def predicate(c):
+        problems = []
+        for check in predicates:
+            result, details = check(c)
+            if result != PASSED:
+                problems.append(details)
+        if problems:
+            return FAILED, DETAILS_SEPARATOR.join(problems)
+        return PASSED, None
+    if all(getattr(check, "source_only", False) for check in predicates):
+        source_only(predicate)
+    if all(getattr(check, "reads", None) is not None for check in predicates):
+        reads(*dict.fromkeys(key for check in predicates for key in check.reads))(predicate)
+    return predicate
+
+
+def defined(key, missing):
+    """Pass if the attribute is set at all, whatever its value"""
+    @reads(key)
+    def predicate(c):
+        if c.has(key):
+            return PASSED, None
+        return FAILED, missing
+    return predicate
+
+
+def present(key, missing):
+    """Pass if the attribute is set and not empty"""
+    @reads(key)
+    def predicate(c):
+        if c.present(key):
+            return PASSED, None
+        return FAILED, missing
+    return predicate
+
+
+def non_blank(key, empty, missing):
+    """Pass if the attribute is set to a non-blank value"""
+    @reads(key)
+    def predicate(c):
+        if not c.has(key):
+            return FAILED, missing
+        if c.scalar(key) and c.text(key).strip():
+            return PASSED, None
+        return FAILED, empty
+    return predicate
+
+
+def references(key, fragments, mismatch, missing=None, empty=None):
+    """
+    Pass if the attribute expression mentions one of ``fragments``.
+
+    A missing attribute passes when ``missing`` is None; ``empty`` makes blank
+    values fail with their own message.
+    """
+    fragments = tuple(fragments)
+
+    @reads(key)
+    def predicate(c):
+        if not c.has(key):
+            return (PASSED, None) if missing is None else (FAILED, missing)
+        if empty is not None and not (c.scalar(key) and c.text(key).strip()):
+            return FAILED, empty
+        if c.references(key, *fragments):
+            return PASSED, None
+        return FAILED, mismatch
+    return source_only(predicate)
+
+
+def refers_to(key, targets, mismatch, missing=None, empty=None):
+    """
+    Pass if the attribute expression references one of ``targets``.
+
+    Like ``references``, but the expression is tokenized (see
+    terraform_expressions.py): "module.label" matches module.label.id, not
+    module.labels or the text of a string literal, and "var" any variable.
+    """
+    targets = tuple(targets)
+
+    @reads(key)
+    def predicate(c):
+        if not c.has(key):
+            return (PASSED, None) if missing is None else (FAILED, missing)
+        if empty is not None and not (c.scalar(key) and c.text(key).strip()):
+            return FAILED, empty
+        if c.refers_to(key, *targets):
+            return PASSED, None
+        return FAILED, mismatch
+    return source_only(predicate)
+
+
+def one_of(key, allowed, mismatch, missing, form="text", variables=None):
+    """
+    Pass if the attribute is one of ``allowed``.
+
+    ``form`` selects the comparison value ("text", "lower", "upper" or
+    "scalar"). ``variables`` lets Terraform variable references through:
+    "contains" for any ``var.`` mention, "prefix" for values starting with it.
+    ``mismatch`` is formatted with ``value`` set to the unwrapped attribute.
+    """
+    allowed = frozenset(allowed)
+
+    @reads(key)
+    def predicate(c):
+        if not c.has(key):
+            return FAILED, missing
+        if form == "scalar":
+            candidate = c.scalar(key)
+        elif form == "lower":
+            candidate = c.lower(key)
+        elif form == "upper":
+            candidate = c.text(key).upper()
+        else:
+            candidate = c.text(key)
+        if _variable_reference(c, key, variables):
+            return PASSED, None
+        try:
+            if candidate in allowed:
+                return PASSED, None
+        except TypeError:
+            pass
+        return FAILED, mismatch.format(value=c.scalar(key))
+    return predicate
+
+
+def _variable_reference(c, key, variables):
+    if variables == "contains":
+        return c.references(key, "var.")
+    if variables == "prefix":
+        return c.text(key).startswith("var.")
+    return False
+
+
+def approved_region(key="location", variables="contains"):
+    """
+    Pass if the attribute names an approved region from the policy configuration.
+
+    Display names ("West Europe") and programmatic names ("westeurope") are
+    both accepted. ``variables`` works as in ``one_of``.
+    """
+    @reads(key)
+    def predicate(c):
+        if not c.has(key):
+            return FAILED, "No location specified"
+        if _variable_reference(c, key, variables):
+            return PASSED, None
+        location = c.scalar(key)
+        if get_policy_config().is_approved_region(location):
+            return PASSED, None
+        return FAILED, f"Location '{location}' is not in approved regions list"
+    return predicate
+
+
+def approved_sku(service, mismatch, missing="No sku_name configured", key="sku_name", variables="contains"):
+    """
+    Pass if the attribute is an approved SKU for ``service`` (case-insensitive).
+
+    ``mismatch`` is formatted with ``value`` set to the unwrapped attribute.
+    """
+    @reads(key)
+    def predicate(c):
+        if not c.has(key):
+            return FAILED, missing
+        if _variable_reference(c, key, variables):
+            return PASSED, None
+        sku = c.scalar(key)
+        if get_policy_config().is_approved_sku(service, c.text(key)):
+            return PASSED, None
+        return FAILED, mismatch.format(value=sku)
+    return predicate
+
+
+def label_module(required=False):
+    """Name and tags reference the cloudposse/label module"""
+    return all_of(
+        refers_to("name", ("module.label",), "Name should reference module.label.id",
+                  missing="No name parameter found" if required else None),
+        refers_to("tags", ("module.label.tags",), "Tags should reference module.label.tags",
+                  missing="No tags parameter found" if required else None),
+    )
+
+
+def conditional_creation(missing="Missing conditional creation pattern"):
+    """count references var.enabled"""
+    return refers_to("count", ("var.enabled",),
+                     "Count parameter exists but doesn't reference var.enabled",
+                     missing=missing)
+
+
+def resource_group_reference(mismatch="Resource group name should reference variable or resource",
+                             missing="No resource_group_name defined"):
+    """resource_group_name references a variable or an azurerm_resource_group"""
+    return refers_to("resource_group_name", ("var", "azurerm_resource_group"), mismatch, missing=missing)
@@ -0,0 +1,193 @@
+"""
+References made by Terraform expressions
+One Platform Infrastructure - Security Policies
+
+Checkov hands checks attribute values as expression strings, either bare
+(``var.enabled ? 1 : 0``) or as templates (``rg-${var.name}``). This module
+tokenizes them and returns the objects they refer to, so checks can ask
+"does this reference module.label?" instead of searching ``str(value)``
+for a substring, which also matched string literals, longer names
+(``module.labels``) and whole nested maps.
+
+References are returned in a canonical form:
+
+- ``var.NAME``, ``local.NAME``
+- ``module.NAME.OUTPUT`` (``module.NAME`` when no output is selected)
+- ``data.TYPE.NAME`` and ``TYPE.NAME`` for resources (``azurerm_subnet.this``)
+- ``each.key``, ``count.index``, ``path.module``, ``self.ATTR``, ``terraform.workspace``
+
+Parsing is memoized per expression string in an LRU cache.
+"""
+
+from functools import lru_cache
+
+# Root objects and how many traversal steps their canonical reference keeps
+_ROOT_DEPTH = {
+    "var": 2, "local": 2, "module": 3, "data": 3,
+    "each": 2, "count": 2, "path": 2, "self": 2, "terraform": 2,
+}
+_RESOURCE_DEPTH = 2
+_IDENTIFIER_START = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+_IDENTIFIER_CHARS = _IDENTIFIER_START | frozenset("0123456789-")
+_DIGITS = frozenset("0123456789")
+
+EXPRESSION_CACHE_SIZE = 4096
+_NONE = frozenset()
+
+
+def _is_resource_type(name):
+    """azurerm_subnet, random_string: a provider prefix and at least one more word"""
+    provider, _, rest = name.partition("_")
+    return bool(provider) and bool(rest) and name.islower() and "-" not in name
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def expression_references(expression):
+    """frozenset of the canonical references in one expression string"""
+    if "." not in expression:
+        # Every reference is a traversal, so nothing to parse
+        return frozenset()
+    found = set()
+    if _is_template(expression):
+        _scan_template(expression, 0, found, None)
+    else:
+        _scan_expression(expression, 0, found, None)
+    return frozenset(found)
+
+
+def _is_template(expression):
+    """
+    Literal text with ${...} interpolations, whose text must not count as references
+
+    Bare expressions quote their strings. Checkov also renders some bare
+    expressions with the joints of nested interpolations left in
+    (``coalesce(var.x,module.label.id}${random_string.s[0].result``): a "}"
+    before the first interpolation means the text is not a template.
+    """
+    if '"' in expression:
+        return False
+    starts = [index for index in (expression.find("${"), expression.find("%{")) if index >= 0]
+    return bool(starts) and "}" not in expression[:min(starts)]
+
+
+def _scan_template(text, index, found, closing):
+    """Scan literal text up to ``closing`` (a quote) or the end, parsing ${...}/%{...}"""
+    length = len(text)
+    while index < length:
+        char = text[index]
+        if char == "\\":
+            index += 2
+        elif char == closing:
+            return index + 1
+        elif char in "$%" and text.startswith(char + "{", index + 1):
+            # $${ and %%{ are escaped literals
+            index += 3
+        elif char in "$%" and text.startswith("{", index + 1):
+            index = _scan_expression(text, index + 2, found, "}")
+        else:
+            index += 1
+    return index
+
+
+def _scan_expression(text, index, found, closing):
+    """Scan an expression up to the unbalanced ``closing`` brace or the end"""
+    length = len(text)
+    depth = 0
+    while index < length:
+        char = text[index]
+        if char == '"':
+            index = _scan_template(text, index + 1, found, '"')
+        elif char in _IDENTIFIER_START:
+            index = _scan_traversal(text, index, found)
+        elif char in _DIGITS:
+            # Numbers (and CIDR-looking literals) cannot start a reference
+            while index < length and (text[index] in _DIGITS or text[index] in ".eE"):
+                index += 1
+        elif char == "{":
+            depth += 1
+            index += 1
+        elif char == "}":
+            if depth == 0 and closing == "}":
+                return index + 1
+            depth -= 1
+            index += 1
+        else:
+            index += 1
+    return index
+
+
+def _scan_traversal(text, index, found):
+    """Read ``root.attr.attr...`` starting at an identifier; record it if it is a reference"""
+    length = len(text)
+    parts = []
+    while True:
+        start = index
+        while index < length and text[index] in _IDENTIFIER_CHARS:
+            index += 1
+        parts.append(text[start:index])
+        if index + 1 < length and text[index] == "." and (text[index + 1] in _IDENTIFIER_START
+                                                          or text[index + 1] in _DIGITS or text[index + 1] == "*"):
+            index += 1
+            if text[index] in _IDENTIFIER_START:
+                continue
+            # Legacy index (.0) or splat (.*): the reference stops here
+            while index < length and (text[index] in _DIGITS or text[index] == "*"):
+                index += 1
+        break
+
+    rest = text[index:index + 64].lstrip()
+    if rest.startswith("(") or rest.startswith("::"):
+        # A function call (coalesce, provider::...), not a reference
+        return index
+    root = parts[0]
+    depth = _ROOT_DEPTH.get(root)
+    if depth is None and _is_resource_type(root):
+        depth = _RESOURCE_DEPTH
+    if depth is not None and len(parts) >= min(depth, 2):
+        found.add(".".join(parts[:depth]))
+    return index
+
+
+def value_references(value):
+    """frozenset of the references in an attribute value, nested maps and lists included"""
+    if isinstance(value, str):
+        return expression_references(value) if "." in value else _NONE
+    if type(value) is list and len(value) == 1 and type(value[0]) is str:
+        # Checkov's wrapped scalar: the memoised frozenset is the answer as is
+        return expression_references(value[0]) if "." in value[0] else _NONE
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return _NONE
+    found = None
+    for item in value:
+        if isinstance(item, str):
+            # Dot-less literals (most tag values) never reach the memo
+            if "." not in item:
+                continue
+            references = expression_references(item)
+        else:
+            references = value_references(item)
+        if references:
+            if found is None:
+                found = set(references)
+            else:
+                found.update(references)
+    return _NONE if found is None else frozenset(found)
+
+
+def refers_to(references, target):
+    """
+    True if one of the references is ``target`` or inside it.
+
+    ``target`` is a reference prefix at traversal boundaries: "var" (any
+    variable), "var.enabled", "module.label", "module.label.tags", or a
+    resource type such as "azurerm_resource_group" (managed or data source).
+    """
+    prefix = target + "."
+    for reference in references:
+        if reference == target or reference.startswith(prefix):
+            return True
+        if reference.startswith("data.") and reference[5:].startswith(prefix):
+            return True
+    return False